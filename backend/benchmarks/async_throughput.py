@@ -0,0 +1,108 @@
+"""
+Compare concurrent-request throughput of the sync WSGI app and the async
+ASGI app on the read endpoints (product and category list/retrieve).
+
+Start both apps against the same database, e.g. one loaded by
+synthetic_data.py, with the same number of workers:
+
+    gunicorn django_app.wsgi -w 4 -b 127.0.0.1:8001
+    gunicorn django_app.asgi -w 4 -k uvicorn.workers.UvicornWorker -b 127.0.0.1:8002
+    python benchmarks/async_throughput.py --wsgi http://127.0.0.1:8001 --asgi http://127.0.0.1:8002
+
+Each list request carries a distinct, far-future updated_before so the
+response cache never answers it; pass --allow-cache to measure cached traffic.
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+
+def fetch_json(url):
+    with urlopen(url, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def request_plan(base_url, count, allow_cache, seed=11):
+    """The same seeded mix of list, filter and retrieve URLs for every target."""
+    products = fetch_json(f"{base_url}/products/?page_size=50")["results"]
+    categories = fetch_json(f"{base_url}/categories/?page_size=20")["results"]
+    rng = random.Random(seed)
+    shapes = [
+        lambda: ("/products/", {"page": rng.randint(1, 5), "page_size": 20, "ordering": rng.choice(["name", "-price"])}),
+        lambda: ("/products/", {"cursor": "", "page_size": 20, "ordering": "-created_at"}),
+        lambda: ("/products/", {"categories": rng.choice(categories)["title"], "price_min": 10}),
+        lambda: (f"/products/{rng.choice(products)['id']}/", {}),
+        lambda: ("/categories/", {"ordering": "title"}),
+        lambda: (f"/categories/{rng.choice(categories)['id']}/", {}),
+    ]
+    plan = []
+    for number in range(count):
+        path, params = rng.choice(shapes)()
+        if not allow_cache and path in ("/products/", "/categories/"):
+            params["updated_before"] = (date(3000, 1, 1) + timedelta(days=number)).isoformat()
+        plan.append(f"{path}?{urlencode(params, doseq=True)}" if params else path)
+    return plan
+
+
+def run(base_url, plan, concurrency):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(path):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            with urlopen(base_url + path, timeout=30) as response:
+                response.read()
+            failed = False
+        except (HTTPError, OSError):
+            failed = True
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            errors += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, plan))
+    return time.perf_counter() - started, latencies, errors
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wsgi", default="http://127.0.0.1:8001")
+    parser.add_argument("--asgi", default="http://127.0.0.1:8002")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--allow-cache", action="store_true")
+    args = parser.parse_args()
+
+    plan = request_plan(args.wsgi, args.requests, args.allow_cache)
+    print(f"{'app':<5} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for concurrency in args.concurrency:
+        for label, base_url in (("wsgi", args.wsgi), ("asgi", args.asgi)):
+            run(base_url, plan[:concurrency * 2], concurrency)  # warm up connections and workers
+            elapsed, latencies, errors = run(base_url, plan, concurrency)
+            print(
+                f"{label:<5} {concurrency:>5} {len(plan) / elapsed:>9.1f} "
+                f"{statistics.median(latencies):>8.1f} {percentile(latencies, 0.95):>8.1f} "
+                f"{percentile(latencies, 0.99):>8.1f} {errors:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
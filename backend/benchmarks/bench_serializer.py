@@ -0,0 +1,45 @@
+"""ProductSerializer and ProductRawSerializer on in-memory documents; no database needed."""
+import pytest
+from serializer_speed import build_documents  # sets up Django
+from bson import ObjectId
+from django_app.models.category import Category
+from django_app.serializers.product_serializer import ProductSerializer, ProductRawSerializer
+
+DOCUMENTS = 1000
+
+
+@pytest.fixture(scope="module")
+def documents():
+    return build_documents(DOCUMENTS)
+
+
+def test_product_serializer_many(benchmark, documents):
+    products, _ = documents
+    data = benchmark(lambda: ProductSerializer(products, many=True).data)
+    assert len(data) == DOCUMENTS
+
+
+def test_product_serializer_one(benchmark, documents):
+    products, _ = documents
+    data = benchmark(lambda: ProductSerializer(products[0]).data)
+    assert data["name"] == "Product 0"
+
+
+def test_product_raw_serializer_many(benchmark, documents):
+    _, raw = documents
+    data = benchmark(lambda: ProductRawSerializer().many(raw))
+    assert len(data) == DOCUMENTS
+
+
+def test_product_serializer_validate(benchmark):
+    categories = {"Electronics": Category(id=ObjectId(), title="Electronics", description="")}
+    payload = {
+        "name": "Smartphone", "description": "Latest model", "brand": "BrandX",
+        "price": 599.99, "quantity": 100, "category": "Electronics",
+    }
+
+    def validate():
+        serializer = ProductSerializer(data=payload, context={"categories": categories})
+        return serializer.is_valid()
+
+    assert benchmark(validate)
@@ -0,0 +1,70 @@
+"""
+ProductService and CategoryService read paths against the synthetic
+catalogue in BENCH_DB. Writes are left to the HTTP load scenario
+(locustfile.py), so the catalogue stays the same between runs.
+"""
+import itertools
+from django_app import db
+from django_app.repositories.category_repository import CategoryRepository
+from django_app.services.category_service import CategoryService
+from django_app.services.product_service import ProductService
+
+PAGE_SIZE = 20
+
+
+def first_page(queryset):
+    return list(queryset.as_pymongo()[:PAGE_SIZE])
+
+
+def test_filter_products_page(benchmark, catalogue):
+    page = benchmark(lambda: first_page(ProductService.filter_products(ordering="-created_at", using=db.READ_ALIAS)))
+    assert len(page) == PAGE_SIZE
+
+
+def test_filter_products_by_price_page(benchmark, catalogue):
+    filters = {"price_min": 20.0, "price_max": 100.0}
+    benchmark(lambda: first_page(ProductService.filter_products(
+        ordering="price", filters=filters, using=db.READ_ALIAS)))
+
+
+def test_filter_products_by_popular_categories_page(benchmark, catalogue):
+    filters = {"categories": catalogue["category_titles"][:3]}
+    benchmark(lambda: first_page(ProductService.filter_products(
+        ordering="-updated_at", filters=filters, using=db.READ_ALIAS)))
+
+
+def test_filter_products_by_category_page(benchmark, catalogue):
+    category_id = catalogue["category_ids"][0]
+    benchmark(lambda: first_page(ProductService.filter_products_by_category(category_id, using=db.READ_ALIAS)))
+
+
+def test_get_product_by_id(benchmark, catalogue):
+    product_ids = itertools.cycle(catalogue["product_ids"])
+    assert benchmark(lambda: ProductService.get_product_by_id(next(product_ids)))
+
+
+def test_product_listing_version(benchmark, catalogue):
+    benchmark(lambda: ProductService.get_listing_version(using=db.READ_ALIAS))
+
+
+def test_search_products(benchmark, catalogue):
+    benchmark(lambda: ProductService.search_products("wireless headphones", limit=PAGE_SIZE + 1))
+
+
+def test_get_stats_uncached(benchmark, catalogue):
+    benchmark.pedantic(
+        ProductService.get_stats, kwargs={"filters": {"price_min": 20.0}},
+        setup=ProductService.clear_stats_cache, rounds=20,
+    )
+
+
+def test_filter_categories_page(benchmark, catalogue):
+    benchmark(lambda: first_page(CategoryService.filter_categories(ordering="title", using=db.READ_ALIAS)))
+
+
+def test_get_category_by_id_uncached(benchmark, catalogue):
+    category_ids = itertools.cycle(catalogue["category_ids"])
+    benchmark.pedantic(
+        lambda: CategoryService.get_category_by_id(next(category_ids)),
+        setup=CategoryRepository.invalidate_cache, rounds=100,
+    )
@@ -0,0 +1,56 @@
+"""
+Compare two run_suite.py reports, e.g. from the base and head of a branch:
+
+    python benchmarks/compare_reports.py bench-base.json bench-head.json --threshold 0.10
+
+Compares the median of every micro-benchmark and the p95 latency and
+throughput of every load-test endpoint present in both reports. Exits 1 if
+any of them regressed by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+
+def changes(base, head):
+    """(section, name, metric, base, head, relative change where positive is worse)."""
+    rows = []
+    for name in sorted(base.get("micro", {}).keys() & head.get("micro", {}).keys()):
+        before, after = base["micro"][name]["median_ms"], head["micro"][name]["median_ms"]
+        rows.append(("micro", name, "median_ms", before, after, after / before - 1 if before else 0.0))
+    base_load = base.get("load", {}).get("endpoints", {})
+    head_load = head.get("load", {}).get("endpoints", {})
+    for name in sorted(base_load.keys() & head_load.keys()):
+        before, after = base_load[name]["p95_ms"], head_load[name]["p95_ms"]
+        rows.append(("load", name, "p95_ms", before, after, after / before - 1 if before else 0.0))
+        before, after = base_load[name]["rps"], head_load[name]["rps"]
+        rows.append(("load", name, "rps", before, after, before / after - 1 if after else 0.0))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression.")
+    args = parser.parse_args()
+
+    with open(args.base) as base_file, open(args.head) as head_file:
+        base, head = json.load(base_file), json.load(head_file)
+    if base.get("dataset") != head.get("dataset"):
+        print(f"warning: datasets differ: {base.get('dataset')} vs {head.get('dataset')}")
+
+    print(f"base {base.get('commit')}  head {head.get('commit')}")
+    regressions = 0
+    for section, name, metric, before, after, change in changes(base, head):
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{section:<5} {name:<60} {metric:<9} {before:10.2f} -> {after:10.2f}  {change:+7.1%}{flag}")
+    print(f"{regressions} regression(s) over {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Fixtures of the pytest-benchmark micro-benchmarks (bench_*.py), which the
+backend's pytest.ini does not collect by default:
+
+    cd backend && python -m pytest benchmarks -o python_files="bench_*.py" --benchmark-json=bench.json
+
+Service benchmarks read the synthetic catalogue in BENCH_DB (default
+product_bench), loaded beforehand by synthetic_data.py.
+"""
+import os
+import random
+import pytest
+from synthetic_data import use_database  # sets up Django
+from django_app.models.category import Category
+from django_app.models.product import Product
+
+
+@pytest.fixture(scope="session")
+def catalogue():
+    """Ids and titles sampled from the benchmark database, most popular category first."""
+    use_database(os.environ.get("BENCH_DB", "product_bench"))
+    if not Product.objects.limit(1).count(with_limit_and_skip=True):
+        pytest.skip("The benchmark database is empty; load it with synthetic_data.py first.")
+    categories = list(Category.objects.order_by("title").only("id", "title").as_pymongo())
+    product_ids = [product["_id"] for product in Product.objects.only("id").limit(1000).as_pymongo()]
+    random.Random(3).shuffle(product_ids)
+    return {
+        "category_ids": [category["_id"] for category in categories],
+        "category_titles": [category["title"] for category in categories],
+        "product_ids": product_ids,
+    }
@@ -0,0 +1,107 @@
+"""
+HTTP load scenario: a read-heavy mix of product listing, filtering and
+retrieval, with a trickle of creates and updates. Each simulated user
+updates only the products it created and deletes them when it stops, so the
+catalogue is unchanged after a run.
+
+Serve the API on the synthetic catalogue, then run locust headless:
+
+    MONGODB_DB=product_bench gunicorn -c gunicorn.conf.py django_app.wsgi
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8001 --headless -u 50 -r 10 -t 2m
+
+Requests are grouped under templated names ("/products/[id]/") so the
+stats have one row per endpoint and operation.
+"""
+import random
+import uuid
+from locust import HttpUser, between, task
+
+ORDERINGS = ["name", "-price", "price", "-created_at", "-updated_at"]
+
+
+class CatalogueUser(HttpUser):
+    wait_time = between(0.05, 0.25)
+
+    def on_start(self):
+        self.rng = random.Random()
+        # synthetic_data.py titles categories by popularity rank.
+        categories = self.client.get(
+            "/categories/", params={"page_size": 20, "ordering": "title"}, name="setup"
+        ).json()["results"]
+        self.category_ids = [category["id"] for category in categories]
+        self.category_titles = [category["title"] for category in categories]
+        products = self.client.get(
+            "/products/", params={"page_size": 50, "page": self.rng.randint(1, 10)}, name="setup"
+        ).json()["results"]
+        self.product_ids = [product["id"] for product in products]
+        self.created = {}  # id -> payload
+
+    def on_stop(self):
+        for product_id in self.created:
+            self.client.delete(f"/products/{product_id}/", name="/products/[id]/ [cleanup]")
+
+    @task(10)
+    def list_products(self):
+        self.client.get(
+            "/products/",
+            params={"page": self.rng.randint(1, 5), "page_size": 20, "ordering": self.rng.choice(ORDERINGS)},
+            name="/products/ [list]",
+        )
+
+    @task(3)
+    def list_products_cursor(self):
+        self.client.get(
+            "/products/", params={"cursor": "", "page_size": 20, "ordering": "-created_at"},
+            name="/products/ [cursor]",
+        )
+
+    @task(6)
+    def filter_products(self):
+        low = self.rng.choice([5, 20, 50, 100])
+        titles = self.category_titles[:5]  # the most popular
+        self.client.get(
+            "/products/",
+            params={
+                "categories": self.rng.sample(titles, min(2, len(titles))),
+                "price_min": low, "price_max": low * 5, "ordering": "price", "page_size": 20,
+            },
+            name="/products/ [filter]",
+        )
+
+    @task(8)
+    def retrieve_product(self):
+        self.client.get(f"/products/{self.rng.choice(self.product_ids)}/", name="/products/[id]/")
+
+    @task(3)
+    def list_category_products(self):
+        self.client.get(
+            f"/categories/{self.rng.choice(self.category_ids)}/products/", name="/categories/[id]/products/"
+        )
+
+    @task(2)
+    def list_categories(self):
+        self.client.get("/categories/", params={"ordering": "title"}, name="/categories/ [list]")
+
+    @task(1)
+    def create_product(self):
+        payload = {
+            "name": f"load test {uuid.uuid4().hex}",
+            "description": "Created by the load test",
+            "brand": "Load Test",
+            "price": round(self.rng.uniform(5, 500), 2),
+            "quantity": self.rng.randint(0, 100),
+            "category": self.rng.choice(self.category_titles),
+        }
+        with self.client.post("/products/", json=payload, name="/products/ [create]", catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure(f"status {response.status_code}")
+                return
+            self.created[response.json()["created_product"]["id"]] = payload
+
+    @task(1)
+    def update_product(self):
+        if not self.created:
+            return
+        product_id = self.rng.choice(list(self.created))
+        payload = {**self.created[product_id], "price": round(self.rng.uniform(5, 500), 2)}
+        self.client.put(f"/products/{product_id}/", json=payload, name="/products/[id]/ [update]")
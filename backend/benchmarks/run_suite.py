@@ -0,0 +1,116 @@
+"""
+Run the micro-benchmarks and, given --host, the HTTP load scenario, and
+write one JSON report that compare_reports.py can diff across commits.
+
+    cd backend
+    python benchmarks/synthetic_data.py --products 100000 --categories 200 --db product_bench --drop
+    MONGODB_DB=product_bench gunicorn -c gunicorn.conf.py django_app.wsgi &
+    python benchmarks/run_suite.py --db product_bench --host http://127.0.0.1:8001 --output bench-$(git rev-parse --short HEAD).json
+
+Timings are in milliseconds.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import use_database  # sets up Django
+from django_app.models.category import Category
+from django_app.models.product import Product
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_micro(db, workdir):
+    path = os.path.join(workdir, "micro.json")
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "benchmarks", "-o", "python_files=bench_*.py",
+         "-q", "-p", "no:cacheprovider", f"--benchmark-json={path}"],
+        cwd=BACKEND, env={**os.environ, "BENCH_DB": db}, check=True,
+    )
+    with open(path) as report:
+        benchmarks = json.load(report)["benchmarks"]
+    return {
+        benchmark["fullname"].split("/")[-1]: {
+            "median_ms": benchmark["stats"]["median"] * 1000,
+            "mean_ms": benchmark["stats"]["mean"] * 1000,
+            "stddev_ms": benchmark["stats"]["stddev"] * 1000,
+            "min_ms": benchmark["stats"]["min"] * 1000,
+            "rounds": benchmark["stats"]["rounds"],
+        }
+        for benchmark in benchmarks
+    }
+
+
+def run_load(host, users, spawn_rate, run_time, workdir):
+    prefix = os.path.join(workdir, "load")
+    # locust exits non-zero when any request failed; failures are reported instead.
+    subprocess.run(
+        ["locust", "-f", os.path.join(BACKEND, "benchmarks", "locustfile.py"), "--headless",
+         "--host", host, "-u", str(users), "-r", str(spawn_rate), "-t", run_time,
+         "--csv", prefix, "--only-summary"],
+        cwd=BACKEND,
+    )
+    with open(f"{prefix}_stats.csv", newline="") as stats:
+        rows = list(csv.DictReader(stats))
+    return {
+        " ".join(filter(None, (row["Type"], row["Name"]))): {
+            "requests": int(row["Request Count"]),
+            "failures": int(row["Failure Count"]),
+            "rps": float(row["Requests/s"]),
+            "p50_ms": float(row["50%"]),
+            "p95_ms": float(row["95%"]),
+            "p99_ms": float(row["99%"]),
+        }
+        for row in rows if row["Name"] != "setup"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="product_bench")
+    parser.add_argument("--host", help="Base URL of the running API; the load scenario is skipped without it.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--spawn-rate", type=int, default=10)
+    parser.add_argument("--run-time", default="2m")
+    parser.add_argument("--output", default="bench-report.json")
+    args = parser.parse_args()
+
+    use_database(args.db)
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dataset": {
+            "db": args.db, "products": Product.objects.count(), "categories": Category.objects.count(),
+        },
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        report["micro"] = run_micro(args.db, workdir)
+        if args.host:
+            report["load"] = {
+                "users": args.users, "spawn_rate": args.spawn_rate, "run_time": args.run_time,
+                "endpoints": run_load(args.host, args.users, args.spawn_rate, args.run_time, workdir),
+            }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
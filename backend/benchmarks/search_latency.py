@@ -0,0 +1,73 @@
+"""
+Measure GET /products/search/ latency at the service layer against a
+synthetic catalogue (see synthetic_data.py) and compare the p95 with the
+target in README.md.
+
+    cd backend && python benchmarks/search_latency.py --db product_bench
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic_data import ADJECTIVES, NOUNS, WORDS, use_database  # sets up Django
+
+from django_app.services.product_service import ProductService
+
+TARGET_P95_MS = 150
+
+
+def queries(count, seed=7):
+    rng = random.Random(seed)
+    shapes = [
+        lambda: (rng.choice(NOUNS), {}),
+        lambda: (f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}", {}),
+        lambda: (rng.choice(WORDS), {}),
+        lambda: (rng.choice(NOUNS), {"price_min": 100.0, "price_max": 500.0}),
+    ]
+    return [rng.choice(shapes)() for _ in range(count)]
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="product_bench")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    use_database(args.db)
+    first_page, next_page = [], []
+    for text, filters in queries(args.queries):
+        started = time.perf_counter()
+        documents = ProductService.search_products(text, filters, limit=args.page_size + 1)
+        first_page.append((time.perf_counter() - started) * 1000)
+        if len(documents) > args.page_size:
+            last = documents[args.page_size - 1]
+            started = time.perf_counter()
+            ProductService.search_products(
+                text, filters, after=(last["score"], last["_id"]), limit=args.page_size + 1
+            )
+            next_page.append((time.perf_counter() - started) * 1000)
+
+    for label, samples in (("first page", first_page), ("next page", next_page)):
+        if samples:
+            print(
+                f"{label:<10} p50 {statistics.median(samples):7.1f} ms  "
+                f"p95 {percentile(samples, 0.95):7.1f} ms  p99 {percentile(samples, 0.99):7.1f} ms"
+            )
+    p95 = percentile(first_page + next_page, 0.95)
+    print(f"p95 {p95:.1f} ms against a target of {TARGET_P95_MS} ms")
+    sys.exit(0 if p95 <= TARGET_P95_MS else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare ProductSerializer on hydrated Documents with ProductRawSerializer on
+as_pymongo() dicts, per 1k documents. Needs no database: the documents are
+built in memory and the category titles are primed in the category cache.
+
+    cd backend && python benchmarks/serializer_speed.py --documents 1000
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+
+import django
+
+django.setup()
+
+from bson import ObjectId
+from django_app.models.category import Category
+from django_app.models.product import Product
+from django_app.repositories.category_repository import CategoryRepository
+from django_app.serializers.product_serializer import ProductSerializer, ProductRawSerializer
+
+
+def build_documents(count):
+    categories = [Category(id=ObjectId(), title=f"Category {i}", description="") for i in range(20)]
+    for category in categories:
+        CategoryRepository._remember(category)
+    raw = [
+        Product(
+            id=ObjectId(),
+            name=f"Product {i}",
+            category=categories[i % len(categories)].id,
+            description="A product description " * 4,
+            price=9.99 + i,
+            brand=f"Brand {i % 50}",
+            quantity=i % 500,
+            created_at=datetime(2024, 1, 1, 12, 0, 0),
+            updated_at=datetime(2024, 6, 1, 12, 0, 0),
+        ).to_mongo().to_dict()
+        for i in range(count)
+    ]
+    # Hydrate the way a queryset does, from the stored form.
+    return [Product._from_son(document) for document in raw], raw
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    products, raw = build_documents(args.documents)
+    assert ProductRawSerializer().many(raw) == ProductSerializer(products, many=True).data
+
+    timings = {
+        "ProductSerializer (Documents)": lambda: ProductSerializer(products, many=True).data,
+        "ProductRawSerializer (dicts)": lambda: ProductRawSerializer().many(raw),
+        "Product._from_son (hydration only)": lambda: [Product._from_son(document) for document in raw],
+    }
+    per_1k = {}
+    for label, run in timings.items():
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        per_1k[label] = best * 1000 / args.documents * 1000
+        print(f"{label:<36} {per_1k[label]:8.2f} ms per 1k documents")
+
+    drf = per_1k["ProductSerializer (Documents)"] + per_1k["Product._from_son (hydration only)"]
+    print(f"speedup including hydration: {drf / per_1k['ProductRawSerializer (dicts)']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Cold-start time of the backend, each sample in a fresh interpreter:
+
+- ``manage.py check``, what every management command pays before it runs;
+- a WSGI worker boot: importing django_app.wsgi and building the
+  application, which each gunicorn worker does without --preload.
+
+    cd backend && python benchmarks/startup_time.py --runs 10
+
+Neither should touch Mongo: run it once with mongod stopped to check that
+the times do not change.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = [
+    ("python -c 'import django' (baseline)", [sys.executable, "-c", "import django"]),
+    ("manage.py check", [sys.executable, "manage.py", "check"]),
+    ("wsgi worker boot", [sys.executable, "-c", "import django_app.wsgi"]),
+]
+
+
+def measure(command, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=BACKEND, check=True, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, command in COMMANDS:
+        measure(command, 1)  # warm the filesystem cache and .pyc files
+        samples = measure(command, args.runs)
+        print(
+            f"{label:<38} median {statistics.median(samples):7.1f} ms  "
+            f"min {min(samples):7.1f} ms  max {max(samples):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
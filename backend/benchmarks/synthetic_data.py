@@ -0,0 +1,140 @@
+"""
+Load a synthetic catalogue into a separate database for benchmarks.
+
+    cd backend && python benchmarks/synthetic_data.py --products 1000000 --categories 50 --db product_bench
+
+Product names, brands and descriptions are drawn from a fixed vocabulary
+with a seeded RNG, so every run builds the same catalogue. Like a real
+catalogue it is skewed: category and brand popularity follow a Zipf law
+(exponent --skew, 0 for uniform), prices are log-normal, stock is
+long-tailed with a tenth of the products sold out, and creation dates lean
+towards the end of the year.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from mongoengine import disconnect_all
+from django_app import db
+from django_app.models.category import Category
+from django_app.models.product import Product
+
+ADJECTIVES = [
+    "wireless", "portable", "compact", "ergonomic", "premium", "classic", "smart", "rugged",
+    "lightweight", "stainless", "organic", "vintage", "modular", "foldable", "waterproof", "digital",
+]
+NOUNS = [
+    "headphones", "keyboard", "mouse", "monitor", "lamp", "backpack", "kettle", "blender",
+    "jacket", "sneakers", "novel", "notebook", "speaker", "camera", "watch", "chair",
+    "desk", "bottle", "charger", "router", "tent", "drill", "mixer", "toaster",
+]
+WORDS = [f"term{i:04d}" for i in range(2000)]
+BRANDS = [f"Brand {i:03d}" for i in range(500)]
+
+
+def category_titles(count):
+    return [f"Category {i:02d}" for i in range(count)]
+
+
+def use_database(name):
+    """Point every MongoEngine connection alias at the database ``name``."""
+    settings.MONGODB_SETTINGS = {**settings.MONGODB_SETTINGS, "db": name}
+    disconnect_all()
+    db.connect()
+
+
+def zipf_weights(count, skew):
+    """Cumulative weights of ranks 1..count under a Zipf law with exponent ``skew``."""
+    weights, total = [], 0.0
+    for rank in range(1, count + 1):
+        total += rank ** -skew
+        weights.append(total)
+    return weights
+
+
+def ensure_categories(count=50):
+    """Create the first ``count`` categories if missing; their ids, most popular first."""
+    titles = category_titles(count)
+    collection = Category._get_collection()
+    now = datetime.utcnow()
+    for title in titles:
+        collection.update_one(
+            {"title": title},
+            {"$setOnInsert": {"title": title, "description": f"{title} products", "created_at": now, "updated_at": now}},
+            upsert=True,
+        )
+    ids = {category["title"]: category["_id"] for category in collection.find({"title": {"$in": titles}})}
+    return [ids[title] for title in titles]
+
+
+def generate_products(count, category_ids, seed=42, start=0, skew=1.0):
+    """Yield ``count`` product documents in their stored form."""
+    rng = random.Random(seed + start)
+    category_weights = zipf_weights(len(category_ids), skew)
+    brand_weights = zipf_weights(len(BRANDS), skew)
+    epoch = datetime(2024, 1, 1)
+    year = 365 * 24 * 3600
+    for i in range(start, start + count):
+        created_at = epoch + timedelta(seconds=int(rng.betavariate(1 + skew, 1) * year))
+        updated_at = created_at
+        if rng.random() < 0.3:
+            updated_at += timedelta(seconds=rng.randrange(year))
+        yield {
+            "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}",
+            "category": rng.choices(category_ids, cum_weights=category_weights)[0],
+            "description": " ".join(rng.choice(WORDS) for _ in range(12)),
+            "price": round(min(max(rng.lognormvariate(3.5, 1.2), 1), 20000), 2),
+            "brand": rng.choices(BRANDS, cum_weights=brand_weights)[0],
+            "quantity": 0 if rng.random() < 0.1 else min(int(rng.expovariate(1 / 40)) + 1, 10000),
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+
+def load(count, categories=50, skew=1.0, seed=42, chunk_size=10000, drop=False):
+    if drop:
+        Product.drop_collection()
+    Product.ensure_indexes()
+    category_ids = ensure_categories(categories)
+    collection = Product._get_collection()
+    start = collection.estimated_document_count()
+    started = time.monotonic()
+    batch = []
+    for document in generate_products(count, category_ids, seed=seed, start=start, skew=skew):
+        batch.append(document)
+        if len(batch) == chunk_size:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+    return time.monotonic() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of category and brand popularity.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default="product_bench")
+    parser.add_argument("--drop", action="store_true", help="Drop the products collection first.")
+    args = parser.parse_args()
+
+    use_database(args.db)
+    elapsed = load(args.products, args.categories, args.skew, args.seed, drop=args.drop)
+    print(f"Inserted {args.products} products in {args.categories} categories into '{args.db}' in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests are routed through asgi_urls, which serves the product and category
+list/retrieve endpoints with async views on the async Mongo driver.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -12,5 +14,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+os.environ.setdefault("DJANGO_ROOT_URLCONF", "django_app.asgi_urls")
 
 application = get_asgi_application()
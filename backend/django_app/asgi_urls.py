@@ -0,0 +1,53 @@
+# django_app/asgi_urls.py
+#
+# URLconf of the ASGI app (see asgi.py): the routes of urls.py, with the read
+# endpoints below served by coroutine views on the async Mongo driver. Every
+# other method on those routes still goes to the DRF view, on a worker thread.
+
+from asgiref.sync import sync_to_async
+from django.urls import URLPattern, include, path
+from django.views.decorators.csrf import csrf_exempt
+from django_app.urls import router, urlpatterns as sync_urlpatterns
+from django_app.views.async_category_views import AsyncCategoryViewSet
+from django_app.views.async_product_views import AsyncProductViewSet
+
+ASYNC_VIEWS = {
+    "product-list": {"get": AsyncProductViewSet().list},
+    "product-detail": {"get": AsyncProductViewSet().retrieve},
+    "category-list": {"get": AsyncCategoryViewSet().list},
+    "category-detail": {"get": AsyncCategoryViewSet().retrieve},
+}
+
+
+def async_route(sync_view, handlers):
+    """
+    A coroutine view serving the methods in ``handlers`` natively (HEAD as
+    GET) and handing every other method to ``sync_view``.
+    """
+    sync_handler = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        method = "get" if request.method == "HEAD" else request.method.lower()
+        handler = handlers.get(method)
+        if handler is None:
+            return await sync_handler(request, *args, **kwargs)
+        return await handler(request, *args, **kwargs)
+    # Keep the viewset's routing attributes for the metrics route labels.
+    view.cls, view.initkwargs, view.actions = sync_view.cls, sync_view.initkwargs, sync_view.actions
+    return csrf_exempt(view)
+
+
+def with_async_views(patterns):
+    """The router's patterns, in order, with the async views swapped in."""
+    return [
+        URLPattern(pattern.pattern, async_route(pattern.callback, ASYNC_VIEWS[pattern.name]),
+                   pattern.default_args, pattern.name)
+        if pattern.name in ASYNC_VIEWS and "format" not in pattern.pattern.regex.groupindex
+        else pattern
+        for pattern in patterns
+    ]
+
+
+urlpatterns = [
+    path('', include(with_async_views(router.urls))),
+] + sync_urlpatterns
@@ -0,0 +1,114 @@
+"""
+HTTP validators (ETag / Last-Modified) derived from ``updated_at``.
+
+Single documents get a strong ETag built from their id and the millisecond
+``updated_at`` Mongo stores, so it also identifies the version for If-Match
+updates. Listings get an ETag hashed from the newest ``updated_at`` and the
+document count of the filtered set (a delete lowers the count), plus the
+request variant. Listings carry no Last-Modified, since a delete does not
+move max(updated_at) and If-Modified-Since would then miss it.
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+EPOCH = datetime(1970, 1, 1)
+MILLISECOND = timedelta(milliseconds=1)
+
+
+class PreconditionFailedError(Exception):
+    """The stored version no longer matches the client's If-Match ETag."""
+
+
+def version(updated_at):
+    """``updated_at`` as whole milliseconds, the precision Mongo stores."""
+    if timezone.is_aware(updated_at):
+        updated_at = timezone.make_naive(updated_at, dt_timezone.utc)
+    return (updated_at - EPOCH) // MILLISECOND
+
+
+def document_etag(document_id, updated_at, variant=None):
+    etag = f"{document_id}.{version(updated_at):x}"
+    if variant:
+        etag += "." + hashlib.sha1(variant.encode()).hexdigest()[:8]
+    return f'"{etag}"'
+
+
+def listing_etag(*parts):
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'"l.{digest}"'
+
+
+def last_modified(updated_at):
+    if timezone.is_naive(updated_at):
+        updated_at = timezone.make_aware(updated_at, timezone.get_default_timezone())
+    return http_date(updated_at.timestamp())
+
+
+def request_variant(request, *ignored):
+    """The query string, sorted, as the representation variant of a response."""
+    return "&".join(
+        f"{key}={value}"
+        for key, values in sorted(request.query_params.lists()) if key not in ignored
+        for value in sorted(values)
+    )
+
+
+def parse_etags(header):
+    return [etag.strip() for etag in header.split(",") if etag.strip()]
+
+
+def expected_versions(request, document_id):
+    """
+    The ``updated_at`` values an If-Match header accepts for ``document_id``,
+    or None when the update is unconditional (no header, or ``*``). If-Match
+    uses the strong comparison (RFC 9110), so weak ETags never match.
+    """
+    header = request.headers.get("If-Match")
+    if header is None:
+        return None
+    etags = parse_etags(header)
+    if "*" in etags:
+        return None
+    versions = []
+    for etag in etags:
+        if etag.startswith("W/"):
+            continue
+        parts = etag.strip('"').split(".")
+        if len(parts) < 2 or parts[0] != str(document_id):
+            continue
+        try:
+            versions.append(EPOCH + int(parts[1], 16) * MILLISECOND)
+        except ValueError:
+            continue
+    return versions
+
+
+def is_not_modified(request, etag, modified=None):
+    """
+    Whether the client's cached copy is current. If-None-Match takes
+    precedence over If-Modified-Since, as RFC 9110 requires.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        etags = [value.removeprefix("W/") for value in parse_etags(if_none_match)]
+        return "*" in etags or etag in etags
+    if modified is not None:
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        if since is not None:
+            return parse_http_date_safe(modified) <= since
+    return False
+
+
+def with_validators(response, etag, modified=None):
+    response["ETag"] = etag
+    if modified is not None:
+        response["Last-Modified"] = modified
+    return response
+
+
+def not_modified_response(etag, modified=None):
+    return with_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, modified)
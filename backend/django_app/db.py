@@ -0,0 +1,131 @@
+import os
+import threading
+import mongoengine
+from django.conf import settings
+from mongoengine.connection import get_db
+from pymongo import monitoring
+from django_app.query_stats import query_listener
+
+DEFAULT_ALIAS = "default"
+# Same server and pool settings as the default alias, with
+# MONGODB_READ_PREFERENCE. Reads that can tolerate replication lag use it.
+READ_ALIAS = "read"
+ALIASES = (DEFAULT_ALIAS, READ_ALIAS)
+
+_registered = False
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Connection pool counters for one alias, summed over the pools of every
+    server the alias's clients talk to.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.open = 0
+            self.checked_out = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+
+    def _add(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def connection_created(self, event):
+        self._add(open=1)
+
+    def connection_closed(self, event):
+        self._add(open=-1)
+
+    def connection_checked_out(self, event):
+        self._add(checked_out=1, checkouts=1)
+
+    def connection_checked_in(self, event):
+        self._add(checked_out=-1)
+
+    def connection_check_out_failed(self, event):
+        self._add(checkout_failures=1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def stats(self):
+        max_size = connection_settings(self.alias).get("maxPoolSize", 100)
+        with self._lock:
+            return {
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "max_size": max_size,
+                "utilization": self.checked_out / max_size if max_size else 0.0,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+            }
+
+
+pool_monitors = {alias: PoolMonitor(alias) for alias in ALIASES}
+
+
+def connection_settings(alias=DEFAULT_ALIAS):
+    if alias == READ_ALIAS:
+        return {**settings.MONGODB_SETTINGS, "readPreference": settings.MONGODB_READ_PREFERENCE}
+    return settings.MONGODB_SETTINGS
+
+
+def connect():
+    """
+    Register the MongoEngine connections from MONGODB_SETTINGS without
+    opening them: pymongo connects on the first query, so importing settings,
+    running management commands and booting workers cost no round trips and
+    don't hang when Mongo is slow.
+
+    The connections are fork-safe: a child process drops any client it
+    inherited and registers fresh ones, so gunicorn workers never share
+    sockets with the master (or each other) even with --preload.
+    """
+    global _registered
+    for alias in ALIASES:
+        mongoengine.connect(
+            alias=alias, connect=False, event_listeners=[pool_monitors[alias], query_listener],
+            **connection_settings(alias),
+        )
+    if not _registered:
+        os.register_at_fork(after_in_child=_reconnect)
+        _registered = True
+
+
+def _reconnect():
+    mongoengine.disconnect_all()
+    for monitor in pool_monitors.values():
+        monitor.reset()
+    connect()
+
+
+def collection(document, alias=DEFAULT_ALIAS):
+    """``document``'s collection on the connection ``alias``."""
+    return get_db(alias)[document._get_collection_name()]
+
+
+def pool_stats():
+    return {alias: monitor.stats() for alias, monitor in pool_monitors.items()}
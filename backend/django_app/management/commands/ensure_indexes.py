@@ -0,0 +1,118 @@
+from datetime import datetime
+from bson import ObjectId
+from django.core.management.base import BaseCommand, CommandError
+from django_app.models.category import Category
+from django_app.models.product import Product
+from django_app.pagination import KeysetPagination
+from django_app.services.category_service import CategoryService
+from django_app.services.product_service import ProductService
+from django_app.views.category_views import CategoryViewSet
+from django_app.views.product_views import ProductViewSet
+
+DOCUMENTS = [Category, Product]
+
+# Every query shape the services and listing endpoints issue, built with
+# placeholder values. Unfiltered, unordered listings are left out since they
+# scan by design.
+QUERY_SHAPES = [
+    ("product by name", lambda: Product.objects(name="")),
+    ("products by category", lambda: ProductService.filter_products_by_category(ObjectId())),
+    ("products in categories", lambda: Product.objects(category__in=[ObjectId()])),
+    ("products by price range", lambda: ProductService.filter_products(
+        filters={"price_min": 0.01, "price_max": 1})),
+    ("products by created_at range", lambda: ProductService.filter_products(
+        filters={"created_after": datetime.min, "created_before": datetime.max})),
+    ("products by updated_at range", lambda: ProductService.filter_products(
+        filters={"updated_after": datetime.min, "updated_before": datetime.max})),
+    ("products text search", lambda: ProductService.filter_products(
+        filters={"price_min": 0.01}).search_text("placeholder")),
+    ("category by title", lambda: Category.objects(title="")),
+    ("categories by titles", lambda: Category.objects(title__in=[""])),
+    ("categories by created_at range", lambda: CategoryService.filter_categories(
+        filters={"created_after": datetime.min, "created_before": datetime.max})),
+    ("categories by updated_at range", lambda: CategoryService.filter_categories(
+        filters={"updated_after": datetime.min, "updated_before": datetime.max})),
+]
+
+
+def cursor_shapes(name, filter_queryset, fields, placeholders):
+    """
+    The shapes a client can select through ?ordering=: plain ordering, and
+    the keyset pages (first and following) on the same field.
+    """
+    shapes = []
+    for field in fields:
+        cursor = {"value": placeholders[field], "id": ObjectId()}
+        shapes += [
+            (f"{name} ordered by {field}",
+             lambda field=field: filter_queryset(ordering=field)),
+            (f"{name} cursor page on {field}",
+             lambda field=field, cursor=cursor: KeysetPagination.keyset_queryset(
+                 filter_queryset(ordering=field), field, False, cursor)),
+            (f"{name} reverse cursor page on -{field}",
+             lambda field=field, cursor=cursor: KeysetPagination.keyset_queryset(
+                 filter_queryset(ordering=f"-{field}"), field, True, cursor)),
+        ]
+    return shapes
+
+
+QUERY_SHAPES += cursor_shapes(
+    "products", ProductService.filter_products, ProductViewSet.cursor_ordering_fields,
+    {"name": "", "price": 0.01, "brand": "", "quantity": 0,
+     "created_at": datetime.min, "updated_at": datetime.min},
+)
+QUERY_SHAPES += cursor_shapes(
+    "categories", CategoryService.filter_categories, CategoryViewSet.cursor_ordering_fields,
+    {"title": "", "created_at": datetime.min, "updated_at": datetime.min},
+)
+QUERY_SHAPES += [
+    ("products cursor page on id", lambda: KeysetPagination.keyset_queryset(
+        ProductService.filter_products(), "id", False, {"id": ObjectId()})),
+]
+
+
+def plan_stages(plan):
+    """Yield the name of every stage in an explain() plan tree."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+
+class Command(BaseCommand):
+    help = "Build the indexes declared on the documents, or check that every service query uses one."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Run explain() on every query shape and fail if any of them is a COLLSCAN.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            self.check_query_plans()
+            return
+        for document in DOCUMENTS:
+            document.ensure_indexes()
+            collection = document._get_collection_name()
+            self.stdout.write(f"Ensured indexes on '{collection}' (background build)")
+
+    def check_query_plans(self):
+        collection_scans = []
+        for label, build_queryset in QUERY_SHAPES:
+            plan = build_queryset().explain()["queryPlanner"]["winningPlan"]
+            if "COLLSCAN" in plan_stages(plan):
+                collection_scans.append(label)
+                self.stdout.write(self.style.ERROR(f"COLLSCAN  {label}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"indexed   {label}"))
+        if collection_scans:
+            raise CommandError(
+                f"{len(collection_scans)} query shape(s) scan the whole collection: "
+                f"{', '.join(collection_scans)}"
+            )
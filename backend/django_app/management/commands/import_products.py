@@ -0,0 +1,36 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django_app.services.product_service import ProductService
+
+
+class Command(BaseCommand):
+    help = "Upsert products by name from an NDJSON or CSV file, reading it in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument(
+            "--format",
+            choices=("ndjson", "csv"),
+            help="File format. Defaults to csv for .csv files and ndjson otherwise.",
+        )
+        parser.add_argument("--chunk-size", type=int, help="Rows validated and written per bulk_write.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        import_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "ndjson")
+        parse = ProductService.parse_csv if import_format == "csv" else ProductService.parse_ndjson
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as lines:
+                summary = ProductService.import_products(parse(lines), chunk_size=options["chunk_size"])
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+
+        for rejected in summary["rejected_rows"]:
+            self.stderr.write(f"line {rejected['line']}: {json.dumps(rejected['errors'])}")
+        if summary["rejected"] > len(summary["rejected_rows"]):
+            self.stderr.write(f"... and {summary['rejected'] - len(summary['rejected_rows'])} more rejected rows")
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['rows']} rows in {summary['elapsed_seconds']}s ({summary['rows_per_second']} rows/s): "
+            f"{summary['inserted']} inserted, {summary['updated']} updated, "
+            f"{summary['unchanged']} unchanged, {summary['rejected']} rejected"
+        ))
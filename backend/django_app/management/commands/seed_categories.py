@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django_app.services.category_service import CategoryService
+
+DEFAULT_CATEGORIES = [
+    {"title": "Electronics", "description": "Electronic gadgets and devices"},
+    {"title": "Clothing", "description": "Apparel and fashion wear"},
+    {"title": "Books", "description": "Books from various genres"},
+    {"title": "Food", "description": "Groceries and food items"},
+    {"title": "Kitchen Essentials", "description": "Cookware and kitchen accessories"},
+]
+
+
+class Command(BaseCommand):
+    help = "Create the default categories that don't exist yet. Safe to run on every deploy."
+
+    def handle(self, *args, **options):
+        created = CategoryService.seed_categories(DEFAULT_CATEGORIES)
+        self.stdout.write(self.style.SUCCESS(
+            f"{created} of {len(DEFAULT_CATEGORIES)} default categories created"
+        ))
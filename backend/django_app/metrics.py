@@ -0,0 +1,132 @@
+"""
+Prometheus metrics: request latency and status counts per route, cache hit
+ratios and Mongo pool gauges, served at /metrics.
+
+Routes are labelled by viewset action (``product-list``,
+``category-list_products``), never by raw URL, so the label set stays
+bounded. Requests that match no route are labelled ``unmatched``.
+
+Under gunicorn, gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR before the
+workers import prometheus_client. Each worker then writes its samples to its
+own memory-mapped files, with no locking across processes. A scrape of any
+worker merges the files of every worker. Cache and pool gauges are refreshed
+at most every ``METRICS["GAUGE_INTERVAL"]`` seconds per worker, when a
+request finishes or a scrape comes in.
+"""
+import os
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from django_app import db
+from django_app.repositories.category_repository import CategoryRepository
+from django_app.response_cache import response_cache
+from django_app.services.product_service import ProductService
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", ["route", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS = Counter("http_requests_total", "Responses by route and status code.", ["route", "method", "status"])
+
+# Summed over live workers; hit ratios are per worker (a "pid" label in
+# multiprocess mode).
+CACHE_HITS = Gauge("cache_hits", "Cache hits.", ["cache"], multiprocess_mode="livesum")
+CACHE_MISSES = Gauge("cache_misses", "Cache misses.", ["cache"], multiprocess_mode="livesum")
+CACHE_HIT_RATIO = Gauge("cache_hit_ratio", "Cache hit ratio.", ["cache"], multiprocess_mode="liveall")
+
+POOL_OPEN = Gauge("mongo_pool_open_connections", "Open pool connections.", ["alias"], multiprocess_mode="livesum")
+POOL_CHECKED_OUT = Gauge(
+    "mongo_pool_checked_out_connections", "Pool connections in use.", ["alias"], multiprocess_mode="livesum"
+)
+POOL_MAX_SIZE = Gauge("mongo_pool_max_size", "Pool size limit.", ["alias"], multiprocess_mode="livesum")
+POOL_CHECKOUT_FAILURES = Gauge(
+    "mongo_pool_checkout_failures", "Failed connection checkouts.", ["alias"], multiprocess_mode="livesum"
+)
+
+CACHES = {
+    "response": response_cache.stats,
+    "category": CategoryRepository.cache_stats,
+    "product_stats": ProductService.stats_cache_stats,
+}
+
+_gauges_refreshed = 0.0
+
+
+def refresh_gauges(force=False):
+    global _gauges_refreshed
+    now = time.monotonic()
+    if not force and now - _gauges_refreshed < settings.METRICS["GAUGE_INTERVAL"]:
+        return
+    _gauges_refreshed = now
+    for name, stats in CACHES.items():
+        stats = stats()
+        CACHE_HITS.labels(name).set(stats["hits"])
+        CACHE_MISSES.labels(name).set(stats["misses"])
+        CACHE_HIT_RATIO.labels(name).set(stats["hit_ratio"])
+    for alias, stats in db.pool_stats().items():
+        POOL_OPEN.labels(alias).set(stats["open"])
+        POOL_CHECKED_OUT.labels(alias).set(stats["checked_out"])
+        POOL_MAX_SIZE.labels(alias).set(stats["max_size"])
+        POOL_CHECKOUT_FAILURES.labels(alias).set(stats["checkout_failures"])
+
+
+def route_label(request):
+    """``<basename>-<action>`` of the viewset serving ``request``, else the URL name."""
+    match = request.resolver_match
+    if match is None:
+        return "unmatched"
+    view = match.func
+    actions = getattr(view, "actions", None)
+    if actions:
+        action = actions.get("get" if request.method == "HEAD" else request.method.lower())
+        basename = view.initkwargs.get("basename")
+        if action and basename:
+            return f"{basename}-{action}"
+    return match.view_name or "unmatched"
+
+
+def exposition():
+    """The metrics of every worker (or of this process) in the text format."""
+    refresh_gauges(force=True)
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """Times every request and counts its response status, by route."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    @staticmethod
+    def _observe(request, response, started):
+        route = route_label(request)
+        REQUEST_LATENCY.labels(route, request.method).observe(time.perf_counter() - started)
+        REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+        refresh_gauges()
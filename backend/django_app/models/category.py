@@ -8,6 +8,15 @@ class Category(Document):
     created_at = DateTimeField(default=timezone.now)
     updated_at = DateTimeField(default=timezone.now)
 
-    meta = {'collection': 'categories'}
+    meta = {
+        'collection': 'categories',
+        'indexes': [
+            {'fields': ['title'], 'unique': True},
+            ('title', 'id'),
+            ('created_at', 'id'),
+            ('updated_at', 'id'),
+        ],
+        'index_background': True,
+    }
 
     
\ No newline at end of file
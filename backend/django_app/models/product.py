@@ -15,4 +15,27 @@ class Product(Document):
     created_at = DateTimeField(default=timezone.now)
     updated_at = DateTimeField(default=timezone.now)
 
-    meta = {'collection': 'products'}
\ No newline at end of file
+    meta = {
+        'collection': 'products',
+        'indexes': [
+            {'fields': ['name'], 'unique': True},
+            ('category', 'created_at'),
+            # (field, _id) pairs serve both plain ordering/range filters and
+            # the keyset pagination tiebreaker sort on every cursor field.
+            ('name', 'id'),
+            ('price', 'id'),
+            ('brand', 'id'),
+            ('quantity', 'id'),
+            ('created_at', 'id'),
+            ('updated_at', 'id'),
+            # Full-text search (GET /products/search/); a collection can
+            # only have one text index.
+            {
+                'fields': ['$name', '$brand', '$description'],
+                'weights': {'name': 10, 'brand': 5, 'description': 1},
+                'default_language': 'english',
+                'name': 'product_text',
+            },
+        ],
+        'index_background': True,
+    }
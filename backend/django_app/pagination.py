@@ -0,0 +1,290 @@
+import json
+import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from bson import ObjectId
+from functools import partial
+from bson.errors import InvalidId
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from mongoengine.queryset.visitor import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class QuerySetPaginator(Paginator):
+    """
+    Paginator for MongoEngine querysets.
+
+    Django's Paginator falls back to len() when count() takes arguments,
+    which evaluates the whole queryset. This runs the count in Mongo and
+    relies on queryset slicing, so only the requested page is fetched
+    with skip/limit. A ``count`` the caller already ran is used as is.
+    """
+
+    def __init__(self, object_list, per_page, *args, count=None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.known_count = count
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        return self.object_list.count()
+
+
+class QuerySetPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination over a QuerySetPaginator. Listings that already
+    counted their rows for the ETag pass that ``count`` so it isn't run twice.
+    """
+
+    django_paginator_class = QuerySetPaginator
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        self.django_paginator_class = partial(QuerySetPaginator, count=count)
+        return super().paginate_queryset(queryset, request, view)
+
+
+def encode_cursor(payload):
+    return urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(encoded):
+    return json.loads(urlsafe_b64decode(encoded.encode()))
+
+
+class AsyncPageNumberPagination:
+    """
+    PageNumberPagination for the async views: the same ``?page=`` values,
+    bounds and response body, with the page fetched by a coroutine instead
+    of a Paginator over a queryset. The row count comes from the listing
+    validators, which already ran it.
+    """
+
+    page_query_param = "page"
+    last_page_strings = ("last",)
+    invalid_page_message = "Invalid page."
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+
+    async def paginate(self, count, fetch, request):
+        """``count`` is the number of rows and ``fetch(skip, limit)`` returns a page of them."""
+        self.request = request
+        self.count = count
+        page = request.query_params.get(self.page_query_param) or 1
+        if page in self.last_page_strings:
+            self.page = self.num_pages
+        else:
+            try:
+                self.page = int(page)
+            except (TypeError, ValueError):
+                raise NotFound(self.invalid_page_message)
+            if not 1 <= self.page <= self.num_pages:
+                raise NotFound(self.invalid_page_message)
+        return await fetch((self.page - 1) * self.page_size, self.page_size)
+
+    @property
+    def num_pages(self):
+        return max(1, math.ceil(self.count / self.page_size))
+
+    def get_paginated_data(self, data):
+        return {
+            "count": self.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_next_link(self):
+        if self.page >= self.num_pages:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page + 1)
+
+    def get_previous_link(self):
+        if self.page <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page - 1)
+
+
+class KeysetPagination:
+    """
+    Cursor pagination keyed on the active ordering field plus _id as a
+    tiebreaker. Each page is a range query from the last key seen, so deep
+    pages cost the same as the first one, and no count is ever run.
+
+    Opt-in with ``?cursor=`` (empty for the first page); the response carries
+    opaque ``next``/``previous`` cursors.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+
+    def __init__(self, page_size, ordering_fields):
+        self.page_size = page_size
+        self.ordering_fields = ordering_fields
+
+    @classmethod
+    def is_requested(cls, request):
+        return cls.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, ordering=None):
+        field, descending, cursor = self.start(request, ordering)
+        queryset = self.keyset_queryset(queryset, field, descending, cursor)
+        return self.finish(list(queryset.limit(self.page_size + 1)))
+
+    async def apaginate(self, find, request, ordering=None):
+        """
+        paginate_queryset for the async views: ``find(field, descending,
+        cursor, limit)`` runs the keyset query and returns the documents.
+        """
+        field, descending, cursor = self.start(request, ordering)
+        return self.finish(await find(field, descending, cursor, self.page_size + 1))
+
+    def start(self, request, ordering):
+        self.request = request
+        self.descending = bool(ordering) and ordering.startswith("-")
+        self.field = ordering.lstrip("-") if ordering else "id"
+        if self.field not in self.ordering_fields and self.field != "id":
+            raise ValidationError({"ordering": [f"Cursor pagination cannot order by '{self.field}'."]})
+
+        cursor = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        self.has_cursor = cursor is not None
+        self.reverse = bool(cursor and cursor["reverse"])
+
+        # Walking backwards flips both the comparison and the sort order;
+        # the page is put back in display order afterwards.
+        return self.field, self.descending != self.reverse, cursor
+
+    def finish(self, items):
+        self.has_more = len(items) > self.page_size
+        items = items[:self.page_size]
+        if self.reverse:
+            items.reverse()
+        self.items = items
+        return items
+
+    @staticmethod
+    def keyset_queryset(queryset, field, descending, cursor=None):
+        """
+        Sort ``queryset`` on ``(field, _id)`` and, given a cursor, keep only
+        the rows after its key. Served by the ``(field, _id)`` indexes.
+        """
+        sign = "-" if descending else ""
+        queryset = queryset.order_by(f"{sign}{field}", f"{sign}id")
+        conditions = KeysetPagination.keyset_conditions(field, descending, cursor)
+        return queryset.filter(conditions) if conditions else queryset
+
+    @staticmethod
+    def keyset_conditions(field, descending, cursor=None):
+        """The Q object selecting the rows after ``cursor``, or None without one."""
+        if not cursor:
+            return None
+        operator = "lt" if descending else "gt"
+        if field == "id":
+            return Q(**{f"id__{operator}": cursor["id"]})
+        return (
+            Q(**{f"{field}__{operator}": cursor["value"]})
+            | Q(**{field: cursor["value"], f"id__{operator}": cursor["id"]})
+        )
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_next_link(self):
+        if not self.items or (not self.reverse and not self.has_more):
+            return None
+        return self.build_link(self.items[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.items or not self.has_cursor or (self.reverse and not self.has_more):
+            return None
+        return self.build_link(self.items[0], reverse=True)
+
+    def build_link(self, item, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "page")
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(item, reverse))
+
+    def encode_cursor(self, item, reverse):
+        value = self.key_value(item, self.field)
+        if isinstance(value, datetime):
+            value = {"$date": value.isoformat()}
+        elif isinstance(value, ObjectId):
+            value = str(value)
+        payload = {"v": value, "i": str(self.key_value(item, "id")), "r": int(reverse)}
+        return encode_cursor(payload)
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            payload = decode_cursor(encoded)
+            value = payload["v"]
+            if isinstance(value, dict):
+                value = datetime.fromisoformat(value["$date"])
+            return {"value": value, "id": ObjectId(payload["i"]), "reverse": bool(payload["r"])}
+        except (TypeError, ValueError, KeyError, AttributeError, InvalidId):
+            raise ValidationError({"cursor": [self.invalid_cursor_message]})
+
+    @staticmethod
+    def key_value(item, field):
+        if isinstance(item, dict):
+            return item.get("_id" if field == "id" else field)
+        return getattr(item, field)
+
+
+class SearchCursorPagination:
+    """
+    Forward-only cursor pagination over relevance-ranked search results,
+    keyed on (score descending, _id ascending). ``search(after, limit)``
+    returns the matching raw documents with their ``score``.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor."
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+
+    def paginate(self, search, request):
+        self.request = request
+        after = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        items = search(after, self.page_size + 1)
+        self.has_more = len(items) > self.page_size
+        self.items = items[:self.page_size]
+        return self.items
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_next_link(self):
+        if not self.has_more:
+            return None
+        last = self.items[-1]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, encode_cursor({"s": last["score"], "i": str(last["_id"])})
+        )
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None
+        try:
+            payload = decode_cursor(encoded)
+            return float(payload["s"]), ObjectId(payload["i"])
+        except (TypeError, ValueError, KeyError, AttributeError, InvalidId):
+            raise ValidationError({"cursor": [self.invalid_cursor_message]})
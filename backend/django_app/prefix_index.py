@@ -0,0 +1,136 @@
+import threading
+import time
+from bisect import bisect_left, insort
+
+
+class PrefixIndex:
+    """
+    Thread-safe in-process autocomplete index over short strings of a few
+    kinds (e.g. product names and brands).
+
+    Entries are kept in one sorted list of ``(casefolded text, kind, text)``
+    so a prefix lookup is a binary search followed by a short forward scan.
+    Each entry is reference counted, so a brand shared by many products is
+    listed once and only disappears with its last product.
+
+    ``loader`` returns an iterable of ``(kind, text)`` pairs. The first
+    lookup builds the index from it. Once ``ttl`` seconds have passed, or
+    after ``invalidate()``, the next lookup starts a rebuild through
+    ``spawn`` (a background thread by default) and keeps answering from the
+    current entries until the new ones are swapped in. Rebuilds also pick up
+    writes made by other processes.
+
+    The loader runs without holding the lock, so lookups and ``add()`` /
+    ``remove()`` never wait on it. Writes made while a rebuild runs are
+    replayed onto the new entries. A write the loader has already seen is
+    then counted twice, and the next rebuild corrects that.
+    """
+
+    def __init__(self, loader, ttl=300, timer=time.monotonic, spawn=None):
+        self.loader = loader
+        self.ttl = ttl
+        self.timer = timer
+        self.spawn = spawn or (lambda target: threading.Thread(target=target, daemon=True).start())
+        self._entries = []
+        self._counts = {}
+        self._expires_at = None
+        self._pending = None  # writes made during a rebuild, None when none runs
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    @property
+    def is_built(self):
+        return self._expires_at is not None
+
+    def suggest(self, prefix, limit=10):
+        """Return up to ``limit`` ``(text, kind)`` pairs starting with ``prefix``, in order."""
+        if not self.is_built:
+            self._build()
+        elif self._expires_at <= self.timer() and self._pending is None:
+            self.spawn(self._build)
+        key = prefix.casefold()
+        with self._lock:
+            matches = []
+            position = bisect_left(self._entries, (key,))
+            while position < len(self._entries) and len(matches) < limit:
+                folded, kind, text = self._entries[position]
+                if not folded.startswith(key):
+                    break
+                matches.append((text, kind))
+                position += 1
+            return matches
+
+    def add(self, kind, text):
+        self._update(kind, text, 1)
+
+    def remove(self, kind, text):
+        self._update(kind, text, -1)
+
+    def invalidate(self):
+        """Rebuild on the next lookup, which meanwhile still answers from the current entries."""
+        with self._lock:
+            self._generation += 1
+            if self._expires_at is not None:
+                self._expires_at = float("-inf")
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries = []
+            self._counts = {}
+            self._expires_at = None
+
+    def stats(self):
+        return {"entries": len(self._entries), "built": self.is_built}
+
+    def _update(self, kind, text, delta):
+        if not text:
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((kind, text, delta))
+            if self._expires_at is not None:
+                self._apply(self._counts, self._entries, kind, text, delta)
+
+    @staticmethod
+    def _apply(counts, entries, kind, text, delta):
+        count = counts.get((kind, text), 0)
+        if delta < 0 and not count:
+            return
+        entry = (text.casefold(), kind, text)
+        if count + delta:
+            counts[(kind, text)] = count + delta
+            if not count:
+                insort(entries, entry)
+            return
+        del counts[(kind, text)]
+        position = bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    def _build(self):
+        with self._build_lock:
+            with self._lock:
+                if self._expires_at is not None and self._expires_at > self.timer():
+                    return  # another thread rebuilt it meanwhile
+                self._pending = []
+                generation = self._generation
+            try:
+                counts = {}
+                for kind, text in self.loader():
+                    if text:
+                        counts[(kind, text)] = counts.get((kind, text), 0) + 1
+                entries = sorted((text.casefold(), kind, text) for kind, text in counts)
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                for kind, text, delta in self._pending:
+                    self._apply(counts, entries, kind, text, delta)
+                self._counts, self._entries = counts, entries
+                self._pending = None
+                # An invalidate() during the load may have missed writes the loader read past.
+                stale = generation != self._generation
+                self._expires_at = float("-inf") if stale else self.timer() + self.ttl
@@ -0,0 +1,170 @@
+"""
+Per-request Mongo query instrumentation.
+
+``query_listener`` is a pymongo CommandListener registered on every
+connection (sync and async). It adds each command to the ``QueryRecorder``
+of the request running it, found through a context variable that
+``QueryStatsMiddleware`` sets. Commands slower than
+``QUERY_STATS["SLOW_MS"]`` are logged with their filter shape whether or not
+a request is being recorded.
+
+The middleware reports each request's query count, total database time and
+slowest commands in a ``Server-Timing`` header. For a streaming response the
+header only covers the queries made before the response was returned.
+"""
+import contextvars
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+# Parts of a command (find, aggregate, count, update, delete) that select or
+# order documents.
+SHAPE_KEYS = ("filter", "query", "pipeline", "sort", "updates", "deletes")
+
+_recorder = contextvars.ContextVar("query_recorder", default=None)
+
+
+def query_shape(value):
+    """``value`` with every literal replaced by "?", keeping fields and operators."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, (dict, list, tuple)) for item in value):
+            return [query_shape(item) for item in value]
+        return "?"
+    return "?"
+
+
+def command_shape(command):
+    return {key: query_shape(command[key]) for key in SHAPE_KEYS if key in command}
+
+
+class QueryRecorder:
+    """Query count, total time and slowest commands of one request."""
+
+    def __init__(self, slowest=3):
+        self.slowest = slowest
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.commands = []  # (seconds, command name, collection), slowest first
+        self._lock = threading.Lock()
+
+    def add(self, duration, command_name, collection):
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.commands.append((duration, command_name, collection))
+            self.commands.sort(key=lambda command: command[0], reverse=True)
+            del self.commands[self.slowest:]
+
+    def server_timing(self, total=None):
+        metrics = [f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"']
+        metrics += [
+            f'db-{rank};dur={duration * 1000:.1f};desc="{command_name} {collection}"'
+            for rank, (duration, command_name, collection) in enumerate(self.commands, 1)
+        ]
+        if total is not None:
+            metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+class QueryListener(monitoring.CommandListener):
+
+    def __init__(self):
+        self._started = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event):
+        return event.connection_id, event.request_id, event.operation_id
+
+    def started(self, event):
+        command = event.command
+        collection = command.get(event.command_name)
+        with self._lock:
+            self._started[self._key(event)] = (
+                collection if isinstance(collection, str) else event.database_name,
+                command_shape(command),
+            )
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        with self._lock:
+            collection, shape = self._started.pop(self._key(event), (event.database_name, {}))
+        duration = event.duration_micros / 1e6
+        recorder = _recorder.get()
+        if recorder is not None:
+            recorder.add(duration, event.command_name, collection)
+        if duration * 1000 >= settings.QUERY_STATS["SLOW_MS"]:
+            logger.warning(
+                "Slow Mongo %s on %s took %.1fms: %s",
+                event.command_name, collection, duration * 1000, json.dumps(shape, sort_keys=True),
+            )
+
+
+query_listener = QueryListener()
+
+
+@contextmanager
+def record_queries():
+    """Record the Mongo commands run inside the block; yields the QueryRecorder."""
+    recorder = QueryRecorder(settings.QUERY_STATS["SLOWEST"])
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+@contextmanager
+def assert_max_queries(n):
+    """
+    Fail if the block runs more than ``n`` Mongo commands. mongomock emits no
+    command events, so this only constrains tests run against a real mongod.
+    """
+    with record_queries() as recorder:
+        yield recorder
+    assert recorder.count <= n, f"{recorder.count} Mongo queries run, expected at most {n}"
+
+
+class QueryStatsMiddleware:
+    """Adds the request's Mongo query stats as a Server-Timing header."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        return self._add_header(response, recorder, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with record_queries() as recorder:
+            response = await self.get_response(request)
+        return self._add_header(response, recorder, started)
+
+    @staticmethod
+    def _add_header(response, recorder, started):
+        response["Server-Timing"] = recorder.server_timing(time.perf_counter() - started)
+        return response
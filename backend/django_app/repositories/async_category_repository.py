@@ -0,0 +1,53 @@
+import asyncio
+from django_app.models.category import Category
+from django_app import db
+from django_app.repositories.async_mongo import get_database, projection, sort_spec
+
+
+class AsyncCategoryRepository:
+    """Read access to the categories collection on the async driver."""
+
+    @staticmethod
+    def collection(alias=db.DEFAULT_ALIAS):
+        return get_database(alias)[Category._get_collection_name()]
+
+    @staticmethod
+    async def find(query, fields=None, ordering=(), skip=0, limit=0, using=db.DEFAULT_ALIAS):
+        cursor = AsyncCategoryRepository.collection(using).find(
+            query, projection=projection(fields), sort=sort_spec(ordering), skip=skip, limit=limit
+        )
+        return await cursor.to_list()
+
+    @staticmethod
+    async def count(query, using=db.DEFAULT_ALIAS):
+        return await AsyncCategoryRepository.collection(using).count_documents(query)
+
+    @staticmethod
+    async def get_by_id(id, fields=None):
+        return await AsyncCategoryRepository.collection().find_one({"_id": id}, projection=projection(fields))
+
+    @staticmethod
+    async def get_titles_by_ids(ids):
+        categories = await AsyncCategoryRepository.find({"_id": {"$in": list(set(ids))}}, fields=["title"])
+        return {category["_id"]: category["title"] for category in categories}
+
+    @staticmethod
+    async def get_ids_by_titles(titles):
+        categories = await AsyncCategoryRepository.find({"title": {"$in": list(set(titles))}}, fields=["_id"])
+        return [category["_id"] for category in categories]
+
+    @staticmethod
+    async def latest_update(query=None, using=db.DEFAULT_ALIAS):
+        """The newest updated_at among the categories matching ``query`` (all by default) and their count."""
+        query = query or {}
+        return await asyncio.gather(
+            AsyncCategoryRepository.latest_updated_at(query, using),
+            AsyncCategoryRepository.collection(using).count_documents(query),
+        )
+
+    @staticmethod
+    async def latest_updated_at(query=None, using=db.DEFAULT_ALIAS):
+        """The newest updated_at among the categories matching ``query`` (all by default), without counting them."""
+        collection = AsyncCategoryRepository.collection(using)
+        latest = await collection.find_one(query or {}, projection=["updated_at"], sort=[("updated_at", -1)])
+        return latest["updated_at"] if latest else None
@@ -0,0 +1,42 @@
+import asyncio
+import weakref
+from pymongo import AsyncMongoClient
+from django_app import db
+from django_app.query_stats import query_listener
+
+# One client per event loop and alias: the async driver binds its
+# connections to the loop it first runs on.
+_clients = weakref.WeakKeyDictionary()
+
+
+def client_options(mongodb_settings):
+    """pymongo keyword arguments equivalent to mongoengine's MONGODB_SETTINGS."""
+    options = {
+        key: value for key, value in mongodb_settings.items()
+        if key not in ("db", "alias", "authentication_source")
+    }
+    if "authentication_source" in mongodb_settings:
+        options["authSource"] = mongodb_settings["authentication_source"]
+    return options
+
+
+def get_database(alias=db.DEFAULT_ALIAS):
+    """The application database on the async driver for the running loop, on ``alias``'s settings."""
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    mongodb_settings = db.connection_settings(alias)
+    if alias not in clients:
+        clients[alias] = AsyncMongoClient(
+            event_listeners=[db.pool_monitors[alias], query_listener], **client_options(mongodb_settings)
+        )
+    return clients[alias][mongodb_settings["db"]]
+
+def sort_spec(orderings):
+    """pymongo sort keys for MongoEngine-style orderings such as ``-price``."""
+    return [
+        ("_id" if ordering.lstrip("-") == "id" else ordering.lstrip("-"), -1 if ordering.startswith("-") else 1)
+        for ordering in orderings if ordering
+    ] or None
+
+
+def projection(fields):
+    return ["_id" if field == "id" else field for field in fields] if fields else None
@@ -0,0 +1,37 @@
+from django_app.models.product import Product
+from django_app import db
+from django_app.repositories.async_mongo import get_database, projection, sort_spec
+
+
+class AsyncProductRepository:
+    """
+    Read access to the products collection on the async driver. Queries are
+    raw filter documents, built by the services from the same Q objects the
+    MongoEngine path uses; results are raw documents, as from as_pymongo().
+    """
+
+    @staticmethod
+    def collection(alias=db.DEFAULT_ALIAS):
+        return get_database(alias)[Product._get_collection_name()]
+
+    @staticmethod
+    async def find(query, fields=None, ordering=(), skip=0, limit=0, using=db.DEFAULT_ALIAS):
+        cursor = AsyncProductRepository.collection(using).find(
+            query, projection=projection(fields), sort=sort_spec(ordering), skip=skip, limit=limit
+        )
+        return await cursor.to_list()
+
+    @staticmethod
+    async def count(query, using=db.DEFAULT_ALIAS):
+        return await AsyncProductRepository.collection(using).count_documents(query)
+
+    @staticmethod
+    async def get_by_id(id, fields=None):
+        return await AsyncProductRepository.collection().find_one({"_id": id}, projection=projection(fields))
+
+    @staticmethod
+    async def latest_update(query, using=db.DEFAULT_ALIAS):
+        """The newest updated_at among the products matching ``query`` and their count."""
+        collection = AsyncProductRepository.collection(using)
+        latest = await collection.find_one(query, projection=["updated_at"], sort=[("updated_at", -1)])
+        return (latest["updated_at"] if latest else None), await collection.count_documents(query)
@@ -1,32 +1,157 @@
+from django.conf import settings
+from pymongo import UpdateOne
+from mongoengine.queryset import QuerySet
+from django_app import db
 from django_app.models.category import Category
+from django_app.cache import TTLCache
 
 class CategoryRepository:
 
+    # Process-local cache of category documents keyed by id and by title.
+    # Writes through this repository clear it; writes made elsewhere (other
+    # processes, scripts) become visible once entries expire.
+    _cache = TTLCache(
+        max_size=getattr(settings, "CATEGORY_CACHE_MAX_SIZE", 1024),
+        ttl=getattr(settings, "CATEGORY_CACHE_TTL", 300),
+    )
+
     @staticmethod
     def create(category_data):
         category = Category(**category_data)
         category.save()
+        CategoryRepository.invalidate_cache()
         return category
-    
+
     @staticmethod
-    def get_all():
+    def get_all(using=None):
+        """All categories, read through the connection alias ``using`` when given."""
+        if using:
+            return QuerySet(Category, db.collection(Category, using))
         return Category.objects.all()
-    
+
     @staticmethod
     def get_by_id(id):
-        return Category.objects(id=id).first()
-    
+        category = CategoryRepository._cache.get(("id", str(id)))
+        if category is None:
+            category = Category.objects(id=id).first()
+            CategoryRepository._remember(category)
+        return category
+
+    @staticmethod
+    def get_current(category_id):
+        """The raw title and updated_at of a category from the primary, bypassing the cache, or None."""
+        return Category.objects(id=category_id).only("title", "updated_at").as_pymongo().first()
+
     @staticmethod
-    def update(category, data):
-        category.update(**data)
-        category.reload()
+    def update(category_id, data, expected_updated_at=None):
+        categories = Category.objects(id=category_id)
+        if expected_updated_at is not None:
+            categories = categories.filter(updated_at__in=expected_updated_at)
+        category = categories.modify(new=True, **data)
+        CategoryRepository.invalidate_cache()
         return category
-    
+
     @staticmethod
     def delete(category_id):
         category = Category.objects(id=category_id).first()
         category.delete()
+        CategoryRepository.invalidate_cache()
 
     @staticmethod
     def get_by_title(title):
-        return Category.objects(title=title).first()
\ No newline at end of file
+        category = CategoryRepository._cache.get(("title", title))
+        if category is None:
+            category = Category.objects(title=title).first()
+            CategoryRepository._remember(category)
+        return category
+
+    @staticmethod
+    def get_by_ids(ids):
+        categories = {}
+        missing = []
+        for id in set(ids):
+            category = CategoryRepository._cache.get(("id", str(id)))
+            if category is None:
+                missing.append(id)
+            else:
+                categories[category.id] = category
+        if missing:
+            for category in Category.objects(id__in=missing):
+                CategoryRepository._remember(category)
+                categories[category.id] = category
+        return categories
+
+    @staticmethod
+    def get_by_titles(titles):
+        categories = {}
+        missing = []
+        for title in set(titles):
+            category = CategoryRepository._cache.get(("title", title))
+            if category is None:
+                missing.append(title)
+            else:
+                categories[category.title] = category
+        if missing:
+            for category in Category.objects(title__in=missing):
+                CategoryRepository._remember(category)
+                categories[category.title] = category
+        return categories
+
+    @staticmethod
+    def get_titles_by_ids(ids):
+        categories = CategoryRepository.get_by_ids(ids)
+        return {id: category.title for id, category in categories.items()}
+
+    @staticmethod
+    def get_ids_by_titles(titles):
+        categories = CategoryRepository.get_by_titles(titles)
+        return [category.id for category in categories.values()]
+
+    @staticmethod
+    def insert_missing(categories_data, created_at):
+        """
+        Insert the categories whose title does not exist yet, leaving existing
+        ones untouched, with a single unordered bulk_write of upserts. Returns
+        the number inserted.
+        """
+        if not categories_data:
+            return 0
+        operations = []
+        for data in categories_data:
+            fields = Category(**data).to_mongo().to_dict()
+            fields.pop("_id", None)
+            fields["created_at"] = fields["updated_at"] = created_at
+            operations.append(UpdateOne({"title": fields["title"]}, {"$setOnInsert": fields}, upsert=True))
+        result = Category._get_collection().bulk_write(operations, ordered=False)
+        if result.upserted_count:
+            CategoryRepository.invalidate_cache()
+        return result.upserted_count
+
+    @staticmethod
+    def latest_update(categories=None, using=None):
+        """The newest updated_at among ``categories`` (all by default) and their count."""
+        if categories is None:
+            categories = CategoryRepository.get_all(using)
+        return CategoryRepository.latest_updated_at(categories), categories.count()
+
+    @staticmethod
+    def latest_updated_at(categories=None, using=None):
+        """The newest updated_at among ``categories`` (all by default), without counting them."""
+        if categories is None:
+            categories = CategoryRepository.get_all(using)
+        latest = categories.order_by("-updated_at").only("updated_at").as_pymongo().first()
+        return latest["updated_at"] if latest else None
+
+    @staticmethod
+    def invalidate_cache():
+        CategoryRepository._cache.clear()
+
+    @staticmethod
+    def cache_stats():
+        return CategoryRepository._cache.stats()
+
+    @staticmethod
+    def _remember(category):
+        if category is not None:
+            CategoryRepository._cache.set(("id", str(category.id)), category)
+            CategoryRepository._cache.set(("title", category.title), category)
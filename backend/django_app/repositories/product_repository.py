@@ -1,3 +1,7 @@
+from pymongo import DeleteMany, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from mongoengine.queryset import QuerySet
+from django_app import db
 from django_app.models.product import Product
 
 class ProductRepository:
@@ -9,28 +13,242 @@ class ProductRepository:
         return product
 
     @staticmethod
-    def get_all():
+    def get_all(using=None):
+        """All products, read through the connection alias ``using`` when given."""
+        if using:
+            return QuerySet(Product, db.collection(Product, using))
         return Product.objects.all()
     
     @staticmethod
-    def get_by_id(id):
-        return Product.objects(id=id).first()
+    def get_by_id(id, fields=None):
+        products = Product.objects(id=id)
+        if fields:
+            products = products.only(*fields)
+        return products.first()
     
     @staticmethod
-    def update(product, data):
-        product.update(**data)
-        product.reload()
-        return product
+    def update(product_id, data, expected_updated_at=None):
+        """
+        Apply ``data`` in one findAndModify and return ``(previous, updated)``:
+        the product before the write, and the same document with ``data``
+        applied. Both are None when nothing matched. With
+        ``expected_updated_at`` (a list), the update only applies while the
+        stored updated_at is one of them.
+        """
+        products = Product.objects(id=product_id)
+        if expected_updated_at is not None:
+            products = products.filter(updated_at__in=expected_updated_at)
+        previous = products.modify(new=False, **data)
+        if previous is None:
+            return None, None
+        updated = Product._from_son(previous.to_mongo().to_dict())
+        for field, value in data.items():
+            setattr(updated, field, value)
+        return previous, updated
     
     @staticmethod
     def delete(product_id):
         product = Product.objects(id=product_id).first()
         product.delete()
+        return product
 
     @staticmethod
-    def get_by_category(category_id):
-        return Product.objects(category=category_id)
+    def get_by_category(category_id, using=None):
+        return ProductRepository.get_all(using).filter(category=category_id)
     
     @staticmethod
     def get_by_name(product_name):
-        return Product.objects(name=product_name).first()
\ No newline at end of file
+        return Product.objects(name=product_name).first()
+
+    @staticmethod
+    def get_existing_names(names):
+        names = list(set(names))
+        if not names:
+            return set()
+        return set(Product.objects(name__in=names).distinct("name"))
+
+    @staticmethod
+    def bulk_insert(products_data, chunk_size):
+        """
+        Insert the products with unordered insert_many calls of at most
+        ``chunk_size`` documents. Returns the inserted ids and the raw write
+        errors, both keyed by position in ``products_data``.
+        """
+        collection = Product._get_collection()
+        inserted_ids = {}
+        write_errors = {}
+        for start in range(0, len(products_data), chunk_size):
+            documents = [
+                Product(**data).to_mongo()
+                for data in products_data[start:start + chunk_size]
+            ]
+            try:
+                collection.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                for error in e.details["writeErrors"]:
+                    write_errors[start + error["index"]] = error
+            for offset, document in enumerate(documents):
+                if start + offset not in write_errors:
+                    inserted_ids[start + offset] = document["_id"]
+        return inserted_ids, write_errors
+
+    @staticmethod
+    def bulk_update(updates):
+        """
+        Apply ``(product_id, fields)`` pairs with a single unordered
+        bulk_write. Returns the matched and modified counts and the raw write
+        errors keyed by position in ``updates``.
+        """
+        if not updates:
+            return 0, 0, {}
+        operations = [
+            UpdateOne({"_id": product_id}, {"$set": fields})
+            for product_id, fields in updates
+        ]
+        try:
+            result = Product._get_collection().bulk_write(operations, ordered=False)
+            return result.matched_count, result.modified_count, {}
+        except BulkWriteError as e:
+            write_errors = {error["index"]: error for error in e.details["writeErrors"]}
+            return e.details["nMatched"], e.details["nModified"], write_errors
+
+    @staticmethod
+    def bulk_upsert(products_data, updated_at):
+        """
+        Upsert the products by name with a single unordered bulk_write.
+        Existing products get every given field overwritten, and
+        ``updated_at`` only when one of them changed, so re-importing the
+        same rows modifies nothing. New ones also get ``created_at``.
+        Returns the inserted, matched and modified counts and the raw write
+        errors keyed by position in ``products_data``.
+        """
+        if not products_data:
+            return 0, 0, 0, {}
+        operations = []
+        for data in products_data:
+            fields = Product(**data).to_mongo().to_dict()
+            for field in ("_id", "created_at", "updated_at"):
+                fields.pop(field, None)
+            values = {field: {"$literal": value} for field, value in fields.items()}
+            changed = {"$or": [{"$ne": [f"${field}", value]} for field, value in values.items()]}
+            # An update pipeline: every expression in the stage sees the
+            # stored document as it was before the update.
+            operations.append(UpdateOne(
+                {"name": fields["name"]},
+                [{"$set": {
+                    **values,
+                    "updated_at": {"$cond": [changed, updated_at, {"$ifNull": ["$updated_at", updated_at]}]},
+                    "created_at": {"$ifNull": ["$created_at", updated_at]},
+                }}],
+                upsert=True,
+            ))
+        try:
+            result = Product._get_collection().bulk_write(operations, ordered=False)
+            return result.upserted_count, result.matched_count, result.modified_count, {}
+        except BulkWriteError as e:
+            write_errors = {error["index"]: error for error in e.details["writeErrors"]}
+            return e.details["nUpserted"], e.details["nMatched"], e.details["nModified"], write_errors
+
+    @staticmethod
+    def bulk_delete(product_ids):
+        if not product_ids:
+            return 0
+        result = Product._get_collection().bulk_write(
+            [DeleteMany({"_id": {"$in": list(product_ids)}})], ordered=False
+        )
+        return result.deleted_count
+
+    @staticmethod
+    def get_existing_ids(product_ids):
+        return set(Product.objects(id__in=list(product_ids)).distinct("id"))
+
+    @staticmethod
+    def adjust_quantity(product_id, delta, updated_at, guarded=True):
+        """
+        Add ``delta`` to the product's quantity in one conditional update.
+        Guarded decrements only match while at least ``-delta`` units are in
+        stock. Returns the updated product, or None when nothing matched.
+        """
+        query = {"_id": product_id}
+        if guarded and delta < 0:
+            query["quantity"] = {"$gte": -delta}
+        # Issued on the raw collection: MongoEngine validates $inc values
+        # against min_value, which rejects negative deltas.
+        document = Product._get_collection().find_one_and_update(
+            query,
+            {"$inc": {"quantity": delta}, "$set": {"updated_at": updated_at}},
+            return_document=ReturnDocument.AFTER,
+        )
+        return Product._from_son(document) if document else None
+
+    @staticmethod
+    def latest_update(products):
+        """
+        The newest updated_at among ``products`` (a filtered queryset) and
+        their count, for listing validators.
+        """
+        latest = products.order_by("-updated_at").only("updated_at").as_pymongo().first()
+        return (latest["updated_at"] if latest else None), products.count()
+
+    @staticmethod
+    def aggregate_stats(products):
+        """
+        Group ``products`` (a filtered queryset, applied as the leading $match)
+        by category and brand in one aggregation and return per-group counts,
+        stock and price figures.
+        """
+        return list(products.aggregate([
+            {"$group": {
+                "_id": {"category": "$category", "brand": "$brand"},
+                "count": {"$sum": 1},
+                "total_quantity": {"$sum": "$quantity"},
+                "stock_value": {"$sum": {"$multiply": ["$price", "$quantity"]}},
+                "min_price": {"$min": "$price"},
+                "max_price": {"$max": "$price"},
+                "avg_price": {"$avg": "$price"},
+            }},
+            {"$sort": {"_id.category": 1, "_id.brand": 1}},
+        ]))
+
+    @staticmethod
+    def search(text, products, after=None, limit=20):
+        """
+        Run a $text search restricted to ``products`` (a filtered queryset)
+        and return up to ``limit`` raw documents with their relevance
+        ``score``, best first. ``after`` is the ``(score, _id)`` of the last
+        document of the previous page.
+        """
+        match = dict(products._query)
+        match["$text"] = {"$search": text}
+        pipeline = [
+            {"$match": match},
+            {"$addFields": {"score": {"$meta": "textScore"}}},
+        ]
+        if after:
+            score, last_id = after
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": score}},
+                {"score": score, "_id": {"$gt": last_id}},
+            ]}})
+        pipeline += [
+            {"$sort": {"score": -1, "_id": 1}},
+            {"$limit": limit},
+        ]
+        return list(products._collection.aggregate(pipeline))
+
+    @staticmethod
+    def iter_names_and_brands(batch_size=5000):
+        """Yield ``("name", name)`` and ``("brand", brand)`` for every product from a projected scan."""
+        products = Product.objects.only("name", "brand").no_cache().as_pymongo().batch_size(batch_size)
+        for document in products:
+            yield "name", document.get("name")
+            yield "brand", document.get("brand")
+
+    @staticmethod
+    def stream(products, fields, batch_size):
+        """
+        Iterate ``products`` as raw projected dicts from a server-side cursor
+        fetched ``batch_size`` documents at a time, without caching results
+        on the queryset.
+        """
+        return products.no_cache().only(*fields).as_pymongo().batch_size(batch_size)
@@ -0,0 +1,200 @@
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django_app import db
+from django_app.cache import TTLCache
+
+# The collections listings are versioned by.
+COLLECTIONS = ("products", "categories")
+
+
+class LocalBackend:
+    """
+    In-process LRU storage. Versions are process-local too, so writes made
+    by other processes only show up once entries expire.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.entries = TTLCache(max_size=max_size, ttl=ttl)
+        self.versions = {}
+        self.written_at = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        self.entries.set(key, value)
+
+    def get_versions(self, names):
+        return [self.versions.get(name, 0) for name in names]
+
+    def get_written_at(self, names):
+        return [self.written_at.get(name) for name in names]
+
+    def bump(self, name):
+        with self._lock:
+            self.written_at[name] = time.time()
+            self.versions[name] = self.versions.get(name, 0) + 1
+
+    def clear(self, names):
+        with self._lock:
+            self.entries.clear()
+            self.written_at.clear()
+
+
+class DjangoCacheBackend:
+    """
+    Storage in a Django cache. With a shared cache (Redis, Memcached) both
+    entries and versions are shared, so a write in one process invalidates
+    the listings cached by all of them.
+    """
+
+    def __init__(self, alias, ttl, prefix="response-cache"):
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.cache.get(f"{self.prefix}:{key}")
+
+    def set(self, key, value):
+        self.cache.set(f"{self.prefix}:{key}", value, self.ttl)
+
+    def get_versions(self, names):
+        keys = [f"{self.prefix}:version:{name}" for name in names]
+        versions = self.cache.get_many(keys)
+        return [versions.get(key, 0) for key in keys]
+
+    def get_written_at(self, names):
+        keys = [f"{self.prefix}:written:{name}" for name in names]
+        written_at = self.cache.get_many(keys)
+        return [written_at.get(key) for key in keys]
+
+    def bump(self, name):
+        # Set before the version, so whoever sees the new version sees the write time too.
+        self.cache.set(f"{self.prefix}:written:{name}", time.time(), timeout=None)
+        self._incr_version(name)
+
+    def clear(self, names):
+        """
+        Orphan every entry by bumping the versions of ``names``. The Django
+        cache may be shared with other data, so nothing else is touched.
+        """
+        self.cache.delete_many([f"{self.prefix}:written:{name}" for name in names])
+        for name in names:
+            self._incr_version(name)
+
+    def _incr_version(self, name):
+        key = f"{self.prefix}:version:{name}"
+        if not self.cache.add(key, 1, timeout=None):
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, 1, timeout=None)
+
+
+class ResponseCache:
+    """
+    Cache of rendered list responses keyed by endpoint, normalized query
+    parameters and the version counters of the collections the response
+    reads. Services bump a collection's version on every write, which
+    orphans every entry built from it; orphans age out of the backend.
+
+    A secondary may not have replicated a write yet when its version bump
+    lands, and a page read from it would be cached under the new version.
+    Misses on collections written in the last ``primary_window`` seconds are
+    therefore filled from the primary (see ``read_alias``).
+
+    ``hits`` and ``misses`` count this process's lookups only, whatever the
+    backend; the metrics endpoint sums them over workers.
+    """
+
+    def __init__(self, backend, primary_window=0):
+        self.backend = backend
+        self.primary_window = primary_window
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, namespace, collections, params):
+        versions = ".".join(str(version) for version in self.backend.get_versions(collections))
+        digest = hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()
+        return f"{namespace}:{versions}:{digest}"
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def read_alias(self, collections):
+        """The connection alias to fill a missed entry of ``collections`` from."""
+        since = time.time() - self.primary_window
+        for written_at in self.backend.get_written_at(collections):
+            if written_at is not None and written_at > since:
+                return db.DEFAULT_ALIAS
+        return db.READ_ALIAS
+
+    def invalidate(self, *collections):
+        for collection in collections:
+            self.backend.bump(collection)
+
+    def clear(self):
+        self.backend.clear(COLLECTIONS)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+
+def list_params(request, ordering, filters, fields, page_size):
+    """
+    The key parameters of a list request, normalized so that equivalent
+    query strings (reordered, repeated categories, page 1 spelled out or
+    not) share an entry. Filters are the parsed values, not the raw strings.
+    """
+    return {
+        "origin": request.build_absolute_uri("/"),
+        "ordering": ordering or None,
+        "filters": sorted(
+            (key, sorted(set(value)) if isinstance(value, list) else value)
+            for key, value in filters.items()
+        ),
+        "fields": sorted(fields) if fields else None,
+        "page": request.query_params.get("page") or "1",
+        "page_size": page_size,
+        "cursor": request.query_params.get("cursor"),
+    }
+
+
+def build_response_cache(config=None):
+    config = config if config is not None else getattr(settings, "RESPONSE_CACHE", {})
+    ttl = config.get("TTL", 60)
+    if config.get("BACKEND", "local") == "django":
+        backend = DjangoCacheBackend(config.get("CACHE_ALIAS", "default"), ttl)
+    else:
+        backend = LocalBackend(config.get("MAX_SIZE", 1024), ttl)
+    return ResponseCache(backend, config.get("PRIMARY_WINDOW", 10))
+
+
+response_cache = build_response_cache()
+
@@ -1,7 +1,8 @@
 from rest_framework import serializers
-from django_app.models.category import Category
+from django_app.serializers.sparse_fields import SparseFieldsMixin
+from django_app.serializers.raw_serializer import RawSerializer
 
-class CategorySerializer(serializers.Serializer):
+class CategorySerializer(SparseFieldsMixin, serializers.Serializer):
 
     id = serializers.CharField(read_only=True)
     title = serializers.CharField(
@@ -36,13 +37,6 @@ class CategorySerializer(serializers.Serializer):
 
         errors = {}
 
-        title = data.get("title")
-        category_id = self.instance['id'] if self.instance else None
-        if title and not errors.get("title"):
-            existing_product = Category.objects(title=title).first()
-            if existing_product and str(existing_product.id)!=str(category_id):
-                errors["title"] = [f"A category with title '{title}' already exists."]
-
         try:
             validated_data = super().to_internal_value(data)
         except serializers.ValidationError as e:
@@ -56,4 +50,10 @@ class CategorySerializer(serializers.Serializer):
 
         if errors:
             raise serializers.ValidationError(errors)
-        return validated_data
\ No newline at end of file
+        return validated_data
+
+
+class CategoryRawSerializer(RawSerializer):
+    """CategorySerializer output for ``as_pymongo()`` documents."""
+
+    serializer_class = CategorySerializer
@@ -1,10 +1,45 @@
 from rest_framework import serializers
-from django_app.models.product import Product
-from django_app.models.category import Category
+from django_app.repositories.category_repository import CategoryRepository
+from django_app.serializers.sparse_fields import SparseFieldsMixin
+from django_app.serializers.raw_serializer import RawSerializer
 from bson import ObjectId
 
 
-class ProductSerializer(serializers.Serializer):
+class CategoryTitleField(serializers.CharField):
+    """
+    Reads the raw category reference instead of dereferencing it, and renders
+    the title from the titles the parent serializer has already resolved.
+    """
+
+    def get_attribute(self, instance):
+        reference = instance._data.get("category")
+        return getattr(reference, "id", reference)
+
+    def to_representation(self, value):
+        titles = self.parent.category_titles
+        if value not in titles:
+            titles.update(CategoryRepository.get_titles_by_ids([value]))
+        return titles.get(value)
+
+
+class ProductListSerializer(serializers.ListSerializer):
+    """
+    Resolves the categories of every product with a single $in query
+    before rendering them, instead of one query per product.
+    """
+
+    def to_representation(self, data):
+        products = list(data)
+        category_field = self.child.fields.get("category")
+        if category_field is not None:
+            category_ids = [category_field.get_attribute(product) for product in products]
+            self.child.category_titles = CategoryRepository.get_titles_by_ids(
+                category_id for category_id in category_ids if category_id is not None
+            )
+        return [self.child.to_representation(product) for product in products]
+
+
+class ProductSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.CharField(read_only=True)
     name = serializers.CharField(
         required = True,
@@ -17,7 +52,7 @@ class ProductSerializer(serializers.Serializer):
         }
     )
 
-    category = serializers.CharField(
+    category = CategoryTitleField(
         required = True, 
         allow_blank = False,
         error_messages={
@@ -68,27 +103,32 @@ class ProductSerializer(serializers.Serializer):
         format="%Y-%m-%d %H:%M:%S"
     )
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        category_obj = Category.objects(id=instance.category.id).first()
-        data["category"] = category_obj.title
-        return data
-    
+    class Meta:
+        list_serializer_class = ProductListSerializer
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.category_titles = {}
+
+    def resolve_category(self, title):
+        # Callers validating many items pass the categories they already
+        # fetched as context["categories"] (title -> Category); titles missing
+        # from it are unknown and are not looked up again.
+        categories = self.context.get("categories")
+        if categories is not None:
+            return categories.get(title)
+        return CategoryRepository.get_by_title(title)
+
     def to_internal_value(self, data):
 
         errors = {}
 
-        name = data.get("name")
-        product_id = self.instance['id'] if self.instance else None
-        if name and not errors.get("name"):
-            existing_product = Product.objects(name=name).first()
-            if existing_product and str(existing_product.id)!=str(product_id):
-                errors["name"] = ["A product with this name already exists."]
-
         category_title = data.get("category")
-        category_obj = Category.objects(title=category_title).first()
-        if not category_obj:
-            errors["category"] = [f"Category '{category_title}' does not exist."]
+        category_obj = None
+        if category_title is not None or not self.partial:
+            category_obj = self.resolve_category(category_title) if category_title else None
+            if not category_obj:
+                errors["category"] = [f"Category '{category_title}' does not exist."]
 
         try:
             validated_data = super().to_internal_value(data)
@@ -103,5 +143,40 @@ class ProductSerializer(serializers.Serializer):
 
         if errors:
             raise serializers.ValidationError(errors)
-        validated_data["category"] = ObjectId(category_obj.id)
-        return validated_data
\ No newline at end of file
+        if category_obj:
+            validated_data["category"] = ObjectId(category_obj.id)
+        return validated_data
+
+
+class ProductRawSerializer(RawSerializer):
+    """
+    ProductSerializer output for ``as_pymongo()`` documents. Category titles
+    are resolved once per call to many(), unless the caller passes them in
+    ``category_titles`` (the async views, which load them themselves).
+    """
+
+    serializer_class = ProductSerializer
+
+    def __init__(self, fields=None, category_titles=None):
+        self.category_titles = category_titles or {}
+        self.loads_categories = category_titles is None
+        super().__init__(fields=fields)
+        self.resolves_categories = any(name == "category" for name, _, _ in self.converters)
+
+    def converter(self, field):
+        if isinstance(field, CategoryTitleField):
+            return self.category_title
+        return super().converter(field)
+
+    def category_title(self, category_id):
+        if self.loads_categories and category_id not in self.category_titles:
+            self.category_titles.update(CategoryRepository.get_titles_by_ids([category_id]))
+        return self.category_titles.get(category_id)
+
+    def many(self, documents):
+        documents = list(documents)
+        if self.resolves_categories and self.loads_categories:
+            self.category_titles = CategoryRepository.get_titles_by_ids(
+                document["category"] for document in documents if document.get("category") is not None
+            )
+        return super().many(documents)
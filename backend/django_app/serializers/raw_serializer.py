@@ -0,0 +1,62 @@
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.settings import api_settings
+from django.utils import timezone
+
+
+class RawSerializer:
+    """
+    Read-only counterpart of a DRF serializer for ``as_pymongo()`` documents.
+
+    The declared fields of ``serializer_class`` are compiled once into plain
+    per-field converters, so rendering a page is a dict comprehension rather
+    than a walk through DRF's field machinery on hydrated Documents. The
+    output is the same, value for value and in the same key order, as
+    ``serializer_class(documents, many=True).data``.
+    """
+
+    serializer_class = None
+
+    def __init__(self, fields=None):
+        self.converters = self.compile(self.serializer_class(fields=fields).fields)
+
+    def compile(self, fields):
+        return [
+            (name, "_id" if field.source == "id" else field.source, self.converter(field))
+            for name, field in fields.items()
+            if not field.write_only
+        ]
+
+    def converter(self, field):
+        if isinstance(field, serializers.CharField):
+            return str
+        if isinstance(field, serializers.IntegerField):
+            return int
+        if isinstance(field, serializers.FloatField):
+            return float
+        if isinstance(field, serializers.DateTimeField):
+            return self.datetime_converter(field)
+        return field.to_representation
+
+    @staticmethod
+    def datetime_converter(field):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() == ISO_8601 or field.default_timezone() is not None:
+            return field.to_representation
+
+        # Without a default timezone DRF formats naive values as they are.
+        def convert(value):
+            if timezone.is_aware(value):
+                return field.to_representation(value)
+            return value.strftime(output_format)
+        return convert
+
+    def to_representation(self, document):
+        result = {}
+        for name, key, convert in self.converters:
+            value = document.get(key)
+            result[name] = None if value is None else convert(value)
+        return result
+
+    def many(self, documents):
+        return [self.to_representation(document) for document in documents]
@@ -0,0 +1,45 @@
+from rest_framework import serializers
+
+
+class SparseFieldsMixin:
+    """
+    Lets a serializer render a subset of its fields, e.g. from ``?fields=``:
+    ``ProductSerializer(products, many=True, fields=["id", "name"])``.
+    """
+
+    fields_query_param = "fields"
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request):
+        """
+        Parse the comma separated ``?fields=`` value. Returns None when it is
+        absent, or raises ValidationError when it names unknown fields.
+        """
+        value = request.query_params.get(cls.fields_query_param)
+        if value is None:
+            return None
+        fields = [name.strip() for name in value.split(",") if name.strip()]
+        known = cls().fields
+        unknown = [name for name in fields if name not in known]
+        if not fields or unknown:
+            raise serializers.ValidationError({
+                cls.fields_query_param: [f"Unknown fields: {', '.join(unknown)}." if unknown else "No fields given."]
+            })
+        return fields
+
+    @staticmethod
+    def projection(fields, ordering=None):
+        """
+        Document fields to load for ``fields``; the ordering field is kept
+        so cursors can still be built from the loaded documents.
+        """
+        projection = set(fields)
+        if ordering:
+            projection.add(ordering.lstrip("-"))
+        return sorted(projection)
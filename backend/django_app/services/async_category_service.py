@@ -0,0 +1,43 @@
+from django_app import db
+from django_app.models.category import Category
+from django_app.pagination import KeysetPagination
+from django_app.repositories.async_category_repository import AsyncCategoryRepository
+from django_app.serializers.category_serializer import CategoryRawSerializer
+from django_app.services.category_service import CategoryService
+
+
+class AsyncCategoryService:
+    """CategoryService's read paths for the async views."""
+
+    @staticmethod
+    def filter_query(filters=None):
+        return CategoryService.filter_conditions(filters or {}).to_query(Category)
+
+    @staticmethod
+    async def list_categories(query, ordering=None, fields=None, skip=0, limit=0, using=db.READ_ALIAS):
+        return await AsyncCategoryRepository.find(
+            query, fields=fields, ordering=[ordering], skip=skip, limit=limit, using=using
+        )
+
+    @staticmethod
+    async def list_categories_after(query, fields, field, descending, cursor, limit, using=db.READ_ALIAS):
+        """A keyset page: categories sorted on ``(field, _id)`` after ``cursor``."""
+        conditions = KeysetPagination.keyset_conditions(field, descending, cursor)
+        if conditions:
+            query = {"$and": [query, conditions.to_query(Category)]}
+        sign = "-" if descending else ""
+        return await AsyncCategoryRepository.find(
+            query, fields=fields, ordering=[f"{sign}{field}", f"{sign}id"], limit=limit, using=using
+        )
+
+    @staticmethod
+    async def get_category_document(pk):
+        return await AsyncCategoryRepository.get_by_id(pk)
+
+    @staticmethod
+    async def get_listing_version(query, using=db.READ_ALIAS):
+        return await AsyncCategoryRepository.latest_update(query, using=using)
+
+    @staticmethod
+    def to_representation(documents, fields=None):
+        return CategoryRawSerializer(fields=fields).many(documents)
@@ -0,0 +1,78 @@
+import asyncio
+from django_app import db
+from django_app.models.product import Product
+from django_app.pagination import KeysetPagination
+from django_app.repositories.async_category_repository import AsyncCategoryRepository
+from django_app.repositories.async_product_repository import AsyncProductRepository
+from django_app.serializers.product_serializer import ProductRawSerializer
+from django_app.services.product_service import ProductService
+
+
+class AsyncProductService:
+    """
+    ProductService's read paths for the async views. Filters and keyset
+    conditions come from the same Q objects as the MongoEngine path,
+    compiled to raw queries, so both paths serve the same pages. Listings
+    read from the read alias, like the sync ones.
+    """
+
+    @staticmethod
+    async def filter_query(filters=None):
+        filters = filters or {}
+        category_ids = None
+        if 'categories' in filters:
+            category_ids = await AsyncCategoryRepository.get_ids_by_titles(filters['categories'])
+        return ProductService.filter_conditions(filters, category_ids).to_query(Product)
+
+    @staticmethod
+    async def list_products(query, ordering=None, fields=None, skip=0, limit=0, using=db.READ_ALIAS):
+        return await AsyncProductRepository.find(
+            query, fields=fields, ordering=[ordering], skip=skip, limit=limit, using=using
+        )
+
+    @staticmethod
+    async def list_products_after(query, fields, field, descending, cursor, limit, using=db.READ_ALIAS):
+        """A keyset page: products sorted on ``(field, _id)`` after ``cursor``."""
+        conditions = KeysetPagination.keyset_conditions(field, descending, cursor)
+        if conditions:
+            query = {"$and": [query, conditions.to_query(Product)]}
+        sign = "-" if descending else ""
+        return await AsyncProductRepository.find(
+            query, fields=fields, ordering=[f"{sign}{field}", f"{sign}id"], limit=limit, using=using
+        )
+
+    @staticmethod
+    async def get_product_document(pk, fields=None):
+        """The raw product with at least ``fields`` and its updated_at, or None."""
+        if fields:
+            fields = sorted(set(fields) | {"updated_at"})
+        return await AsyncProductRepository.get_by_id(pk, fields=fields)
+
+    @staticmethod
+    async def get_listing_version(query, using=db.READ_ALIAS):
+        """ProductService.get_listing_version for a compiled filter query."""
+        (updated_at, count), category_updated_at = await asyncio.gather(
+            AsyncProductRepository.latest_update(query, using=using),
+            AsyncCategoryRepository.latest_updated_at(using=using),
+        )
+        return updated_at, count, category_updated_at
+
+    @staticmethod
+    async def get_category(category_id):
+        """The title and updated_at of a product's category, or None."""
+        if not category_id:
+            return None
+        return await AsyncCategoryRepository.get_by_id(category_id, fields=["title", "updated_at"])
+
+    @staticmethod
+    async def to_representation(documents, fields=None, category_titles=None):
+        """
+        ProductSerializer output for raw products. Category titles not given
+        in ``category_titles`` are loaded in one query.
+        """
+        serializer = ProductRawSerializer(fields=fields, category_titles=category_titles or {})
+        if serializer.resolves_categories and category_titles is None:
+            serializer.category_titles = await AsyncCategoryRepository.get_titles_by_ids(
+                document["category"] for document in documents if document.get("category") is not None
+            )
+        return serializer.many(documents)
@@ -1,49 +1,102 @@
 from django_app.repositories.category_repository import CategoryRepository
 from django_app.serializers.category_serializer import CategorySerializer
+from django_app.services.product_service import ProductService
+from django_app.conditional import PreconditionFailedError
+from django_app.response_cache import response_cache
 from django.utils import timezone
+from mongoengine.errors import NotUniqueError
+from mongoengine.queryset.visitor import Q
+from rest_framework.exceptions import ValidationError
 
 class CategoryService:
 
     @staticmethod
     def create_category(category_data):
-        category = CategoryRepository.create(category_data)
+        try:
+            category = CategoryRepository.create(category_data)
+        except NotUniqueError:
+            raise CategoryService._duplicate_title_error(category_data)
+        response_cache.invalidate("categories")
         return CategorySerializer(category).data
             
     @staticmethod
     def get_all_categories(ordering=None, filters=None):
-        categories = CategoryRepository.get_all()
+        categories = CategoryService.filter_categories(ordering=ordering, filters=filters)
+        return CategorySerializer(categories, many=True).data
+
+    @staticmethod
+    def filter_categories(ordering=None, filters=None, fields=None, using=None):
+        categories = CategoryRepository.get_all(using)
+        if fields:
+            categories = categories.only(*fields)
         if filters:
-            if 'created_after' in filters:
-                categories = categories.filter(created_at__gte=filters['created_after'])
-            if 'created_before' in filters:
-                categories = categories.filter(created_at__lte=filters['created_before'])
-            if 'updated_after' in filters:
-                categories = categories.filter(updated_at__gte=filters['updated_after'])
-            if 'updated_before' in filters:
-                categories = categories.filter(updated_at__lte=filters['updated_before'])
+            categories = categories.filter(CategoryService.filter_conditions(filters))
         if ordering:
             categories = categories.order_by(ordering)
-        return CategorySerializer(categories, many=True).data
+        return categories
+
+    @staticmethod
+    def filter_conditions(filters):
+        conditions = Q()
+        if 'created_after' in filters:
+            conditions &= Q(created_at__gte=filters['created_after'])
+        if 'created_before' in filters:
+            conditions &= Q(created_at__lte=filters['created_before'])
+        if 'updated_after' in filters:
+            conditions &= Q(updated_at__gte=filters['updated_after'])
+        if 'updated_before' in filters:
+            conditions &= Q(updated_at__lte=filters['updated_before'])
+        return conditions
     
     @staticmethod 
-    def get_category_by_id(pk):
+    def get_category_by_id(pk, fields=None):
+        # Served from the category cache, so only the rendering is trimmed.
         category = CategoryRepository.get_by_id(pk)
         if not category:
             return None
-        return CategorySerializer(category).data
+        return CategorySerializer(category, fields=fields).data
     
     @staticmethod
-    def update_category(category_data, pk):
-        category = CategoryRepository.get_by_id(pk)
-        if not category:
-            return None
+    def get_category_document(pk):
+        return CategoryRepository.get_by_id(pk)
+
+    @staticmethod
+    def to_representation(category, fields=None):
+        return CategorySerializer(category, fields=fields).data
+
+    @staticmethod
+    def get_listing_version(filters=None, using=None):
+        """The newest updated_at and the count of the filtered categories."""
+        return CategoryRepository.latest_update(CategoryService.filter_categories(filters=filters, using=using))
+
+    @staticmethod
+    def update_category(category_data, pk, expected_versions=None):
         category_data["updated_at"] = timezone.now()
-        updated_category = CategoryRepository.update(category, category_data)
+        try:
+            updated_category = CategoryRepository.update(pk, category_data, expected_updated_at=expected_versions)
+        except NotUniqueError:
+            raise CategoryService._duplicate_title_error(category_data)
+        if not updated_category:
+            if expected_versions is not None and CategoryRepository.get_by_id(pk):
+                raise PreconditionFailedError(f"Category {pk} was modified since it was read.")
+            return None
+        response_cache.invalidate("categories")
         return CategorySerializer(updated_category).data
     
     @staticmethod
     def delete_category(category_id):
         CategoryRepository.delete(category_id)
+        # Deleting a category cascades to its products.
+        response_cache.invalidate("categories", "products")
+        ProductService.invalidate_suggestions()
+
+    @staticmethod
+    def seed_categories(categories_data):
+        """Create the given categories unless a category with that title exists. Returns how many were created."""
+        created = CategoryRepository.insert_missing(categories_data, timezone.now())
+        if created:
+            response_cache.invalidate("categories")
+        return created
 
     @staticmethod
     def get_category_by_title(category_title):
@@ -51,3 +104,8 @@ class CategoryService:
         if not category:
             return None
         return CategorySerializer(category).data
+
+    @staticmethod
+    def _duplicate_title_error(category_data):
+        title = category_data.get("title")
+        return ValidationError({"title": [f"A category with title '{title}' already exists."]})
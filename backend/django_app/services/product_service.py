@@ -1,69 +1,616 @@
+import csv
+import json
+import time
 from django_app.repositories.product_repository import ProductRepository
-from django_app.serializers.product_serializer import ProductSerializer
-from django_app.models.category import Category
+from django_app.serializers.product_serializer import ProductSerializer, ProductRawSerializer
+from django_app.repositories.category_repository import CategoryRepository
+from django_app.cache import TTLCache
+from django_app.prefix_index import PrefixIndex
+from django_app.conditional import PreconditionFailedError
+from django_app.response_cache import response_cache
+from django_app import db
+from bson import ObjectId
+from django.conf import settings
 from django.utils import timezone
+from mongoengine.errors import NotUniqueError
+from mongoengine.queryset.visitor import Q
+from rest_framework.exceptions import ValidationError
+
+
+class ProductNotFoundError(Exception):
+
+    def __init__(self, product_id):
+        super().__init__(f"No product found with ID {product_id}.")
+        self.product_id = product_id
+
+
+class InsufficientStockError(Exception):
+
+    def __init__(self, product_id, available, requested):
+        super().__init__(
+            f"Only {available} units of product {product_id} in stock, {requested} requested."
+        )
+        self.product_id = product_id
+        self.available = available
+        self.requested = requested
 
 
 class ProductService:
 
+    # Catalogue statistics keyed by category and filters; they only follow
+    # writes once an entry expires.
+    _stats_cache = TTLCache(
+        max_size=getattr(settings, "PRODUCT_STATS_CACHE_MAX_SIZE", 256),
+        ttl=getattr(settings, "PRODUCT_STATS_CACHE_TTL", 60),
+    )
+
+    # Autocomplete over product names and brands. Single-product writes
+    # update it in place; bulk writes drop it so the next lookup rebuilds it.
+    _suggest_index = PrefixIndex(
+        loader=ProductRepository.iter_names_and_brands,
+        ttl=getattr(settings, "PRODUCT_SUGGEST_TTL", 300),
+    )
+
     @staticmethod
     def create_product(data):
-       product = ProductRepository.create(data)
-       return ProductSerializer(product).data
+        try:
+            product = ProductRepository.create(data)
+        except NotUniqueError:
+            raise ProductService._duplicate_name_error()
+        response_cache.invalidate("products")
+        ProductService._index_suggestions(product, add=True)
+        return ProductSerializer(product).data
     
     @staticmethod
     def get_all_products(ordering=None, filters=None):
-        products = ProductRepository.get_all()
+        products = ProductService.filter_products(ordering=ordering, filters=filters)
+        return ProductSerializer(products, many=True).data
+
+    @staticmethod
+    def filter_products(ordering=None, filters=None, fields=None, using=None):
+        products = ProductRepository.get_all(using)
+        if fields:
+            products = products.only(*fields)
         if filters:
-            if 'created_after' in filters:
-                products = products.filter(created_at__gte=filters['created_after'])
-            if 'created_before' in filters:
-                products = products.filter(created_at__lte=filters['created_before'])
-            if 'updated_after' in filters:
-                products = products.filter(updated_at__gte=filters['updated_after'])
-            if 'updated_before' in filters:
-                products = products.filter(updated_at__lte=filters['updated_before'])
-            if 'price_min' in filters:
-                products = products.filter(price__gte=filters['price_min'])
-            if 'price_max' in filters:
-                products = products.filter(price__lte=filters['price_max'])
+            category_ids = None
             if 'categories' in filters:
-                category_titles = filters['categories']
-                matching_categories = Category.objects(title__in=category_titles)
-                category_ids = [cat.id for cat in matching_categories]
-                products = products.filter(category__in=category_ids)
+                category_ids = CategoryRepository.get_ids_by_titles(filters['categories'])
+            products = products.filter(ProductService.filter_conditions(filters, category_ids))
         if ordering:
             products = products.order_by(ordering)
-        return ProductSerializer(products, many=True).data
+        return products
+
+    @staticmethod
+    def filter_conditions(filters, category_ids=None):
+        """
+        The listing filters as a Q object; ``category_ids`` are the ids of
+        the ``categories`` titles, which the caller resolves.
+        """
+        conditions = Q()
+        if 'created_after' in filters:
+            conditions &= Q(created_at__gte=filters['created_after'])
+        if 'created_before' in filters:
+            conditions &= Q(created_at__lte=filters['created_before'])
+        if 'updated_after' in filters:
+            conditions &= Q(updated_at__gte=filters['updated_after'])
+        if 'updated_before' in filters:
+            conditions &= Q(updated_at__lte=filters['updated_before'])
+        if 'price_min' in filters:
+            conditions &= Q(price__gte=filters['price_min'])
+        if 'price_max' in filters:
+            conditions &= Q(price__lte=filters['price_max'])
+        if category_ids is not None:
+            conditions &= Q(category__in=category_ids)
+        return conditions
     
     @staticmethod
-    def get_product_by_id(pk):
-        product = ProductRepository.get_by_id(pk)
+    def get_product_by_id(pk, fields=None):
+        product = ProductRepository.get_by_id(pk, fields=fields)
         if not product:
             return None
-        return ProductSerializer(product).data
-    
+        return ProductSerializer(product, fields=fields).data
+
     @staticmethod
-    def update_product(product_data, pk):
-        product = ProductRepository.get_by_id(pk)
-        if not product:
+    def get_product_document(pk, fields=None):
+        """The product with at least ``fields`` and its updated_at loaded, or None."""
+        if fields:
+            fields = sorted(set(fields) | {"updated_at"})
+        return ProductRepository.get_by_id(pk, fields=fields)
+
+    @staticmethod
+    def to_representation(product, fields=None, category_titles=None):
+        serializer = ProductSerializer(product, fields=fields)
+        serializer.category_titles = category_titles or {}
+        return serializer.data
+
+    @staticmethod
+    def get_listing_version(filters=None, using=None):
+        """
+        The newest updated_at and the count of the filtered products, plus
+        the newest category updated_at since listings render category titles.
+        """
+        updated_at, count = ProductRepository.latest_update(
+            ProductService.filter_products(filters=filters, using=using)
+        )
+        category_updated_at = CategoryRepository.latest_updated_at(using=using)
+        return updated_at, count, category_updated_at
+
+    @staticmethod
+    def get_category(category_id):
+        """
+        The title and updated_at of a product's category, or None. Read from
+        the primary rather than the category cache, since they go into the
+        product's ETag.
+        """
+        if not category_id:
             return None
+        return CategoryRepository.get_current(category_id)
+    
+    @staticmethod
+    def update_product(product_data, pk, expected_versions=None):
+        """
+        Update the product and return its representation, or None if it does
+        not exist. With ``expected_versions`` (If-Match), raise
+        PreconditionFailedError when the stored updated_at is none of them.
+        """
         product_data["updated_at"] = timezone.now()
-        updated_product = ProductRepository.update(product, product_data)
+        try:
+            previous, updated_product = ProductRepository.update(
+                pk, product_data, expected_updated_at=expected_versions
+            )
+        except NotUniqueError:
+            raise ProductService._duplicate_name_error()
+        if not updated_product:
+            if expected_versions is not None and ProductRepository.get_by_id(pk, fields=["id"]):
+                raise PreconditionFailedError(f"Product {pk} was modified since it was read.")
+            return None
+        response_cache.invalidate("products")
+        if (previous.name, previous.brand) != (updated_product.name, updated_product.brand):
+            ProductService._index_suggestions(previous, add=False)
+            ProductService._index_suggestions(updated_product, add=True)
         return ProductSerializer(updated_product).data
     
     @staticmethod
     def delete_product(product_id):
-        ProductRepository.delete(product_id)
+        product = ProductRepository.delete(product_id)
+        response_cache.invalidate("products")
+        ProductService._index_suggestions(product, add=False)
+
+    @staticmethod
+    def suggest(prefix, limit=10):
+        """Names and brands starting with ``prefix`` (case-insensitive), served from memory."""
+        return [
+            {"text": text, "type": kind}
+            for text, kind in ProductService._suggest_index.suggest(prefix, limit)
+        ]
+
+    @staticmethod
+    def invalidate_suggestions():
+        ProductService._suggest_index.invalidate()
+
+    @staticmethod
+    def clear_suggestions():
+        ProductService._suggest_index.clear()
+
+    @staticmethod
+    def _index_suggestions(product, add):
+        update = ProductService._suggest_index.add if add else ProductService._suggest_index.remove
+        update("name", product.name)
+        update("brand", product.brand)
 
     @staticmethod
     def get_products_by_category(category_id):
         products = ProductRepository.get_by_category(category_id)
         return ProductSerializer(products, many=True).data
+
+    @staticmethod
+    def filter_products_by_category(category_id, using=None):
+        return ProductRepository.get_by_category(category_id, using=using)
     
     @staticmethod
     def get_product_by_name(product_name):
         product = ProductRepository.get_by_name(product_name)
         if not product:
             return None
-        return ProductSerializer(product).data
\ No newline at end of file
+        return ProductSerializer(product).data
+
+    @staticmethod
+    def bulk_create_products(items, chunk_size=None):
+        """
+        Validate and insert a list of products. Categories and existing names
+        are looked up once for the whole list rather than per item. Returns a
+        result per item, in input order.
+        """
+        chunk_size = chunk_size or settings.PRODUCT_BULK_CHUNK_SIZE
+        objects = [item for item in items if isinstance(item, dict)]
+        categories = CategoryRepository.get_by_titles(
+            item["category"] for item in objects if isinstance(item.get("category"), str)
+        )
+        existing_names = ProductRepository.get_existing_names(
+            item["name"] for item in objects if isinstance(item.get("name"), str)
+        )
+
+        results = [None] * len(items)
+        valid_indexes = []
+        valid_data = []
+        seen_names = set()
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = ProductService._bulk_error(
+                    index, {"non_field_errors": ["Expected a product object."]}
+                )
+                continue
+            serializer = ProductSerializer(data=item, context={"categories": categories})
+            if not serializer.is_valid():
+                results[index] = ProductService._bulk_error(index, serializer.errors)
+                continue
+            name = serializer.validated_data["name"]
+            if name in existing_names or name in seen_names:
+                results[index] = ProductService._bulk_error(
+                    index, ProductService._duplicate_name_error().detail
+                )
+                continue
+            seen_names.add(name)
+            valid_indexes.append(index)
+            valid_data.append(serializer.validated_data)
+
+        inserted_ids, write_errors = ProductRepository.bulk_insert(valid_data, chunk_size)
+        if inserted_ids:
+            response_cache.invalidate("products")
+            ProductService.invalidate_suggestions()
+        for position, index in enumerate(valid_indexes):
+            if position in inserted_ids:
+                results[index] = {"index": index, "status": "created", "id": str(inserted_ids[position])}
+            elif write_errors[position].get("code") == 11000:
+                results[index] = ProductService._bulk_error(
+                    index, ProductService._duplicate_name_error().detail
+                )
+            else:
+                results[index] = ProductService._bulk_error(
+                    index, {"non_field_errors": [write_errors[position].get("errmsg")]}
+                )
+        return results
+
+    @staticmethod
+    def bulk_update_products(items):
+        """
+        Partially update many products, each item being an object with an
+        ``id`` and the fields to change. Returns the matched and modified
+        counts and a list of per-id failures.
+        """
+        objects = [item for item in items if isinstance(item, dict)]
+        categories = CategoryRepository.get_by_titles(
+            item["category"] for item in objects if isinstance(item.get("category"), str)
+        )
+
+        failures = []
+        updates = []
+        seen_ids = set()
+        seen_names = set()
+        now = timezone.now()
+        for item in items:
+            if not isinstance(item, dict):
+                failures.append({"id": None, "errors": {"non_field_errors": ["Expected an object."]}})
+                continue
+            fields = dict(item)
+            product_id = fields.pop("id", None)
+            if not isinstance(product_id, str) or not ObjectId.is_valid(product_id):
+                failures.append({"id": product_id, "errors": {"id": ["Product ID must be a 24-character hex string."]}})
+                continue
+            if product_id in seen_ids:
+                failures.append({"id": product_id, "errors": {"id": ["Product ID is repeated in this request."]}})
+                continue
+            if not fields:
+                failures.append({"id": product_id, "errors": {"non_field_errors": ["No fields to update."]}})
+                continue
+            serializer = ProductSerializer(data=fields, partial=True, context={"categories": categories})
+            if not serializer.is_valid():
+                failures.append({"id": product_id, "errors": serializer.errors})
+                continue
+            name = serializer.validated_data.get("name")
+            if name is not None and name in seen_names:
+                failures.append({"id": product_id, "errors": ProductService._duplicate_name_error().detail})
+                continue
+            seen_ids.add(product_id)
+            if name is not None:
+                seen_names.add(name)
+            updates.append((ObjectId(product_id), {**serializer.validated_data, "updated_at": now}))
+
+        matched, modified, write_errors = ProductRepository.bulk_update(updates)
+        if modified:
+            response_cache.invalidate("products")
+        if any("name" in fields or "brand" in fields for _, fields in updates):
+            ProductService.invalidate_suggestions()
+        for position, error in write_errors.items():
+            product_id = str(updates[position][0])
+            if error.get("code") == 11000:
+                errors = ProductService._duplicate_name_error().detail
+            else:
+                errors = {"non_field_errors": [error.get("errmsg")]}
+            failures.append({"id": product_id, "errors": errors})
+        if matched + len(write_errors) < len(updates):
+            existing_ids = ProductRepository.get_existing_ids(product_id for product_id, _ in updates)
+            for product_id, _ in updates:
+                if product_id not in existing_ids:
+                    failures.append({"id": str(product_id), "errors": {"id": ["Product not found."]}})
+        return {"matched": matched, "modified": modified, "failures": failures}
+
+    @staticmethod
+    def bulk_delete_products(product_ids):
+        failures = []
+        valid_ids = set()
+        for product_id in product_ids:
+            if not isinstance(product_id, str) or not ObjectId.is_valid(product_id):
+                failures.append({"id": product_id, "errors": {"id": ["Product ID must be a 24-character hex string."]}})
+                continue
+            valid_ids.add(ObjectId(product_id))
+        existing_ids = ProductRepository.get_existing_ids(valid_ids) if valid_ids else set()
+        for product_id in valid_ids - existing_ids:
+            failures.append({"id": str(product_id), "errors": {"id": ["Product not found."]}})
+        deleted = ProductRepository.bulk_delete(existing_ids)
+        if deleted:
+            response_cache.invalidate("products")
+            ProductService.invalidate_suggestions()
+        return {"requested": len(valid_ids), "deleted": deleted, "failures": failures}
+
+    @staticmethod
+    def adjust_stock(pk, delta):
+        """
+        Atomically change a product's quantity by ``delta`` and return the new
+        quantity, or None if the product does not exist. Raises
+        InsufficientStockError when a decrement exceeds the stock.
+        """
+        product = ProductRepository.adjust_quantity(pk, delta, timezone.now())
+        if product:
+            response_cache.invalidate("products")
+            return product.quantity
+        current = ProductRepository.get_by_id(pk)
+        if not current:
+            return None
+        raise InsufficientStockError(pk, current.quantity, -delta)
+
+    @staticmethod
+    def adjust_stock_batch(adjustments):
+        """
+        Apply ``(pk, delta)`` adjustments as a unit, e.g. the lines of one
+        order. Each line is a conditional update; if one fails, the lines
+        already applied are reverted and the error is raised. Returns the new
+        quantity per product id.
+
+        Reverts are unguarded: undoing an increment must succeed even if
+        concurrent orders have since taken the stock below it.
+        """
+        deltas = {}
+        for pk, delta in adjustments:
+            deltas[pk] = deltas.get(pk, 0) + delta
+        quantities = {}
+        applied = []
+        now = timezone.now()
+        for pk, delta in deltas.items():
+            product = ProductRepository.adjust_quantity(pk, delta, now) if delta else ProductRepository.get_by_id(pk)
+            if product:
+                quantities[pk] = product.quantity
+                applied.append((pk, delta))
+                continue
+            for applied_pk, applied_delta in applied:
+                if applied_delta:
+                    ProductRepository.adjust_quantity(applied_pk, -applied_delta, now, guarded=False)
+            if applied:
+                # The reverts leave the quantities as they were, but not updated_at.
+                response_cache.invalidate("products")
+            current = ProductRepository.get_by_id(pk)
+            if not current:
+                raise ProductNotFoundError(pk)
+            raise InsufficientStockError(pk, current.quantity, -delta)
+        response_cache.invalidate("products")
+        return quantities
+
+    @staticmethod
+    def search_products(text, filters=None, after=None, limit=20):
+        """
+        Relevance-ranked raw product documents matching ``text`` through the
+        weighted text index, narrowed by the listing ``filters``. Served by
+        the read alias.
+        """
+        products = ProductService.filter_products(filters=filters, using=db.READ_ALIAS)
+        return ProductRepository.search(text, products, after=after, limit=limit)
+
+    @staticmethod
+    def get_stats(filters=None, category_id=None):
+        """
+        Count, stock and price statistics per category and brand, plus totals
+        over all groups, for the products matching ``filters`` (and
+        ``category_id`` when given). Computed by one aggregation on the read
+        alias and cached for PRODUCT_STATS_CACHE_TTL seconds.
+        """
+        filters = filters or {}
+        key = (category_id, tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in filters.items()
+        )))
+        stats = ProductService._stats_cache.get(key)
+        if stats is None:
+            products = ProductService.filter_products(filters=filters, using=db.READ_ALIAS)
+            if category_id is not None:
+                products = products.filter(category=category_id)
+            stats = ProductService._build_stats(ProductRepository.aggregate_stats(products))
+            ProductService._stats_cache.set(key, stats)
+        return stats
+
+    @staticmethod
+    def _build_stats(groups):
+        titles = CategoryRepository.get_titles_by_ids(
+            group["_id"]["category"] for group in groups if group["_id"].get("category")
+        )
+        rows = [
+            {
+                "category": titles.get(group["_id"].get("category")),
+                "brand": group["_id"].get("brand"),
+                "count": group["count"],
+                "total_quantity": group["total_quantity"],
+                "stock_value": round(group["stock_value"], 2),
+                "min_price": group["min_price"],
+                "max_price": group["max_price"],
+                "avg_price": round(group["avg_price"], 2),
+            }
+            for group in groups
+        ]
+        count = sum(group["count"] for group in groups)
+        totals = {
+            "count": count,
+            "total_quantity": sum(group["total_quantity"] for group in groups),
+            "stock_value": round(sum(group["stock_value"] for group in groups), 2),
+            "min_price": min((group["min_price"] for group in groups), default=None),
+            "max_price": max((group["max_price"] for group in groups), default=None),
+            "avg_price": round(sum(group["avg_price"] * group["count"] for group in groups) / count, 2)
+            if count else None,
+        }
+        return {"totals": totals, "groups": rows}
+
+    @staticmethod
+    def clear_stats_cache():
+        ProductService._stats_cache.clear()
+
+    @staticmethod
+    def stats_cache_stats():
+        return ProductService._stats_cache.stats()
+
+    EXPORT_FIELDS = (
+        "id", "name", "category", "description", "price", "brand", "quantity", "created_at", "updated_at"
+    )
+
+    @staticmethod
+    def export_products(ordering=None, filters=None, batch_size=None):
+        """
+        Yield every matching product as a plain dict with the same fields and
+        formatting as ProductSerializer. Categories are resolved once per
+        batch, so memory stays flat regardless of the catalogue size.
+        """
+        batch_size = batch_size or settings.PRODUCT_EXPORT_BATCH_SIZE
+        products = ProductService.filter_products(ordering=ordering, filters=filters)
+        serializer = ProductRawSerializer()
+        batch = []
+        for document in ProductRepository.stream(products, ProductService.EXPORT_FIELDS, batch_size):
+            batch.append(document)
+            if len(batch) == batch_size:
+                yield from serializer.many(batch)
+                batch = []
+        yield from serializer.many(batch)
+
+    # Columns an export carries that an import ignores, so an export file
+    # can be imported back as is.
+    IMPORT_IGNORED_FIELDS = ("id", "created_at", "updated_at")
+
+    @staticmethod
+    def parse_ndjson(lines):
+        """
+        Yield ``(line_number, row, errors)`` for every non-blank line of an
+        NDJSON file; ``errors`` is set instead of ``row`` when the line is
+        not a JSON object.
+        """
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, None, {"non_field_errors": ["Invalid JSON."]}
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, {"non_field_errors": ["Expected a product object."]}
+                continue
+            yield line_number, row, None
+
+    @staticmethod
+    def parse_csv(lines):
+        """
+        Yield ``(line_number, row, errors)`` for every record of a CSV file
+        whose first line holds the column names.
+        """
+        reader = csv.DictReader(lines, restkey="extra_columns")
+        for row in reader:
+            if "extra_columns" in row:
+                yield reader.line_num, None, {"non_field_errors": ["Row has more values than columns."]}
+                continue
+            yield reader.line_num, row, None
+
+    @staticmethod
+    def import_products(rows, chunk_size=None, max_reported_errors=None):
+        """
+        Validate and upsert by name the ``(line_number, row, errors)`` triples
+        produced by parse_ndjson/parse_csv. Rows are consumed ``chunk_size`` at
+        a time, so memory does not grow with the input: each chunk costs one
+        cached category lookup and one bulk_write. Within a chunk the last row
+        for a name wins and the earlier ones are rejected.
+
+        Returns the counts, the throughput and the first
+        ``max_reported_errors`` rejected rows.
+        """
+        chunk_size = chunk_size or settings.PRODUCT_BULK_CHUNK_SIZE
+        if max_reported_errors is None:
+            max_reported_errors = settings.PRODUCT_IMPORT_MAX_REPORTED_ERRORS
+        summary = {"rows": 0, "inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0, "rejected_rows": []}
+        started = time.monotonic()
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                ProductService._import_chunk(chunk, summary, max_reported_errors)
+                chunk = []
+        ProductService._import_chunk(chunk, summary, max_reported_errors)
+        elapsed = time.monotonic() - started
+        summary["elapsed_seconds"] = round(elapsed, 3)
+        summary["rows_per_second"] = round(summary["rows"] / elapsed, 1) if elapsed else 0.0
+        return summary
+
+    @staticmethod
+    def _import_chunk(chunk, summary, max_reported_errors):
+        def reject(line_number, errors):
+            summary["rejected"] += 1
+            if len(summary["rejected_rows"]) < max_reported_errors:
+                summary["rejected_rows"].append({"line": line_number, "errors": errors})
+
+        summary["rows"] += len(chunk)
+        categories = CategoryRepository.get_by_titles(
+            row["category"] for _, row, _ in chunk if row and isinstance(row.get("category"), str)
+        )
+        valid = {}
+        for line_number, row, errors in chunk:
+            if errors:
+                reject(line_number, errors)
+                continue
+            data = {
+                key: value for key, value in row.items()
+                if key not in ProductService.IMPORT_IGNORED_FIELDS
+            }
+            serializer = ProductSerializer(data=data, context={"categories": categories})
+            if not serializer.is_valid():
+                reject(line_number, serializer.errors)
+                continue
+            name = serializer.validated_data["name"]
+            if name in valid:
+                reject(valid[name][0], {"name": [f"Superseded by line {line_number}, which has the same name."]})
+            valid[name] = (line_number, serializer.validated_data)
+        if not valid:
+            return
+
+        lines = [line_number for line_number, _ in valid.values()]
+        inserted, matched, modified, write_errors = ProductRepository.bulk_upsert(
+            [data for _, data in valid.values()], timezone.now()
+        )
+        if inserted or modified:
+            response_cache.invalidate("products")
+            ProductService.invalidate_suggestions()
+        summary["inserted"] += inserted
+        summary["updated"] += modified
+        summary["unchanged"] += matched - modified
+        for position, error in write_errors.items():
+            reject(lines[position], {"non_field_errors": [error.get("errmsg")]})
+
+    @staticmethod
+    def _bulk_error(index, errors):
+        return {"index": index, "status": "error", "errors": errors}
+
+    @staticmethod
+    def _duplicate_name_error():
+        return ValidationError({"name": ["A product with this name already exists."]})
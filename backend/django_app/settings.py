@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "django_app.metrics.MetricsMiddleware",
+    "django_app.query_stats.QueryStatsMiddleware",
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     "django.middleware.security.SecurityMiddleware",
@@ -54,7 +57,8 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "django_app.urls"
+# asgi.py switches to the URLconf with the async read views.
+ROOT_URLCONF = os.environ.get("DJANGO_ROOT_URLCONF", "django_app.urls")
 
 TEMPLATES = [
     {
@@ -128,23 +132,96 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
-# Connect to the local MongoDB instance using MongoEngine
-
-from mongoengine import connect
+# MongoDB connection, registered lazily by django_app.db.connect() when the
+# app is ready; nothing connects at import time. Every value can be set from
+# the environment. Options left empty are not passed to the driver.
 
 MONGODB_SETTINGS = {
-    'db': 'product',
-    'host': 'localhost',
-    'port': 27018,
-    'username': 'root',
-    'password': 'example',
-    'authentication_source': 'admin',
+    key: value for key, value in {
+        'db': os.environ.get('MONGODB_DB', 'product'),
+        'host': os.environ.get('MONGODB_HOST', 'localhost'),
+        'port': int(os.environ.get('MONGODB_PORT', 27018)),
+        'username': os.environ.get('MONGODB_USERNAME', 'root'),
+        'password': os.environ.get('MONGODB_PASSWORD', 'example'),
+        'authentication_source': os.environ.get('MONGODB_AUTH_SOURCE', 'admin'),
+        'replicaSet': os.environ.get('MONGODB_REPLICA_SET'),
+        # Connections per server and client; each worker process has its own.
+        'maxPoolSize': int(os.environ.get('MONGODB_MAX_POOL_SIZE', 50)),
+        'minPoolSize': int(os.environ.get('MONGODB_MIN_POOL_SIZE', 0)),
+        # Fail fast instead of queueing requests behind a saturated pool or
+        # an unreachable server.
+        'waitQueueTimeoutMS': int(os.environ.get('MONGODB_WAIT_QUEUE_TIMEOUT_MS', 1000)),
+        'serverSelectionTimeoutMS': int(os.environ.get('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 5000)),
+        'connectTimeoutMS': int(os.environ.get('MONGODB_CONNECT_TIMEOUT_MS', 5000)),
+        'socketTimeoutMS': int(os.environ.get('MONGODB_SOCKET_TIMEOUT_MS', 30000)),
+        # Compressors the server and the installed extras (pymongo[zstd,snappy])
+        # don't support are skipped, with a warning.
+        'compressors': os.environ.get('MONGODB_COMPRESSORS', 'zstd,snappy,zlib'),
+        'readPreference': 'primary',
+    }.items() if value not in (None, '')
 }
 
-connect(**MONGODB_SETTINGS)
+# Read preference of the "read" alias, used by the list, search and stats
+# endpoints; writes and single-document reads stay on the primary.
+MONGODB_READ_PREFERENCE = os.environ.get('MONGODB_READ_PREFERENCE', 'secondaryPreferred')
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
 ]
 
 
+# Process-local category cache used by CategoryRepository
+
+CATEGORY_CACHE_TTL = 300  # seconds
+CATEGORY_CACHE_MAX_SIZE = 1024
+
+# Bulk product writes
+
+PRODUCT_BULK_CHUNK_SIZE = 1000  # documents per insert_many call
+PRODUCT_BULK_MAX_ITEMS = 50000  # products accepted per bulk request
+
+# Streaming catalogue export
+
+PRODUCT_EXPORT_BATCH_SIZE = 1000  # documents per cursor batch
+
+# Streaming catalogue import
+
+PRODUCT_IMPORT_MAX_REPORTED_ERRORS = 100  # rejected rows listed in an import summary
+
+# Catalogue statistics (GET /products/stats/)
+
+PRODUCT_STATS_CACHE_TTL = 60  # seconds
+PRODUCT_STATS_CACHE_MAX_SIZE = 256
+
+# In-memory autocomplete index (GET /products/suggest/)
+
+PRODUCT_SUGGEST_TTL = 300  # seconds before the index is rebuilt from Mongo
+
+# Response cache for the product and category listings. "local" keeps an LRU
+# per process; "django" stores entries and version counters in the Django
+# cache named by CACHE_ALIAS, which shares them when that cache is shared.
+# Misses on collections written in the last PRIMARY_WINDOW seconds are read
+# from the primary, so that a lagging secondary can't fill the new version;
+# keep it above the replication lag you expect.
+
+RESPONSE_CACHE = {
+    "BACKEND": "local",  # "local" or "django"
+    "CACHE_ALIAS": "default",
+    "TTL": 60,  # seconds
+    "MAX_SIZE": 1024,  # entries, local backend only
+    "PRIMARY_WINDOW": 10,  # seconds
+}
+
+# Per-request Mongo query stats (Server-Timing header) and slow-query log
+
+QUERY_STATS = {
+    "SLOW_MS": 100,  # commands at least this slow are logged with their filter shape
+    "SLOWEST": 3,  # slowest commands listed per request in Server-Timing
+}
+
+# Prometheus metrics (GET /metrics). Multiprocess mode is enabled by the
+# PROMETHEUS_MULTIPROC_DIR environment variable, which gunicorn.conf.py sets.
+
+METRICS = {
+    "GAUGE_INTERVAL": 1.0,  # seconds between cache/pool gauge refreshes per process
+}
@@ -1,6 +1,23 @@
 import pytest
+from mongoengine.connection import get_connection
+from pymongo import MongoClient
 from rest_framework.test import APIClient
 from django_app.scripts.seed_data import seed_categories, seed_products
+from django_app.repositories.category_repository import CategoryRepository
+from django_app.services.product_service import ProductService
+from django_app.response_cache import response_cache
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    CategoryRepository.invalidate_cache()
+    ProductService.clear_stats_cache()
+    ProductService.clear_suggestions()
+    response_cache.clear()
+    yield
+    CategoryRepository.invalidate_cache()
+    ProductService.clear_stats_cache()
+    ProductService.clear_suggestions()
+    response_cache.clear()
 
 @pytest.fixture
 def api_client():
@@ -11,3 +28,9 @@ def seeded_data(db):
     categories = seed_categories()
     seed_products(categories)
     return categories
+
+@pytest.fixture
+def mongod():
+    """Skip unless the tests run against a real mongod, for the async driver and $text queries."""
+    if not isinstance(get_connection(), MongoClient):
+        pytest.skip("needs a real mongod")
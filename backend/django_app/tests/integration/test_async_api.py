@@ -0,0 +1,167 @@
+import json
+import pytest
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django_app.models.category import Category
+from django_app.models.product import Product
+from django_app.repositories.async_category_repository import AsyncCategoryRepository
+from django_app.repositories.async_product_repository import AsyncProductRepository
+from django_app.response_cache import response_cache
+
+
+class AsyncCursor:
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class AsyncCollection:
+    """Awaitable facade over the test database's collection, in place of the async driver."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(list(self.collection.find(*args, **kwargs)))
+
+    async def find_one(self, *args, **kwargs):
+        return self.collection.find_one(*args, **kwargs)
+
+    async def count_documents(self, *args, **kwargs):
+        return self.collection.count_documents(*args, **kwargs)
+
+
+@pytest.fixture
+def asgi_client():
+    """Send a request through the ASGI URLconf; APIClient keeps the sync one for comparison."""
+    client = AsyncClient()
+
+    def request(method, *args, **kwargs):
+        with override_settings(ROOT_URLCONF="django_app.asgi_urls"):
+            return async_to_sync(getattr(client, method))(*args, **kwargs)
+
+    return request
+
+
+@pytest.fixture
+def async_client(asgi_client):
+    """asgi_client with the async driver replaced, so the views also run against mongomock."""
+    with patch.object(AsyncProductRepository, "collection",
+                      side_effect=lambda alias=None: AsyncCollection(Product._get_collection())), \
+            patch.object(AsyncCategoryRepository, "collection",
+                         side_effect=lambda alias=None: AsyncCollection(Category._get_collection())):
+        yield asgi_client
+
+
+@pytest.mark.django_db
+class TestAsyncApi:
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"ordering": "name", "page": 2, "page_size": 3},
+        {"ordering": "-price", "categories": ["Books", "Electronics"], "price_min": 10},
+        {"ordering": "price", "fields": "name,price"},
+        {"ordering": "name", "cursor": "", "page_size": 2},
+        {"created_after": "2000-01-01", "page": "last", "page_size": 2},
+    ])
+    def test_product_list_matches_sync_view(self, async_client, seeded_data, params):
+        expected = APIClient().get(reverse("product-list"), params)
+        response_cache.clear()
+        res = async_client("get", "/products/", params)
+        assert res.status_code == 200
+        assert json.loads(res.content) == json.loads(expected.content)
+        assert res["ETag"] == expected["ETag"]
+
+    def test_product_list_follows_cursor_and_cache(self, async_client, seeded_data):
+        first = json.loads(async_client("get", "/products/", {"ordering": "name", "cursor": "", "page_size": 2}).content)
+        res = async_client("get", first["next"])
+        names = [product["name"] for product in first["results"] + json.loads(res.content)["results"]]
+        assert names == [product.name for product in Product.objects.order_by("name").limit(4)]
+
+        assert async_client("get", "/products/", {"page_size": 2, "ordering": "name", "cursor": ""})["X-Cache"] == "HIT"
+
+    def test_product_list_errors(self, async_client, seeded_data):
+        assert async_client("get", "/products/", {"page": 99}).status_code == 404
+        assert async_client("get", "/products/", {"page_size": 0}).status_code == 400
+        assert async_client("get", "/products/", {"fields": "nope"}).status_code == 400
+        res = async_client("get", "/products/", {"created_after": "yesterday"})
+        assert json.loads(res.content)["error"] == "Invalid date format"
+
+    def test_product_retrieve_matches_sync_view(self, async_client, seeded_data):
+        product = Product.objects.get(name="iPhone 14")
+        url = reverse("product-detail", kwargs={"pk": str(product.id)})
+        expected = APIClient().get(url, {"fields": "name,category"})
+        res = async_client("get", url, {"fields": "name,category"})
+        assert json.loads(res.content) == expected.data
+        assert (res["ETag"], res["Last-Modified"]) == (expected["ETag"], expected["Last-Modified"])
+
+        assert async_client("get", url, {"fields": "name,category"}, headers={"If-None-Match": res["ETag"]}).status_code == 304
+        assert async_client("get", reverse("product-detail", kwargs={"pk": "a" * 24})).status_code == 404
+        assert async_client("get", reverse("product-detail", kwargs={"pk": "bad"})).status_code == 400
+
+    def test_category_endpoints_match_sync_views(self, async_client, seeded_data):
+        params = {"ordering": "title", "page_size": 2, "page": 2}
+        expected = APIClient().get(reverse("category-list"), params)
+        response_cache.clear()
+        res = async_client("get", "/categories/", params)
+        assert json.loads(res.content) == json.loads(expected.content)
+
+        url = reverse("category-detail", kwargs={"pk": str(seeded_data["Books"].id)})
+        expected = APIClient().get(url)
+        res = async_client("get", url)
+        assert json.loads(res.content) == expected.data
+        assert res["ETag"] == expected["ETag"]
+
+    def test_other_methods_fall_through_to_sync_views(self, async_client, seeded_data):
+        res = async_client(
+            "post", reverse("product-list"),
+            {"name": "Kindle", "description": "E-reader", "category": "Books", "price": 99.0,
+             "brand": "Amazon", "quantity": 5},
+            content_type="application/json",
+        )
+        assert res.status_code == 200
+        assert Product.objects(name="Kindle").count() == 1
+        assert async_client("get", "/products/", {"ordering": "name"})["X-Cache"] == "MISS"
+        assert async_client("get", "/products/search/", {"q": ""}).status_code == 400
+
+
+@pytest.mark.django_db
+class TestAsyncDriver:
+
+    def test_product_list_and_retrieve(self, mongod, asgi_client, seeded_data):
+        params = {"ordering": "-price", "categories": ["Books", "Electronics"], "page_size": 2, "page": 2}
+        expected = APIClient().get(reverse("product-list"), params)
+        response_cache.clear()
+        res = asgi_client("get", "/products/", params)
+        assert res.status_code == 200
+        assert json.loads(res.content) == json.loads(expected.content)
+        assert res["ETag"] == expected["ETag"]
+
+        first = json.loads(asgi_client("get", "/products/", {"ordering": "name", "cursor": "", "page_size": 2}).content)
+        second = json.loads(asgi_client("get", first["next"]).content)
+        names = [product["name"] for product in first["results"] + second["results"]]
+        assert names == [product.name for product in Product.objects.order_by("name").limit(4)]
+
+        url = reverse("product-detail", kwargs={"pk": str(Product.objects.get(name="iPhone 14").id)})
+        expected = APIClient().get(url)
+        res = asgi_client("get", url)
+        assert res.status_code == 200
+        assert json.loads(res.content) == expected.data
+        assert res["ETag"] == expected["ETag"]
+
+    def test_category_list_and_retrieve(self, mongod, asgi_client, seeded_data):
+        params = {"ordering": "title", "page_size": 2}
+        expected = APIClient().get(reverse("category-list"), params)
+        response_cache.clear()
+        res = asgi_client("get", "/categories/", params)
+        assert json.loads(res.content) == json.loads(expected.content)
+
+        url = reverse("category-detail", kwargs={"pk": str(seeded_data["Books"].id)})
+        res = asgi_client("get", url)
+        assert json.loads(res.content) == APIClient().get(url).data
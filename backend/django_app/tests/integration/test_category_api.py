@@ -1,4 +1,6 @@
 import pytest
+from io import StringIO
+from django.core.management import call_command
 from django.urls import reverse
 from django_app.models.category import Category
 from django_app.models.product import Product
@@ -29,6 +31,33 @@ class TestCategoryIntegration:
         assert res.status_code == 200
         assert res.data["title"] == "Electronics"
 
+    def test_list_categories_sparse_fields(self, api_client, seeded_data):
+        res = api_client.get(reverse("category-list"), {"fields": "title", "ordering": "title"})
+        assert res.status_code == 200
+        assert res.data["results"][0] == {"title": "Books"}
+
+    def test_get_single_category_sparse_fields(self, api_client, seeded_data):
+        category = Category.objects.get(title="Electronics")
+        url = reverse("category-detail", kwargs={"pk": str(category.id)})
+        res = api_client.get(url, {"fields": "id,title"})
+        assert res.data == {"id": str(category.id), "title": "Electronics"}
+        assert api_client.get(url, {"fields": "nope"}).status_code == 400
+
+    def test_category_conditional_requests(self, api_client, seeded_data):
+        category = Category.objects.get(title="Books")
+        url = reverse("category-detail", kwargs={"pk": str(category.id)})
+        etag = api_client.get(url)["ETag"]
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        list_etag = api_client.get(reverse("category-list"))["ETag"]
+        assert api_client.get(reverse("category-list"), HTTP_IF_NONE_MATCH=list_etag).status_code == 304
+
+        payload = {"title": "Books", "description": "Updated"}
+        res = api_client.put(url, payload, format="json", HTTP_IF_MATCH=etag)
+        assert res.status_code == 200
+        assert api_client.put(url, payload, format="json", HTTP_IF_MATCH=etag).status_code == 412
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 304
+        assert api_client.get(reverse("category-list"), HTTP_IF_NONE_MATCH=list_etag).status_code == 200
+
     def test_update_category(self, api_client, seeded_data):
         category = Category.objects.get(title="Books")
         url = reverse("category-detail", kwargs={"pk": str(category.id)})
@@ -102,3 +131,41 @@ class TestCategoryIntegration:
 
 
 
+
+    def test_pool_stats(self, api_client, seeded_data):
+        api_client.get(reverse("category-list"))
+        res = api_client.get(reverse("db-pool-stats"))
+        assert res.status_code == 200
+        assert set(res.data) == {"default", "read"}
+        assert {"open", "checked_out", "max_size", "utilization"} <= set(res.data["read"])
+
+    def test_metrics_label_routes_by_viewset_action(self, api_client, seeded_data):
+        category = Category.objects.get(title="Electronics")
+        api_client.get(reverse("category-products", kwargs={"pk": str(category.id)}))
+        api_client.get(reverse("product-list"))
+        api_client.get("/no-such-route/")
+
+        res = api_client.get(reverse("metrics"))
+        assert res.status_code == 200
+        assert res["Content-Type"].startswith("text/plain")
+        body = res.content.decode()
+        assert 'http_requests_total{method="GET",route="category-list_products",status="200"}' in body
+        assert 'http_requests_total{method="GET",route="product-list",status="200"}' in body
+        assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in body
+        assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="product-list"}' in body
+        assert 'cache_hit_ratio{cache="response"}' in body
+        assert 'mongo_pool_max_size{alias="read"}' in body
+
+    def test_seed_categories_only_creates_missing_titles(self, seeded_data):
+        Category.objects(title="Books").update_one(set__description="Kept as is")
+
+        out = StringIO()
+        call_command("seed_categories", stdout=out)
+        assert "2 of 5 default categories created" in out.getvalue()
+        assert Category.objects.count() == 6
+        assert Category.objects.get(title="Books").description == "Kept as is"
+
+        out = StringIO()
+        call_command("seed_categories", stdout=out)
+        assert "0 of 5 default categories created" in out.getvalue()
+        assert Category.objects.count() == 6
@@ -1,9 +1,17 @@
+import json
+from datetime import timedelta
 import pytest
+from unittest.mock import patch
 from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework import status
 from django_app.models.product import Product
 from django_app.models.category import Category
 from django_app.services.product_service import ProductService
+from django_app.repositories.category_repository import CategoryRepository
+from django_app.query_stats import assert_max_queries
+from django_app.response_cache import response_cache
+from django_app import db
 from bson import ObjectId
 
 
@@ -26,12 +34,472 @@ class TestProductIntegration:
         assert res.status_code == status.HTTP_200_OK
         assert res.data["created_product"]["name"] == "Smartphone"
 
+    def test_create_product_duplicate_name(self, api_client, seeded_data):
+        url = reverse("product-list")
+        payload = {
+            "name": "iPhone 14",
+            "description": "Same name as a seeded product",
+            "brand": "Apple",
+            "price": 899.99,
+            "quantity": 5,
+            "category": "Electronics"
+        }
+        res = api_client.post(url, payload, format="json")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert res.data["message"]["name"] == ["A product with this name already exists."]
+
+    def test_bulk_create_products(self, api_client, seeded_data):
+        url = reverse("product-bulk")
+        product = {
+            "description": "Bulk loaded",
+            "brand": "BrandX",
+            "price": 9.99,
+            "quantity": 3,
+            "category": "Books"
+        }
+        payload = [
+            {**product, "name": "Bulk 1"},
+            {**product, "name": "Bulk 2"},
+            {**product, "name": "Bulk 1"},
+            {**product, "name": "iPhone 14"},
+            {**product, "name": "Bulk 3", "category": "Missing"},
+        ]
+        res = api_client.post(url, payload, format="json")
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["created"] == 2
+        assert [r["status"] for r in res.data["results"]] == ["created", "created", "error", "error", "error"]
+        assert "name" in res.data["results"][2]["errors"]
+        assert "category" in res.data["results"][4]["errors"]
+        assert Product.objects(name__in=["Bulk 1", "Bulk 2"]).count() == 2
+
+    def test_bulk_create_requires_list(self, api_client):
+        res = api_client.post(reverse("product-bulk"), {"name": "Single"}, format="json")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_update_products(self, api_client, seeded_data):
+        iphone = Product.objects.get(name="iPhone 14")
+        tshirt = Product.objects.get(name="T-shirt")
+        missing_id = str(ObjectId())
+        payload = [
+            {"id": str(iphone.id), "price": 899.99, "quantity": 7},
+            {"id": str(tshirt.id), "category": "Books"},
+            {"id": missing_id, "quantity": 1},
+            {"id": "not-an-id", "quantity": 1},
+            {"id": str(iphone.id), "quantity": -1},
+        ]
+        res = api_client.patch(reverse("product-bulk"), payload, format="json")
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["matched"] == 2
+        assert {failure["id"] for failure in res.data["failures"]} == {missing_id, "not-an-id", str(iphone.id)}
+        iphone.reload()
+        assert iphone.price == 899.99 and iphone.quantity == 7
+        assert Product.objects.get(id=tshirt.id).category.title == "Books"
+
+    def test_bulk_delete_products(self, api_client, seeded_data):
+        ids = [str(product.id) for product in Product.objects.limit(2)]
+        missing_id = str(ObjectId())
+        res = api_client.delete(reverse("product-bulk"), {"ids": ids + ["bad", missing_id]}, format="json")
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["deleted"] == 2
+        assert {failure["id"] for failure in res.data["failures"]} == {"bad", missing_id}
+        missing = next(failure for failure in res.data["failures"] if failure["id"] == missing_id)
+        assert missing["errors"] == {"id": ["Product not found."]}
+        assert Product.objects(id__in=ids).count() == 0
+
+    def test_adjust_stock(self, api_client, seeded_data):
+        product = Product.objects.get(name="iPhone 14")
+        url = reverse("product-adjust-stock", kwargs={"pk": str(product.id)})
+        res = api_client.post(url, {"delta": -4}, format="json")
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["quantity"] == 6
+
+        res = api_client.post(url, {"delta": -7}, format="json")
+        assert res.status_code == status.HTTP_409_CONFLICT
+        assert res.data["available"] == 6
+        assert Product.objects.get(id=product.id).quantity == 6
+
+    def test_adjust_stock_batch_rolls_back_on_conflict(self, api_client, seeded_data):
+        iphone = Product.objects.get(name="iPhone 14")
+        tshirt = Product.objects.get(name="T-shirt")
+        url = reverse("product-adjust-stock-batch")
+        payload = {"items": [
+            {"id": str(tshirt.id), "delta": -5},
+            {"id": str(iphone.id), "delta": -11},
+        ]}
+        res = api_client.post(url, payload, format="json")
+        assert res.status_code == status.HTTP_409_CONFLICT
+        assert res.data["id"] == str(iphone.id)
+        assert Product.objects.get(id=tshirt.id).quantity == 50
+
+        payload["items"][1]["delta"] = -10
+        res = api_client.post(url, payload, format="json")
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["quantities"] == {str(tshirt.id): 45, str(iphone.id): 0}
+
+    def test_adjust_stock_batch_reverts_increment_on_conflict(self, api_client, seeded_data):
+        iphone = Product.objects.get(name="iPhone 14")
+        tshirt = Product.objects.get(name="T-shirt")
+        url = reverse("product-adjust-stock-batch")
+        payload = {"items": [
+            {"id": str(tshirt.id), "delta": 5},
+            {"id": str(iphone.id), "delta": -11},
+        ]}
+        res = api_client.post(url, payload, format="json")
+        assert res.status_code == status.HTTP_409_CONFLICT
+        assert Product.objects.get(id=tshirt.id).quantity == 50
+        assert Product.objects.get(id=iphone.id).quantity == 10
+
     def test_list_products(self, api_client, seeded_data):
         url = reverse("product-list")
         res = api_client.get(url)
         assert res.status_code == status.HTTP_200_OK
         assert len(res.data["results"]) == Product.objects.count()
 
+    def test_list_products_second_page(self, api_client, seeded_data):
+        url = reverse("product-list")
+        res = api_client.get(url, {"page": 2, "page_size": 3, "ordering": "name"})
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["count"] == Product.objects.count()
+        expected = [p.name for p in Product.objects.order_by("name").skip(3).limit(3)]
+        assert [p["name"] for p in res.data["results"]] == expected
+
+    def test_list_products_with_cursor(self, api_client, seeded_data):
+        url = reverse("product-list")
+        expected = [p.name for p in Product.objects.order_by("-price")]
+        res = api_client.get(url, {"cursor": "", "ordering": "-price", "page_size": 3})
+        assert res.status_code == status.HTTP_200_OK
+        assert "count" not in res.data
+        assert res.data["previous"] is None
+        assert [p["name"] for p in res.data["results"]] == expected[:3]
+
+        res = api_client.get(res.data["next"])
+        assert [p["name"] for p in res.data["results"]] == expected[3:6]
+        assert res.data["next"] is None
+
+        res = api_client.get(res.data["previous"])
+        assert [p["name"] for p in res.data["results"]] == expected[:3]
+
+    def test_list_products_with_invalid_cursor(self, api_client):
+        res = api_client.get(reverse("product-list"), {"cursor": "not-a-cursor"})
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_export_products_ndjson(self, api_client, seeded_data):
+        res = api_client.get(reverse("product-export"), {"price_min": 100})
+        assert res.status_code == status.HTTP_200_OK
+        assert res["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+        listed = api_client.get(reverse("product-list"), {"price_min": 100, "ordering": "name"}).data["results"]
+        assert sorted(rows, key=lambda row: row["name"]) == listed
+
+    def test_export_products_csv(self, api_client, seeded_data):
+        res = api_client.get(reverse("product-export"), {"export_format": "csv"})
+        assert res.status_code == status.HTTP_200_OK
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        assert lines[0] == "id,name,category,description,price,brand,quantity,created_at,updated_at"
+        assert len(lines) == Product.objects.count() + 1
+
+    def test_import_products_ndjson_upserts_by_name(self, api_client, seeded_data):
+        rows = [
+            {"name": "iPhone 14", "category": "Electronics", "description": "Updated", "price": 899.99,
+             "brand": "Apple", "quantity": 5},
+            {"name": "Kindle", "category": "Electronics", "description": "E-reader", "price": 99.0,
+             "brand": "Amazon", "quantity": 3},
+            {"name": "Lamp", "category": "Lighting", "description": "Desk lamp", "price": 15.0,
+             "brand": "Ikea", "quantity": 1},
+        ]
+        content = "\n".join(json.dumps(row) for row in rows) + "\nnot json\n"
+        upload = SimpleUploadedFile("products.ndjson", content.encode())
+        res = api_client.post(reverse("product-import"), {"file": upload}, format="multipart")
+        assert res.status_code == status.HTTP_200_OK
+        assert (res.data["rows"], res.data["inserted"], res.data["updated"], res.data["rejected"]) == (4, 1, 1, 2)
+        assert [row["line"] for row in res.data["rejected_rows"]] == [3, 4]
+        assert "category" in res.data["rejected_rows"][0]["errors"]
+        assert Product.objects.get(name="iPhone 14").price == 899.99
+        assert Product.objects.get(name="Kindle").category.title == "Electronics"
+        assert not Product.objects(name="Lamp")
+
+    def test_import_products_reimport_leaves_unchanged_rows_alone(self, api_client, seeded_data):
+        rows = [
+            {"name": "Kindle", "category": "Electronics", "description": "E-reader", "price": 99.0,
+             "brand": "Amazon", "quantity": 3},
+            {"name": "Kindle", "category": "Electronics", "description": "E-reader", "price": 89.0,
+             "brand": "Amazon", "quantity": 3},
+        ]
+        content = "\n".join(json.dumps(row) for row in rows) + "\n"
+
+        def upload():
+            res = api_client.post(
+                reverse("product-import"), {"file": SimpleUploadedFile("products.ndjson", content.encode())},
+                format="multipart",
+            )
+            assert res.status_code == status.HTTP_200_OK
+            return res.data
+
+        first = upload()
+        assert (first["rows"], first["inserted"], first["rejected"]) == (2, 1, 1)
+        assert first["rejected_rows"][0]["line"] == 1
+        updated_at = Product.objects.get(name="Kindle").updated_at
+
+        second = upload()
+        assert (second["inserted"], second["updated"], second["unchanged"], second["rejected"]) == (0, 0, 1, 1)
+        assert second["inserted"] + second["updated"] + second["unchanged"] + second["rejected"] == second["rows"]
+        kindle = Product.objects.get(name="Kindle")
+        assert (kindle.price, kindle.updated_at) == (89.0, updated_at)
+
+    def test_import_products_csv(self, api_client, seeded_data):
+        content = (
+            "id,name,category,description,price,brand,quantity,created_at,updated_at\n"
+            ",Desk,Home Appliances,Oak desk,250,Ikea,4,,\n"
+            ",Chair,Home Appliances,Office chair,-1,Ikea,4,,\n"
+        )
+        upload = SimpleUploadedFile("products.csv", content.encode())
+        res = api_client.post(reverse("product-import"), {"file": upload}, format="multipart")
+        assert res.status_code == status.HTTP_200_OK
+        assert (res.data["inserted"], res.data["rejected"]) == (1, 1)
+        assert res.data["rejected_rows"][0]["line"] == 3
+        desk = Product.objects.get(name="Desk")
+        assert (desk.price, desk.quantity) == (250.0, 4)
+
+    def test_import_products_requires_file(self, api_client, seeded_data):
+        res = api_client.post(reverse("product-import"), {}, format="multipart")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_list_products_sparse_fields_skips_categories(self, api_client, seeded_data):
+        with patch.object(CategoryRepository, "get_titles_by_ids") as get_titles:
+            res = api_client.get(reverse("product-list"), {"fields": "id,name,price", "ordering": "price"})
+        assert res.status_code == status.HTTP_200_OK
+        assert [set(product) for product in res.data["results"]] == [{"id", "name", "price"}] * 4
+        assert res.data["results"][0]["name"] == "T-shirt"
+        get_titles.assert_not_called()
+
+    def test_list_products_sparse_fields_with_cursor(self, api_client, seeded_data):
+        res = api_client.get(reverse("product-list"), {
+            "fields": "name", "ordering": "-quantity", "cursor": "", "page_size": 2
+        })
+        assert [product["name"] for product in res.data["results"]] == ["Harry Potter", "T-shirt"]
+        res = api_client.get(res.data["next"])
+        assert res.data["results"] == [{"name": "Microwave Oven"}, {"name": "iPhone 14"}]
+
+    def test_sparse_fields_rejects_unknown_fields(self, api_client, seeded_data):
+        res = api_client.get(reverse("product-list"), {"fields": "name,secret"})
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+        assert "fields" in res.data["message"]
+
+    def test_get_single_product_sparse_fields(self, api_client, seeded_data):
+        product = Product.objects.get(name="iPhone 14")
+        url = reverse("product-detail", kwargs={"pk": str(product.id)})
+        res = api_client.get(url, {"fields": "name,category"})
+        assert res.data == {"name": "iPhone 14", "category": "Electronics"}
+
+    def test_product_stats(self, api_client, seeded_data):
+        res = api_client.get(reverse("product-stats"), {"price_min": 100})
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["totals"] == {
+            "count": 2, "total_quantity": 30, "stock_value": 12409.9,
+            "min_price": 120.5, "max_price": 999.99, "avg_price": 560.25,
+        }
+        assert {(group["category"], group["brand"]) for group in res.data["groups"]} == {
+            ("Electronics", "Apple"), ("Home Appliances", "LG")
+        }
+
+    def test_product_stats_are_cached(self, api_client, seeded_data):
+        url = reverse("product-stats")
+        assert api_client.get(url).data["totals"]["count"] == 4
+        Product.objects.get(name="T-shirt").delete()
+        assert api_client.get(url).data["totals"]["count"] == 4
+        ProductService.clear_stats_cache()
+        assert api_client.get(url).data["totals"]["count"] == 3
+
+    def test_category_stats(self, api_client, seeded_data):
+        category = seeded_data["Books"]
+        res = api_client.get(reverse("category-stats", kwargs={"pk": str(category.id)}))
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["category"]["title"] == "Books"
+        assert res.data["groups"] == [{
+            "category": "Books", "brand": "Bloomsbury", "count": 1, "total_quantity": 100,
+            "stock_value": 2999.0, "min_price": 29.99, "max_price": 29.99, "avg_price": 29.99,
+        }]
+        missing = api_client.get(reverse("category-stats", kwargs={"pk": str(ObjectId())}))
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_search_products_pages_by_relevance(self, api_client, mongod, seeded_data):
+        Product.ensure_indexes()
+        for name, brand, description, price in (
+            ("Phone Case", "Spigen", "Slim case for any phone", 15.0),
+            ("Phone Stand", "Anker", "Aluminium desk stand", 25.0),
+            ("Charger", "Anker", "Fast phone charger", 30.0),
+            ("Phone Sticker", "Generic", "Sticker", 1.0),
+        ):
+            Product(name=name, brand=brand, description=description, price=price, quantity=5,
+                    category=seeded_data["Electronics"]).save()
+
+        res = api_client.get(reverse("product-search"), {"q": "phone", "page_size": 2, "price_min": 10})
+        assert res.status_code == status.HTTP_200_OK
+        first = res.data["results"]
+        assert [item["name"] for item in first] == ["Phone Case", "Phone Stand"]
+        assert first[0]["score"] > first[1]["score"]
+        assert first[0]["category"] == "Electronics"
+
+        res = api_client.get(res.data["next"])
+        assert res.status_code == status.HTTP_200_OK
+        assert [item["name"] for item in res.data["results"]] == ["Charger"]
+        assert res.data["results"][0]["score"] < first[1]["score"]
+        assert res.data["next"] is None
+
+    def test_search_products_requires_query(self, api_client, seeded_data):
+        assert api_client.get(reverse("product-search")).status_code == status.HTTP_400_BAD_REQUEST
+        res = api_client.get(reverse("product-search"), {"q": "phone", "cursor": "bad"})
+        assert res.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_suggest_follows_single_product_writes(self, api_client, seeded_data):
+        url = reverse("product-suggest")
+        assert api_client.get(url, {"prefix": "i"}).data["suggestions"] == [{"text": "iPhone 14", "type": "name"}]
+
+        iphone = Product.objects.get(name="iPhone 14")
+        payload = {"name": "iPhone 15", "category": "Electronics", "description": "New",
+                   "price": 1099.0, "brand": "Apple", "quantity": 5}
+        api_client.put(reverse("product-detail", kwargs={"pk": str(iphone.id)}), payload, format="json")
+        api_client.post(reverse("product-list"), {**payload, "name": "iPad", "brand": "Apple"}, format="json")
+        res = api_client.get(url, {"prefix": "IP"})
+        assert [item["text"] for item in res.data["suggestions"]] == ["iPad", "iPhone 15"]
+
+        api_client.delete(reverse("product-detail", kwargs={"pk": str(iphone.id)}))
+        assert [item["text"] for item in api_client.get(url, {"prefix": "ip"}).data["suggestions"]] == ["iPad"]
+        assert api_client.get(url, {"prefix": "app"}).data["suggestions"] == [{"text": "Apple", "type": "brand"}]
+
+    def test_suggest_validates_parameters(self, api_client, seeded_data):
+        url = reverse("product-suggest")
+        assert api_client.get(url).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(url, {"prefix": "a", "limit": 0}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_single_product_conditional(self, api_client, seeded_data):
+        product = Product.objects.get(name="iPhone 14")
+        url = reverse("product-detail", kwargs={"pk": str(product.id)})
+        res = api_client.get(url)
+        etag, modified = res["ETag"], res["Last-Modified"]
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+        assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=modified).status_code == status.HTTP_304_NOT_MODIFIED
+        assert api_client.get(url, {"fields": "name"}, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+        category = seeded_data["Electronics"]
+        api_client.put(
+            reverse("category-detail", kwargs={"pk": str(category.id)}),
+            {"title": "Gadgets", "description": "Renamed"}, format="json"
+        )
+        res = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["category"] == "Gadgets"
+
+    def test_get_single_product_sees_category_renamed_by_another_process(self, api_client, seeded_data):
+        product = Product.objects.get(name="iPhone 14")
+        url = reverse("product-detail", kwargs={"pk": str(product.id)})
+        etag = api_client.get(url)["ETag"]
+
+        # Another worker's rename: this process's category cache is left as is.
+        category = seeded_data["Electronics"]
+        Category.objects(id=category.id).update(title="Gadgets", updated_at=category.updated_at + timedelta(seconds=1))
+        res = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == status.HTTP_200_OK
+        assert res["ETag"] != etag
+        assert res.data["category"] == "Gadgets"
+
+    def test_list_products_conditional(self, api_client, seeded_data):
+        url = reverse("product-list")
+        etag = api_client.get(url, {"ordering": "name"})["ETag"]
+        assert api_client.get(url, {"ordering": "name"}, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert api_client.get(url, {"ordering": "price"}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+        product = Product.objects.get(name="T-shirt")
+        api_client.delete(reverse("product-detail", kwargs={"pk": str(product.id)}))
+        res = api_client.get(url, {"ordering": "name"}, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == status.HTTP_200_OK
+        assert res["ETag"] != etag
+
+    def test_list_products_response_cache(self, api_client, seeded_data):
+        url = reverse("product-list")
+        first = api_client.get(url, {"categories": ["Electronics", "Books"], "ordering": "name"})
+        assert first["X-Cache"] == "MISS"
+        second = api_client.get(url, {"ordering": "name", "categories": ["Books", "Electronics"], "page": 1})
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+        assert second["ETag"] == first["ETag"]
+
+        category = seeded_data["Electronics"]
+        api_client.put(
+            reverse("category-detail", kwargs={"pk": str(category.id)}),
+            {"title": "Gadgets", "description": "Renamed"}, format="json"
+        )
+        res = api_client.get(url, {"ordering": "name", "categories": ["Books", "Gadgets"]})
+        assert res["X-Cache"] == "MISS"
+        assert "Gadgets" in {product["category"] for product in res.data["results"]}
+
+        stats = api_client.get(reverse("cache-stats")).data
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+        assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+    def test_list_products_server_timing(self, api_client, seeded_data):
+        res = api_client.get(reverse("product-list"))
+        assert res.status_code == status.HTTP_200_OK
+        assert res["Server-Timing"].startswith("db;dur=")
+        assert "total;dur=" in res["Server-Timing"]
+
+    def test_listing_version_query_budget(self, seeded_data):
+        # Newest updated_at and count of the products, newest category updated_at.
+        with assert_max_queries(3):
+            ProductService.get_listing_version()
+
+    def test_list_products_counts_once(self, api_client, seeded_data):
+        # The page reuses the count taken for the ETag.
+        with patch("mongoengine.queryset.QuerySet.count", autospec=True, return_value=3) as count:
+            res = api_client.get(reverse("product-list"), {"page": 1})
+        assert res.status_code == status.HTTP_200_OK
+        assert res.data["count"] == 3
+        assert count.call_count == 1
+
+    def test_list_products_after_a_write_reads_the_primary(self, api_client, seeded_data):
+        product = Product.objects.get(name="iPhone 14")
+        api_client.delete(reverse("product-detail", kwargs={"pk": str(product.id)}))
+        with patch.object(
+            ProductService, "get_listing_version", wraps=ProductService.get_listing_version
+        ) as get_listing_version:
+            api_client.get(reverse("product-list"))
+            with patch.object(response_cache, "primary_window", 0):
+                api_client.get(reverse("product-list"), {"page_size": 2})
+        assert [call.kwargs["using"] for call in get_listing_version.call_args_list] == [
+            db.DEFAULT_ALIAS, db.READ_ALIAS
+        ]
+
+    def test_update_product_if_match(self, api_client, seeded_data):
+        product = Product.objects.get(name="iPhone 14")
+        url = reverse("product-detail", kwargs={"pk": str(product.id)})
+        etag = api_client.get(url)["ETag"]
+        payload = {"name": "iPhone 14", "category": "Electronics", "description": "Updated",
+                   "price": 899.99, "brand": "Apple", "quantity": 10}
+
+        res = api_client.put(url, payload, format="json", HTTP_IF_MATCH=etag)
+        assert res.status_code == status.HTTP_200_OK
+        assert res["ETag"] != etag
+        assert api_client.get(url)["ETag"] == res["ETag"]
+
+        res = api_client.put(url, {**payload, "price": 1.0}, format="json", HTTP_IF_MATCH=etag)
+        assert res.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert Product.objects.get(id=product.id).price == 899.99
+
+        missing = reverse("product-detail", kwargs={"pk": str(ObjectId())})
+        assert api_client.put(missing, payload, format="json", HTTP_IF_MATCH=etag).status_code == 404
+
+    def test_update_product_rejects_weak_if_match(self, api_client, seeded_data):
+        product = Product.objects.get(name="iPhone 14")
+        url = reverse("product-detail", kwargs={"pk": str(product.id)})
+        etag = api_client.get(url)["ETag"]
+        payload = {"name": "iPhone 14", "category": "Electronics", "description": "Updated",
+                   "price": 1.0, "brand": "Apple", "quantity": 10}
+
+        res = api_client.put(url, payload, format="json", HTTP_IF_MATCH=f"W/{etag}")
+        assert res.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert Product.objects.get(id=product.id).price != 1.0
+
     def test_get_single_product(self, api_client, seeded_data):
         product = Product.objects.first()
         url = reverse("product-detail", kwargs={"pk": str(product.id)})
@@ -54,6 +522,19 @@ class TestProductIntegration:
         assert res.status_code == status.HTTP_200_OK
         assert res.data["updated_product"]["name"] == "Updated Smartphone"
 
+    def test_update_missing_product(self, api_client, seeded_data):
+        url = reverse("product-detail", kwargs={"pk": str(ObjectId())})
+        payload = {
+            "name": "Ghost",
+            "description": "Does not exist",
+            "brand": "BrandX",
+            "price": 1.99,
+            "quantity": 1,
+            "category": "Books"
+        }
+        res = api_client.put(url, payload, format="json")
+        assert res.status_code == status.HTTP_404_NOT_FOUND
+
     def test_delete_product(self, api_client, seeded_data):
         product = Product.objects.first()
         url = reverse("product-detail", kwargs={"pk": str(product.id)})
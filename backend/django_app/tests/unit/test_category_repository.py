@@ -0,0 +1,85 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+django.setup()
+
+import unittest
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from django_app.cache import TTLCache
+from django_app.repositories.category_repository import CategoryRepository
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_expired_entries_are_misses(self):
+        now = [0]
+        cache = TTLCache(max_size=10, ttl=5, timer=lambda: now[0])
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        now[0] = 6
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+
+class TestCategoryRepositoryCache(unittest.TestCase):
+
+    def setUp(self):
+        CategoryRepository.invalidate_cache()
+        self.category = MagicMock()
+        self.category.id = ObjectId()
+        self.category.title = "Electronics"
+
+    @patch("django_app.repositories.category_repository.Category")
+    def test_get_by_title_hits_cache_after_first_lookup(self, mock_category):
+        mock_category.objects.return_value.first.return_value = self.category
+
+        CategoryRepository.get_by_title("Electronics")
+        CategoryRepository.get_by_title("Electronics")
+        CategoryRepository.get_by_id(self.category.id)
+
+        mock_category.objects.assert_called_once_with(title="Electronics")
+        self.assertGreaterEqual(CategoryRepository.cache_stats()["hits"], 2)
+
+    @patch("django_app.repositories.category_repository.Category")
+    def test_update_invalidates_cache(self, mock_category):
+        mock_category.objects.return_value.first.return_value = self.category
+
+        CategoryRepository.get_by_id(self.category.id)
+        CategoryRepository.update(self.category.id, {"title": "Gadgets"})
+        CategoryRepository.get_by_id(self.category.id)
+
+        self.assertEqual(mock_category.objects.call_count, 3)
+
+    @patch("django_app.repositories.category_repository.Category")
+    def test_get_ids_by_titles_only_queries_missing_titles(self, mock_category):
+        books = MagicMock()
+        books.id = ObjectId()
+        books.title = "Books"
+        mock_category.objects.return_value.first.return_value = self.category
+        mock_category.objects.return_value.__iter__.return_value = iter([books])
+        CategoryRepository.get_by_title("Electronics")
+        mock_category.objects.reset_mock()
+
+        ids = CategoryRepository.get_ids_by_titles(["Electronics", "Books"])
+
+        mock_category.objects.assert_called_once_with(title__in=["Books"])
+        self.assertCountEqual(ids, [self.category.id, books.id])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
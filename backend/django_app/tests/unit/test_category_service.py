@@ -7,6 +7,8 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
 django.setup()
 
 from django_app.services.category_service import CategoryService
+from mongoengine.errors import NotUniqueError
+from rest_framework.exceptions import ValidationError
 
 
 class TestCategoryService(unittest.TestCase):
@@ -47,6 +49,18 @@ class TestCategoryService(unittest.TestCase):
         mock_serializer.assert_called_once_with(mock_category)
 
 
+    @patch("django_app.repositories.category_repository.CategoryRepository.create")
+    def test_create_category_duplicate_title(self, mock_create):
+        mock_create.side_effect = NotUniqueError("duplicate key")
+
+        with self.assertRaises(ValidationError) as context:
+            CategoryService.create_category({"title": "Electronics", "description": "Devices"})
+
+        self.assertEqual(
+            context.exception.detail["title"],
+            ["A category with title 'Electronics' already exists."]
+        )
+
     @patch("django_app.services.category_service.CategorySerializer")
     @patch("django_app.repositories.category_repository.CategoryRepository.get_all")
     def test_get_all_categories(self, mock_get_all, mock_serializer):
@@ -82,7 +96,7 @@ class TestCategoryService(unittest.TestCase):
         self.assertEqual(result, {"id": "1", "title": "Electronics"})
 
         mock_get_by_id.assert_called_once_with("1")
-        mock_serializer.assert_called_once_with(mock_category)
+        mock_serializer.assert_called_once_with(mock_category, fields=None)
 
 
     @patch("django_app.repositories.category_repository.CategoryRepository.get_by_id")
@@ -95,10 +109,6 @@ class TestCategoryService(unittest.TestCase):
     @patch("django_app.repositories.category_repository.CategoryRepository.update")
     @patch("django_app.repositories.category_repository.CategoryRepository.get_by_id")
     def test_update_category_success(self, mock_get_by_id, mock_update, mock_serializer):
-        mock_category = MagicMock()
-        mock_category.id = "1"
-        mock_get_by_id.return_value = mock_category
-
         mock_updated_category = MagicMock()
         mock_updated_category.id = "1"
         mock_updated_category.title = "Updated"
@@ -112,14 +122,14 @@ class TestCategoryService(unittest.TestCase):
 
         self.assertEqual(result, {"id": "1", "title": "Updated"})
 
-        mock_get_by_id.assert_called_once_with("1")
-        mock_update.assert_called_once_with(mock_category, update_data)
+        mock_get_by_id.assert_not_called()
+        mock_update.assert_called_once_with("1", update_data, expected_updated_at=None)
         mock_serializer.assert_called_once_with(mock_updated_category)
 
 
-    @patch("django_app.repositories.category_repository.CategoryRepository.get_by_id")
-    def test_update_category_not_found(self, mock_get_by_id):
-        mock_get_by_id.return_value = None
+    @patch("django_app.repositories.category_repository.CategoryRepository.update")
+    def test_update_category_not_found(self, mock_update):
+        mock_update.return_value = None
         result = CategoryService.update_category({"title": "New"}, "invalid")
         self.assertIsNone(result)
 
@@ -0,0 +1,44 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+django.setup()
+
+import unittest
+from unittest.mock import patch, MagicMock
+from django.core.management.base import CommandError
+from django_app.management.commands.ensure_indexes import Command, plan_stages
+
+
+def explain_result(winning_plan):
+    return {"queryPlanner": {"winningPlan": winning_plan}}
+
+
+class TestEnsureIndexesCommand(unittest.TestCase):
+
+    def test_plan_stages_walks_nested_stages(self):
+        plan = {
+            "stage": "FETCH",
+            "inputStage": {
+                "stage": "OR",
+                "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}],
+            },
+        }
+        self.assertEqual(list(plan_stages(plan)), ["FETCH", "OR", "IXSCAN", "COLLSCAN"])
+
+    @patch("django_app.management.commands.ensure_indexes.QUERY_SHAPES")
+    def test_check_fails_on_collection_scan(self, mock_shapes):
+        indexed, scanned = MagicMock(), MagicMock()
+        indexed.explain.return_value = explain_result({"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}})
+        scanned.explain.return_value = explain_result({"stage": "COLLSCAN"})
+        mock_shapes.__iter__.return_value = iter([
+            ("indexed", lambda: indexed),
+            ("scanned", lambda: scanned),
+        ])
+
+        with self.assertRaisesRegex(CommandError, "scanned"):
+            Command(stdout=MagicMock()).check_query_plans()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,113 @@
+import threading
+import unittest
+from django_app.prefix_index import PrefixIndex
+
+
+class TestPrefixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            ("name", "iPhone 14"), ("brand", "Apple"),
+            ("name", "iPad Air"), ("brand", "Apple"),
+            ("name", "Instant Pot"), ("brand", "Instant"),
+        ]
+        self.loads = 0
+
+    def loader(self):
+        self.loads += 1
+        return list(self.rows)
+
+    def test_suggest_is_case_insensitive_and_ordered(self):
+        index = PrefixIndex(self.loader)
+
+        self.assertEqual(index.suggest("I"), [
+            ("Instant", "brand"), ("Instant Pot", "name"), ("iPad Air", "name"), ("iPhone 14", "name")
+        ])
+        self.assertEqual(index.suggest("ip", limit=1), [("iPad Air", "name")])
+        self.assertEqual(index.suggest("zz"), [])
+        self.assertEqual(self.loads, 1)
+
+    def test_shared_entries_are_reference_counted(self):
+        index = PrefixIndex(self.loader)
+        index.suggest("a")
+
+        index.remove("brand", "Apple")
+        self.assertEqual(index.suggest("a"), [("Apple", "brand")])
+        index.remove("brand", "Apple")
+        self.assertEqual(index.suggest("a"), [])
+
+        index.add("name", "Apple Watch")
+        self.assertEqual(index.suggest("app"), [("Apple Watch", "name")])
+
+    def test_updates_before_the_first_build_are_left_to_the_loader(self):
+        index = PrefixIndex(self.loader)
+        index.add("name", "Kindle")
+
+        self.assertFalse(index.is_built)
+        self.assertEqual(index.suggest("k"), [])
+
+    def test_rebuilds_after_invalidate_and_ttl(self):
+        now = [0]
+        index = PrefixIndex(self.loader, ttl=10, timer=lambda: now[0], spawn=lambda build: build())
+        index.suggest("i")
+        self.rows.append(("name", "Kindle"))
+
+        self.assertEqual(index.suggest("k"), [])
+        now[0] = 11
+        self.assertEqual(index.suggest("k"), [("Kindle", "name")])
+        index.invalidate()
+        index.suggest("k")
+        self.assertEqual(self.loads, 3)
+
+    def test_stale_index_serves_while_a_rebuild_runs(self):
+        now = [0]
+        rebuilds = []
+        index = PrefixIndex(self.loader, ttl=10, timer=lambda: now[0], spawn=rebuilds.append)
+        index.suggest("i")
+        self.rows.append(("name", "Kindle"))
+        now[0] = 11
+
+        self.assertEqual(index.suggest("k"), [])
+        self.assertEqual(len(rebuilds), 1)
+        rebuilds[0]()
+        self.assertEqual(index.suggest("k"), [("Kindle", "name")])
+
+    def test_writes_do_not_wait_for_a_rebuild_and_are_replayed(self):
+        loading, release = threading.Event(), threading.Event()
+
+        def slow_loader():
+            loading.set()
+            release.wait(5)
+            return list(self.rows)
+
+        index = PrefixIndex(slow_loader)
+        builder = threading.Thread(target=index.suggest, args=("i",))
+        builder.start()
+        loading.wait(5)
+
+        writer = threading.Thread(target=index.add, args=("name", "Kindle"))
+        writer.start()
+        writer.join(1)
+        self.assertFalse(writer.is_alive())
+
+        release.set()
+        builder.join(5)
+        self.assertEqual(index.suggest("k"), [("Kindle", "name")])
+
+    def test_invalidate_during_a_rebuild_leaves_the_index_stale(self):
+        index = PrefixIndex(self.loader)
+
+        def invalidating_loader():
+            index.invalidate()
+            return self.loader()
+
+        index.loader = invalidating_loader
+        index.suggest("i")
+        index.loader = self.loader
+        index.spawn = lambda build: build()
+        index.suggest("i")
+        self.assertEqual(self.loads, 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
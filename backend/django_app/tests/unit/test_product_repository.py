@@ -0,0 +1,66 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+django.setup()
+
+import unittest
+from unittest.mock import patch
+from bson import ObjectId
+from django_app.models.product import Product
+from django_app.repositories.product_repository import ProductRepository
+
+
+class TestProductRepositoryUpdate(unittest.TestCase):
+
+    @patch("django_app.repositories.product_repository.Product.objects")
+    def test_update_returns_previous_and_updated_from_one_write(self, mock_objects):
+        category = ObjectId()
+        previous = Product(id=ObjectId(), name="Old", brand="Acme", price=5.0, quantity=1, category=category)
+        mock_objects.return_value.modify.return_value = previous
+
+        before, after = ProductRepository.update(previous.id, {"name": "New", "price": 7.5})
+
+        mock_objects.return_value.modify.assert_called_once_with(new=False, name="New", price=7.5)
+        self.assertIs(before, previous)
+        self.assertEqual((before.name, after.name, after.brand, after.price), ("Old", "New", "Acme", 7.5))
+        self.assertEqual((after.id, after.to_mongo()["category"]), (previous.id, category))
+
+    @patch("django_app.repositories.product_repository.Product.objects")
+    def test_update_without_match(self, mock_objects):
+        mock_objects.return_value.modify.return_value = None
+        self.assertEqual(ProductRepository.update(ObjectId(), {"name": "New"}), (None, None))
+
+
+class TestProductRepositorySearch(unittest.TestCase):
+
+    @patch.object(Product, "_get_collection")
+    def test_search_combines_text_filters_and_cursor(self, mock_collection):
+        mock_collection.return_value.aggregate.return_value = iter([{"_id": 1, "score": 2.0}])
+        last_id = ObjectId()
+
+        results = ProductRepository.search(
+            "wireless mouse", Product.objects(price__gte=5), after=(1.5, last_id), limit=11
+        )
+
+        pipeline = mock_collection.return_value.aggregate.call_args.args[0]
+        self.assertEqual(pipeline[0], {"$match": {"price": {"$gte": 5.0}, "$text": {"$search": "wireless mouse"}}})
+        self.assertEqual(pipeline[2], {"$match": {"$or": [
+            {"score": {"$lt": 1.5}},
+            {"score": 1.5, "_id": {"$gt": last_id}},
+        ]}})
+        self.assertEqual(pipeline[-2:], [{"$sort": {"score": -1, "_id": 1}}, {"$limit": 11}])
+        self.assertEqual(results, [{"_id": 1, "score": 2.0}])
+
+    @patch.object(Product, "_get_collection")
+    def test_first_page_has_no_cursor_stage(self, mock_collection):
+        mock_collection.return_value.aggregate.return_value = iter([])
+
+        ProductRepository.search("mouse", Product.objects, limit=5)
+
+        pipeline = mock_collection.return_value.aggregate.call_args.args[0]
+        self.assertEqual([list(stage) for stage in pipeline], [["$match"], ["$addFields"], ["$sort"], ["$limit"]])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,66 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+django.setup()
+
+import unittest
+from unittest.mock import patch, MagicMock
+from bson import ObjectId
+from django_app.models.product import Product
+from django_app.serializers.product_serializer import ProductSerializer
+from django_app.repositories.category_repository import CategoryRepository
+
+
+def make_products(count, category_ids):
+    return [
+        Product(
+            id=ObjectId(),
+            name=f"Product {i}",
+            category=category_ids[i % len(category_ids)],
+            price=10.0,
+            brand="Brand",
+            quantity=1,
+        )
+        for i in range(count)
+    ]
+
+
+class TestProductSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.category_ids = [ObjectId(), ObjectId(), ObjectId()]
+        self.categories = []
+        for i, category_id in enumerate(self.category_ids):
+            category = MagicMock()
+            category.id = category_id
+            category.title = f"Category {i}"
+            self.categories.append(category)
+        CategoryRepository.invalidate_cache()
+
+    @patch("django_app.repositories.category_repository.Category")
+    def test_many_resolves_categories_with_one_query(self, mock_category):
+        mock_category.objects.return_value = self.categories
+
+        for page_size in (5, 50):
+            CategoryRepository.invalidate_cache()
+            mock_category.objects.reset_mock()
+            data = ProductSerializer(make_products(page_size, self.category_ids), many=True).data
+
+            self.assertEqual(mock_category.objects.call_count, 1)
+            self.assertEqual(len(data), page_size)
+            self.assertEqual(data[4]["category"], "Category 1")
+
+    @patch("django_app.repositories.category_repository.Category")
+    def test_single_resolves_category(self, mock_category):
+        mock_category.objects.return_value = self.categories[:1]
+        product = make_products(1, self.category_ids)[0]
+
+        data = ProductSerializer(product).data
+
+        self.assertEqual(data["category"], "Category 0")
+        mock_category.objects.assert_called_once_with(id__in=[self.category_ids[0]])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
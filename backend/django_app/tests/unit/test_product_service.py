@@ -6,8 +6,11 @@ django.setup()
 
 import unittest
 from unittest.mock import patch, MagicMock
-from django_app.services.product_service import ProductService
+from django_app.services.product_service import ProductService, InsufficientStockError
 from django_app.repositories.product_repository import ProductRepository
+from django_app.repositories.category_repository import CategoryRepository
+from mongoengine.errors import NotUniqueError
+from rest_framework.exceptions import ValidationError
 
 
 class TestProductService(unittest.TestCase):
@@ -25,6 +28,15 @@ class TestProductService(unittest.TestCase):
         mock_create.assert_called_once()
         mock_serializer.assert_called_once_with(mock_product)
 
+    @patch.object(ProductRepository, "create")
+    def test_create_product_duplicate_name(self, mock_create):
+        mock_create.side_effect = NotUniqueError("duplicate key")
+
+        with self.assertRaises(ValidationError) as context:
+            ProductService.create_product({"name": "Laptop"})
+
+        self.assertIn("name", context.exception.detail)
+
     @patch("django_app.services.product_service.ProductSerializer")
     @patch.object(ProductRepository, "get_all")
     def test_get_all_products(self, mock_get_all, mock_serializer):
@@ -38,6 +50,20 @@ class TestProductService(unittest.TestCase):
         mock_get_all.assert_called_once()
         mock_serializer.assert_called_once_with(mock_products, many=True)
 
+    @patch("django_app.services.product_service.ProductSerializer")
+    @patch.object(ProductRepository, "get_all")
+    def test_filter_products_returns_unevaluated_queryset(self, mock_get_all, mock_serializer):
+        mock_queryset = MagicMock()
+        mock_get_all.return_value = mock_queryset
+
+        result = ProductService.filter_products(ordering="price", filters={"price_min": 10})
+
+        (conditions,), _ = mock_queryset.filter.call_args
+        self.assertEqual(conditions.query, {"price__gte": 10})
+        mock_queryset.filter.return_value.order_by.assert_called_once_with("price")
+        self.assertEqual(result, mock_queryset.filter.return_value.order_by.return_value)
+        mock_serializer.assert_not_called()
+
     @patch('django_app.services.product_service.ProductSerializer')
     @patch('django_app.repositories.product_repository.ProductRepository.get_by_id')
     def test_get_product_by_id_success(self, mock_get_by_id, mock_serializer):
@@ -59,33 +85,101 @@ class TestProductService(unittest.TestCase):
         result = ProductService.get_product_by_id(99)
 
         self.assertIsNone(result)
-        mock_get_by_id.assert_called_once_with(99)
+        mock_get_by_id.assert_called_once_with(99, fields=None)
 
     @patch("django_app.services.product_service.timezone")
     @patch("django_app.services.product_service.ProductSerializer")
     @patch.object(ProductRepository, "update")
     @patch.object(ProductRepository, "get_by_id")
     def test_update_product_success(self, mock_get_by_id, mock_update, mock_serializer, mock_timezone):
-        mock_product = MagicMock()
-        mock_get_by_id.return_value = mock_product
         mock_timezone.now.return_value = "mocked-timestamp"
         mock_updated = MagicMock()
-        mock_update.return_value = mock_updated
+        mock_update.return_value = (MagicMock(), mock_updated)
         mock_serializer.return_value.data = {"id": 1, "name": "Updated Product"}
 
         result = ProductService.update_product({"name": "Updated Product"}, 1)
 
         self.assertEqual(result, {"id": 1, "name": "Updated Product"})
-        mock_get_by_id.assert_called_once_with(1)
-        mock_update.assert_called_once()
+        mock_get_by_id.assert_not_called()
+        mock_update.assert_called_once_with(
+            1, {"name": "Updated Product", "updated_at": "mocked-timestamp"}, expected_updated_at=None
+        )
         mock_serializer.assert_called_once_with(mock_updated)
 
-    @patch.object(ProductRepository, "get_by_id")
-    def test_update_product_not_found(self, mock_get_by_id):
-        mock_get_by_id.return_value = None
+    @patch.object(ProductRepository, "update")
+    def test_update_product_not_found(self, mock_update):
+        mock_update.return_value = (None, None)
         result = ProductService.update_product({"name": "Updated"}, 999)
         self.assertIsNone(result)
 
+    @patch("django_app.services.product_service.CategoryRepository")
+    @patch("django_app.services.product_service.ProductSerializer")
+    @patch.object(ProductRepository, "bulk_insert")
+    @patch.object(ProductRepository, "get_existing_names")
+    def test_bulk_create_products_reports_write_errors(
+        self, mock_existing_names, mock_bulk_insert, mock_serializer, mock_category_repository
+    ):
+        items = [{"name": "Laptop"}, {"name": "Phone"}, {"name": "Tablet"}]
+        mock_existing_names.return_value = {"Tablet"}
+        mock_serializer.side_effect = lambda data, context: MagicMock(validated_data=data)
+        mock_bulk_insert.return_value = ({0: "id-1"}, {1: {"code": 11000}})
+
+        results = ProductService.bulk_create_products(items, chunk_size=2)
+
+        mock_bulk_insert.assert_called_once_with([{"name": "Laptop"}, {"name": "Phone"}], 2)
+        mock_existing_names.assert_called_once()
+        self.assertEqual(results[0], {"index": 0, "status": "created", "id": "id-1"})
+        self.assertEqual(results[1]["status"], "error")
+        self.assertIn("name", results[1]["errors"])
+        self.assertIn("name", results[2]["errors"])
+
+    @patch("django_app.repositories.category_repository.Category")
+    @patch.object(ProductRepository, "bulk_insert")
+    @patch.object(ProductRepository, "get_existing_names")
+    def test_bulk_create_products_looks_up_categories_once(
+        self, mock_existing_names, mock_bulk_insert, mock_category
+    ):
+        CategoryRepository.invalidate_cache()
+        mock_category.objects.return_value = []
+        mock_existing_names.return_value = set()
+        mock_bulk_insert.return_value = ({}, {})
+        items = [
+            {"name": f"Item {i}", "category": "Missing", "description": "d",
+             "price": 1.0, "brand": "b", "quantity": 1}
+            for i in range(5)
+        ]
+
+        results = ProductService.bulk_create_products(items)
+
+        mock_category.objects.assert_called_once_with(title__in=["Missing"])
+        self.assertTrue(all("category" in result["errors"] for result in results))
+
+    @patch("django_app.repositories.category_repository.Category")
+    @patch.object(ProductRepository, "bulk_update")
+    def test_bulk_update_products_looks_up_categories_once(self, mock_bulk_update, mock_category):
+        mock_category.objects.return_value = []
+        mock_bulk_update.return_value = (0, 0, {})
+        items = [{"id": "a" * 23 + str(i), "category": "Missing"} for i in range(5)]
+
+        result = ProductService.bulk_update_products(items)
+
+        mock_category.objects.assert_called_once_with(title__in=["Missing"])
+        self.assertTrue(all("category" in failure["errors"] for failure in result["failures"]))
+
+    @patch.object(ProductRepository, "get_by_id")
+    @patch.object(ProductRepository, "adjust_quantity")
+    def test_adjust_stock_batch_reverts_without_guard(self, mock_adjust, mock_get_by_id):
+        restocked = MagicMock(quantity=55)
+        mock_adjust.side_effect = [restocked, None, MagicMock()]
+        mock_get_by_id.return_value = MagicMock(quantity=3)
+
+        with self.assertRaises(InsufficientStockError):
+            ProductService.adjust_stock_batch([("a", 5), ("b", -4)])
+
+        revert = mock_adjust.call_args_list[-1]
+        self.assertEqual(revert.args[:2], ("a", -5))
+        self.assertFalse(revert.kwargs["guarded"])
+
     @patch.object(ProductRepository, "delete")
     def test_delete_product(self, mock_delete):
         ProductService.delete_product("product-id")
@@ -0,0 +1,63 @@
+import logging
+import pytest
+from types import SimpleNamespace
+from django_app.query_stats import QueryListener, assert_max_queries, query_shape, record_queries
+
+
+def command_events(request_id, command_name, command, duration_micros):
+    started = SimpleNamespace(
+        connection_id=("localhost", 27017), request_id=request_id, operation_id=request_id,
+        database_name="product", command_name=command_name, command=command,
+    )
+    finished = SimpleNamespace(**vars(started), duration_micros=duration_micros)
+    return started, finished
+
+
+def run_command(listener, request_id, command_name, command, duration_micros):
+    started, finished = command_events(request_id, command_name, command, duration_micros)
+    listener.started(started)
+    listener.succeeded(finished)
+
+
+def test_query_shape_keeps_fields_and_operators():
+    query = {"price": {"$gte": 10, "$lte": 50}, "category": {"$in": ["a", "b"]},
+             "$or": [{"name": "x"}, {"brand": "y"}]}
+    assert query_shape(query) == {
+        "price": {"$gte": "?", "$lte": "?"}, "category": {"$in": "?"},
+        "$or": [{"name": "?"}, {"brand": "?"}],
+    }
+
+
+def test_recorder_counts_queries_and_keeps_the_slowest():
+    listener = QueryListener()
+    with record_queries() as recorder:
+        for request_id, duration in enumerate([1000, 5000, 2000, 4000]):
+            run_command(listener, request_id, "find", {"find": "product", "filter": {}}, duration)
+    run_command(listener, 9, "find", {"find": "product", "filter": {}}, 1000)
+
+    assert recorder.count == 4
+    assert recorder.duration == pytest.approx(0.012)
+    assert [command[0] for command in recorder.commands] == [0.005, 0.004, 0.002]
+    assert recorder.server_timing().startswith('db;dur=12.0;desc="4 queries", db-1;dur=5.0;desc="find product"')
+
+
+def test_slow_queries_are_logged_with_their_filter_shape(caplog, settings):
+    settings.QUERY_STATS = {**settings.QUERY_STATS, "SLOW_MS": 50}
+    listener = QueryListener()
+    with caplog.at_level(logging.WARNING, logger="django_app.query_stats"):
+        run_command(listener, 1, "find", {"find": "product", "filter": {"price": {"$gte": 10}}}, 10_000)
+        run_command(listener, 2, "find", {"find": "product", "filter": {"brand": "Acme"}}, 80_000)
+
+    assert len(caplog.records) == 1
+    assert caplog.records[0].getMessage() == 'Slow Mongo find on product took 80.0ms: {"filter": {"brand": "?"}}'
+
+
+def test_assert_max_queries_fails_past_the_budget():
+    listener = QueryListener()
+    with assert_max_queries(2):
+        run_command(listener, 1, "find", {"find": "product"}, 100)
+        run_command(listener, 2, "count", {"count": "product"}, 100)
+    with pytest.raises(AssertionError, match="3 Mongo queries run, expected at most 2"):
+        with assert_max_queries(2):
+            for request_id in range(3):
+                run_command(listener, request_id, "find", {"find": "product"}, 100)
@@ -0,0 +1,80 @@
+import os
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_app.settings")
+django.setup()
+
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from bson import ObjectId
+from rest_framework.renderers import JSONRenderer
+from django_app.models.category import Category
+from django_app.models.product import Product
+from django_app.serializers.category_serializer import CategorySerializer, CategoryRawSerializer
+from django_app.serializers.product_serializer import ProductSerializer, ProductRawSerializer
+
+
+def make_products(category_ids):
+    products = [
+        Product(
+            id=ObjectId(),
+            name=f"Product {i}",
+            category=category_ids[i % len(category_ids)],
+            description=f"Description {i}" if i % 2 else None,
+            price=10.5 * (i + 1),
+            brand="Brand",
+            quantity=i,
+            created_at=datetime(2024, 1, 2, 3, 4, 5, 678000),
+            updated_at=datetime(2024, 6, 7, 8, 9, 10),
+        )
+        for i in range(6)
+    ]
+    products.append(Product(id=ObjectId(), name="Orphan", price=1.0, brand="Brand", quantity=0))
+    return products
+
+
+class TestRawSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.category_ids = [ObjectId(), ObjectId()]
+        self.titles = {self.category_ids[0]: "Books", self.category_ids[1]: "Clothing"}
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    @patch("django_app.serializers.product_serializer.CategoryRepository")
+    def test_products_render_byte_identical(self, mock_category_repository):
+        mock_category_repository.get_titles_by_ids.return_value = self.titles
+        products = make_products(self.category_ids)
+        documents = [product.to_mongo().to_dict() for product in products]
+
+        for fields in (None, ["id", "name", "price"], ["category", "updated_at"]):
+            expected = ProductSerializer(products, many=True, fields=fields).data
+            actual = ProductRawSerializer(fields=fields).many(documents)
+            self.assertEqual(self.render(actual), self.render(expected))
+
+    @patch("django_app.serializers.product_serializer.CategoryRepository")
+    def test_products_resolve_categories_once(self, mock_category_repository):
+        mock_category_repository.get_titles_by_ids.return_value = self.titles
+        documents = [product.to_mongo().to_dict() for product in make_products(self.category_ids)]
+
+        ProductRawSerializer().many(documents)
+        ProductRawSerializer(fields=["id", "name"]).many(documents)
+
+        self.assertEqual(mock_category_repository.get_titles_by_ids.call_count, 1)
+
+    def test_categories_render_byte_identical(self):
+        categories = [
+            Category(id=ObjectId(), title="Books", description="All genres",
+                     created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 2, 12, 30)),
+            Category(id=ObjectId(), title="Toys", description="Games"),
+        ]
+        documents = [category.to_mongo().to_dict() for category in categories]
+
+        expected = CategorySerializer(categories, many=True).data
+        self.assertEqual(self.render(CategoryRawSerializer().many(documents)), self.render(expected))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
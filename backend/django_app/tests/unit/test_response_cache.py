@@ -0,0 +1,99 @@
+import time
+import unittest
+from datetime import datetime
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from django_app import db
+from django_app.response_cache import (
+    DjangoCacheBackend, LocalBackend, ResponseCache, build_response_cache, list_params
+)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def request(self, query):
+        return Request(APIRequestFactory().get("/products/", query))
+
+    def params(self, query, filters):
+        return list_params(self.request(query), "name", filters, None, 5)
+
+    def test_equivalent_queries_share_a_key(self):
+        cache = ResponseCache(LocalBackend(max_size=10, ttl=60))
+        first = self.params(
+            {"categories": ["Home", "Books"], "created_after": "2024-01-01"},
+            {"categories": ["Home", "Books"], "created_after": datetime(2024, 1, 1)},
+        )
+        second = self.params(
+            {"created_after": "2024-01-01", "categories": ["Books", "Home", "Books"], "page": "1"},
+            {"created_after": datetime(2024, 1, 1), "categories": ["Books", "Home", "Books"]},
+        )
+        third = self.params({"page": "2"}, {})
+        key = cache.key("products:list", ("products",), first)
+        self.assertEqual(key, cache.key("products:list", ("products",), second))
+        self.assertNotEqual(key, cache.key("products:list", ("products",), third))
+
+    def test_invalidate_orphans_entries_of_that_collection(self):
+        cache = ResponseCache(LocalBackend(max_size=10, ttl=60))
+        params = self.params({}, {})
+        products_key = cache.key("products:list", ("products", "categories"), params)
+        categories_key = cache.key("categories:list", ("categories",), params)
+        cache.set(products_key, "products page")
+        cache.set(categories_key, "categories page")
+
+        cache.invalidate("products")
+
+        self.assertIsNone(cache.get(cache.key("products:list", ("products", "categories"), params)))
+        self.assertEqual(cache.get(cache.key("categories:list", ("categories",), params)), "categories page")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["hit_ratio"], 0.5)
+
+    def test_django_backend_shares_versions_through_the_cache(self):
+        first = ResponseCache(DjangoCacheBackend("default", ttl=60))
+        second = ResponseCache(DjangoCacheBackend("default", ttl=60))
+        first.clear()
+        params = self.params({}, {})
+        first.set(first.key("categories:list", ("categories",), params), "page")
+        self.assertEqual(second.get(second.key("categories:list", ("categories",), params)), "page")
+
+        [version] = first.backend.get_versions(["categories"])
+        second.invalidate("categories")
+        second.invalidate("categories")
+
+        self.assertIsNone(first.get(first.key("categories:list", ("categories",), params)))
+        self.assertEqual(first.backend.get_versions(["categories"]), [version + 2])
+        first.clear()
+
+    def test_django_backend_clear_leaves_other_cache_keys(self):
+        cache = ResponseCache(DjangoCacheBackend("default", ttl=60))
+        params = self.params({}, {})
+        cache.set(cache.key("products:list", ("products", "categories"), params), "page")
+        caches["default"].set("unrelated", "kept")
+
+        cache.clear()
+
+        self.assertIsNone(cache.get(cache.key("products:list", ("products", "categories"), params)))
+        self.assertEqual(caches["default"].get("unrelated"), "kept")
+        caches["default"].delete("unrelated")
+
+    def test_recently_written_collections_are_read_from_the_primary(self):
+        for backend in (LocalBackend(max_size=10, ttl=60), DjangoCacheBackend("default", ttl=60)):
+            cache = ResponseCache(backend, primary_window=10)
+            cache.clear()
+            self.assertEqual(cache.read_alias(("products", "categories")), db.READ_ALIAS)
+
+            cache.invalidate("categories")
+
+            self.assertEqual(cache.read_alias(("products", "categories")), db.DEFAULT_ALIAS)
+            self.assertEqual(cache.read_alias(("products",)), db.READ_ALIAS)
+            cache.primary_window = 0
+            time.sleep(0.01)
+            self.assertEqual(cache.read_alias(("products", "categories")), db.READ_ALIAS)
+            cache.clear()
+
+    @override_settings(RESPONSE_CACHE={"BACKEND": "django", "CACHE_ALIAS": "default", "TTL": 5})
+    def test_backend_is_selected_from_settings(self):
+        self.assertIsInstance(build_response_cache().backend, DjangoCacheBackend)
+        self.assertIsInstance(build_response_cache({}).backend, LocalBackend)
@@ -0,0 +1,47 @@
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django_app import db
+from django_app.repositories.category_repository import CategoryRepository
+from django_app.query_stats import query_listener
+
+
+def test_connect_registers_lazy_default_and_read_connections():
+    with patch("mongoengine.connect") as mock_connect:
+        db.connect()
+    calls = {call.kwargs["alias"]: call.kwargs for call in mock_connect.call_args_list}
+    assert set(calls) == {"default", "read"}
+    assert all(kwargs["connect"] is False for kwargs in calls.values())
+    assert calls["default"]["readPreference"] == "primary"
+    assert calls["read"]["readPreference"] == "secondaryPreferred"
+    assert calls["read"]["event_listeners"] == [db.pool_monitors["read"], query_listener]
+
+
+def test_child_process_gets_a_fresh_connection():
+    with patch("mongoengine.disconnect_all") as mock_disconnect, patch("mongoengine.connect") as mock_connect:
+        db._reconnect()
+    mock_disconnect.assert_called_once()
+    assert mock_connect.call_args.kwargs["connect"] is False
+
+
+def test_seed_categories_reports_how_many_were_created():
+    with patch.object(CategoryRepository, "insert_missing", return_value=4) as insert_missing:
+        out = StringIO()
+        call_command("seed_categories", stdout=out)
+    assert "4 of 5 default categories created" in out.getvalue()
+    assert [data["title"] for data in insert_missing.call_args.args[0]] == [
+        "Electronics", "Clothing", "Books", "Food", "Kitchen Essentials"
+    ]
+
+
+def test_pool_monitor_tracks_checked_out_connections():
+    monitor = db.PoolMonitor("default")
+    for _ in range(3):
+        monitor.connection_created(None)
+        monitor.connection_checked_out(None)
+    monitor.connection_checked_in(None)
+    monitor.connection_check_out_failed(None)
+
+    stats = monitor.stats()
+    assert (stats["open"], stats["checked_out"], stats["checkouts"], stats["checkout_failures"]) == (3, 2, 3, 1)
+    assert stats["utilization"] == 2 / stats["max_size"]
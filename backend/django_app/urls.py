@@ -6,6 +6,9 @@ from django.http import JsonResponse
 from rest_framework import routers
 from django_app.views.product_views import ProductViewSet
 from django_app.views.category_views import CategoryViewSet
+from django_app.views.cache_views import CacheViewSet
+from django_app.views.db_views import DatabaseViewSet
+from django_app.views.metrics_views import metrics
 
 router = routers.DefaultRouter()
 router.register(r'products', ProductViewSet, basename='product')
@@ -46,17 +49,33 @@ urlpatterns = [
     path('', include(router.urls)),
     path(
         'categories/<str:pk>/products/',
-        CategoryViewSet.as_view({'get': 'list_products'}),
+        CategoryViewSet.as_view({'get': 'list_products'}, basename='category'),
         name='category-products'
     ),
+    path(
+        'categories/<str:pk>/stats/',
+        CategoryViewSet.as_view({'get': 'stats'}, basename='category'),
+        name='category-stats'
+    ),
     path(
         'categories/<str:pk>/add_product/',
-        CategoryViewSet.as_view({'post': 'add_product'}),
+        CategoryViewSet.as_view({'post': 'add_product'}, basename='category'),
         name='category-add-product'
     ),
     path(
         'categories/<str:pk>/remove_product/<str:product_id>/',
-        CategoryViewSet.as_view({'delete': 'remove_product'}),
+        CategoryViewSet.as_view({'delete': 'remove_product'}, basename='category'),
         name='category-remove-product'
     ),
+    path(
+        'cache/stats/',
+        CacheViewSet.as_view({'get': 'stats'}, basename='cache'),
+        name='cache-stats'
+    ),
+    path(
+        'db/pool/stats/',
+        DatabaseViewSet.as_view({'get': 'pool_stats'}, basename='db'),
+        name='db-pool-stats'
+    ),
+    path('metrics', metrics, name='metrics'),
 ]
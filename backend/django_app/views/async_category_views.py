@@ -0,0 +1,110 @@
+from functools import partial
+from bson import ObjectId
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from django_app import conditional
+from django_app.pagination import AsyncPageNumberPagination, KeysetPagination
+from django_app.response_cache import response_cache, list_params
+from django_app.serializers.category_serializer import CategorySerializer
+from django_app.services.async_category_service import AsyncCategoryService
+from django_app.views.async_product_views import cached_response, error_response, not_modified_response
+from django_app.views.category_views import CategoryPagination, CategoryViewSet
+from django_app.views.product_views import ProductViewSet
+
+
+class AsyncCategoryViewSet:
+    """Coroutine versions of CategoryViewSet.list and retrieve for the ASGI app."""
+
+    pagination_class = CategoryPagination
+
+    async def list(self, request):
+        request = Request(request)
+        try:
+            ordering = request.query_params.get('ordering')
+            filters, invalid = CategoryViewSet._parse_filters(request)
+            if invalid:
+                return error_response(invalid)
+            fields = CategorySerializer.requested_fields(request)
+            page_size, invalid = ProductViewSet._parse_page_size(request, self.pagination_class())
+            if invalid:
+                return error_response(invalid)
+            cache_key = response_cache.key(
+                "categories:list", ("categories",),
+                list_params(request, ordering, filters, fields, page_size),
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached_response(request, *cached)
+            using = response_cache.read_alias(("categories",))
+            query = AsyncCategoryService.filter_query(filters)
+            updated_at, count = await AsyncCategoryService.get_listing_version(query, using)
+            etag = conditional.listing_etag(updated_at, count, conditional.request_variant(request))
+            if conditional.is_not_modified(request, etag):
+                return not_modified_response(etag)
+            projection = CategorySerializer.projection(fields, ordering) if fields else None
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(page_size, CategoryViewSet.cursor_ordering_fields)
+                categories = await paginator.apaginate(
+                    partial(AsyncCategoryService.list_categories_after, query, projection, using=using), request, ordering
+                )
+            else:
+                paginator = AsyncPageNumberPagination(page_size)
+                categories = await paginator.paginate(
+                    count,
+                    partial(AsyncCategoryService.list_categories, query, ordering, projection, using=using),
+                    request,
+                )
+            data = paginator.get_paginated_data(AsyncCategoryService.to_representation(categories, fields))
+            response_cache.set(cache_key, (data, etag))
+            response = JsonResponse(data)
+            response["X-Cache"] = "MISS"
+            return conditional.with_validators(response, etag)
+        except ValidationError as e:
+            return JsonResponse(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except NotFound:
+            return JsonResponse(
+                {"error": "Invalid page", "message": "Requested page is out of range."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return JsonResponse(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def retrieve(self, request, pk=None):
+        request = Request(request)
+        try:
+            if not ObjectId.is_valid(pk):
+                return JsonResponse(
+                    {"error": "Invalid category ID", "message": "Category ID must be a 24-character hex string."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            fields = CategorySerializer.requested_fields(request)
+            category = await AsyncCategoryService.get_category_document(ObjectId(pk))
+            if not category:
+                return JsonResponse(
+                    {"error": "Category not found", "message": f"No category found with ID {pk}."},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            etag = conditional.document_etag(pk, category["updated_at"], conditional.request_variant(request))
+            modified = conditional.last_modified(category["updated_at"])
+            if conditional.is_not_modified(request, etag, modified):
+                return not_modified_response(etag, modified)
+            [data] = AsyncCategoryService.to_representation([category], fields=fields)
+            return conditional.with_validators(JsonResponse(data), etag, modified)
+        except ValidationError as e:
+            return JsonResponse(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return JsonResponse(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
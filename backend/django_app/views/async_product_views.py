@@ -0,0 +1,137 @@
+from functools import partial
+from bson import ObjectId
+from django.http import HttpResponseNotModified, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from django_app import conditional
+from django_app.pagination import AsyncPageNumberPagination, KeysetPagination
+from django_app.response_cache import response_cache, list_params
+from django_app.serializers.product_serializer import ProductSerializer
+from django_app.services.async_product_service import AsyncProductService
+from django_app.views.product_views import ProductPagination, ProductViewSet
+
+
+def error_response(response):
+    """A JsonResponse for one of the DRF error Responses the sync views build."""
+    return JsonResponse(response.data, status=response.status_code)
+
+
+def not_modified_response(etag, modified=None):
+    return conditional.with_validators(HttpResponseNotModified(), etag, modified)
+
+
+def cached_response(request, data, etag):
+    if conditional.is_not_modified(request, etag):
+        response = not_modified_response(etag)
+    else:
+        response = conditional.with_validators(JsonResponse(data), etag)
+    response["X-Cache"] = "HIT"
+    return response
+
+
+class AsyncProductViewSet:
+    """
+    Coroutine versions of ProductViewSet.list and retrieve for the ASGI app
+    (see asgi_urls.py). Same parameters, bodies, validators and response
+    cache entries; the queries run on the async driver.
+    """
+
+    pagination_class = ProductPagination
+
+    async def list(self, request):
+        request = Request(request)
+        try:
+            ordering = request.query_params.get('ordering')
+            filters, invalid = ProductViewSet._parse_filters(request)
+            if invalid:
+                return error_response(invalid)
+            fields = ProductSerializer.requested_fields(request)
+            page_size, invalid = ProductViewSet._parse_page_size(request, self.pagination_class())
+            if invalid:
+                return error_response(invalid)
+            collections = ("products", "categories")
+            cache_key = response_cache.key(
+                "products:list", collections, list_params(request, ordering, filters, fields, page_size),
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached_response(request, *cached)
+            using = response_cache.read_alias(collections)
+            query = await AsyncProductService.filter_query(filters)
+            updated_at, count, category_updated_at = await AsyncProductService.get_listing_version(query, using)
+            etag = conditional.listing_etag(
+                updated_at, count, category_updated_at, conditional.request_variant(request)
+            )
+            if conditional.is_not_modified(request, etag):
+                return not_modified_response(etag)
+            projection = ProductSerializer.projection(fields, ordering) if fields else None
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(page_size, ProductViewSet.cursor_ordering_fields)
+                products = await paginator.apaginate(
+                    partial(AsyncProductService.list_products_after, query, projection, using=using), request, ordering
+                )
+            else:
+                paginator = AsyncPageNumberPagination(page_size)
+                products = await paginator.paginate(
+                    count,
+                    partial(AsyncProductService.list_products, query, ordering, projection, using=using),
+                    request,
+                )
+            data = paginator.get_paginated_data(await AsyncProductService.to_representation(products, fields))
+            response_cache.set(cache_key, (data, etag))
+            response = JsonResponse(data)
+            response["X-Cache"] = "MISS"
+            return conditional.with_validators(response, etag)
+        except ValidationError as e:
+            return JsonResponse(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except NotFound:
+            return JsonResponse(
+                {"error": "Invalid page", "message": "Requested page is out of range."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            return JsonResponse(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    async def retrieve(self, request, pk=None):
+        request = Request(request)
+        try:
+            if not ObjectId.is_valid(pk):
+                return JsonResponse(
+                    {"error": "Invalid product ID", "message": "Product ID must be a 24-character hex string."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            fields = ProductSerializer.requested_fields(request)
+            product = await AsyncProductService.get_product_document(ObjectId(pk), fields=fields)
+            if not product:
+                return JsonResponse(
+                    {"error": "Product not found", "message": f"No product found with ID {pk}."},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            category = await AsyncProductService.get_category(product.get("category"))
+            etag, modified = ProductViewSet._validators(
+                pk, product.get("updated_at"), category["updated_at"] if category else None,
+                conditional.request_variant(request)
+            )
+            if conditional.is_not_modified(request, etag, modified):
+                return not_modified_response(etag, modified)
+            [data] = await AsyncProductService.to_representation(
+                [product], fields=fields, category_titles={category["_id"]: category["title"]} if category else {}
+            )
+            return conditional.with_validators(JsonResponse(data), etag, modified)
+        except ValidationError as e:
+            return JsonResponse(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return JsonResponse(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,15 @@
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from django_app.response_cache import response_cache
+
+
+class CacheViewSet(viewsets.ViewSet):
+
+    def stats(self, request):
+        try:
+            return Response(response_cache.stats(), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
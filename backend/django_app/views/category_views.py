@@ -1,22 +1,28 @@
-from rest_framework import viewsets, status, pagination
+from rest_framework import viewsets, status
 from rest_framework.response import Response
-from rest_framework.exceptions import ParseError, NotFound
+from rest_framework.exceptions import ParseError, NotFound, ValidationError
 from bson import ObjectId
-from django_app.serializers.category_serializer import CategorySerializer
+from django_app.serializers.category_serializer import CategorySerializer, CategoryRawSerializer
+from django_app.serializers.product_serializer import ProductSerializer, ProductRawSerializer
 from django_app.services.category_service import CategoryService
 from django_app.services.product_service import ProductService
 from datetime import datetime
 from django_app.views.product_views import ProductViewSet
+from django_app import conditional, db
+from django_app.conditional import PreconditionFailedError
+from django_app.response_cache import response_cache, list_params
+from django_app.pagination import QuerySetPageNumberPagination, KeysetPagination
 
 
-class CategoryPagination(pagination.PageNumberPagination):
+class CategoryPagination(QuerySetPageNumberPagination):
     page_size = 5
     page_size_query_param = 'page_size'
     max_page_size = 20
-    
+
 class CategoryViewSet(viewsets.ViewSet):
 
     paginator_class = CategoryPagination
+    cursor_ordering_fields = ("title", "created_at", "updated_at")
 
     def create(self, request):
         try:
@@ -34,6 +40,11 @@ class CategoryViewSet(viewsets.ViewSet):
                 {"error": "Validation error", "message": serializer.errors},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except ValidationError as e:
+            return Response(
+                {"error": "Validation error", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except ParseError as e:
             return Response(
                 {"error": "Invalid JSON format", "message": str(e)},
@@ -48,57 +59,48 @@ class CategoryViewSet(viewsets.ViewSet):
     def list(self, request):
         try:
             ordering = request.query_params.get('ordering')
-
-            created_after = request.query_params.get('created_after')
-            created_before = request.query_params.get('created_before')
-            updated_after = request.query_params.get('updated_after')
-            updated_before = request.query_params.get('updated_before')
-
-            filters = {}
-            date_format = "%Y-%m-%d"
-
-            try:
-                if created_after:
-                    filters['created_after'] = datetime.strptime(created_after, date_format)
-                if created_before:
-                    filters['created_before'] = datetime.strptime(created_before, date_format)
-                if updated_after:
-                    filters['updated_after'] = datetime.strptime(updated_after, date_format)
-                if updated_before:
-                    filters['updated_before'] = datetime.strptime(updated_before, date_format)
-            except ValueError:
-                return Response(
-                    {"error": "Invalid date format", "message": f"Dates must be in format YYYY-MM-DD"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            categories = CategoryService.get_all_categories(ordering=ordering, filters=filters)
+            filters, error_response = self._parse_filters(request)
+            if error_response:
+                return error_response
+            fields = CategorySerializer.requested_fields(request)
             paginator = self.paginator_class()
-            page_size = request.query_params.get('page_size', paginator.page_size)
-            try:
-                page_size = int(page_size)
-                if page_size <= 0:
-                    return Response(
-                        {
-                            "error": "Invalid page size",
-                            "message": f"Page size cannot be less than or equal to 0."
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                if page_size>paginator.max_page_size:
-                    return Response(
-                    {
-                        "error": "Invalid page size",
-                        "message": f"Page size cannot exceed {paginator.max_page_size}."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            except ValueError:
-                return Response(
-                    {"error": "Invalid page size", "message": "Page size must be an integer."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            paginated_categories = paginator.paginate_queryset(categories, request)
-            return paginator.get_paginated_response(paginated_categories)
+            page_size, error_response = ProductViewSet._parse_page_size(request, paginator)
+            if error_response:
+                return error_response
+            cache_key = response_cache.key(
+                "categories:list", ("categories",),
+                list_params(request, ordering, filters, fields, page_size),
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return ProductViewSet._cached_response(request, *cached)
+            using = response_cache.read_alias(("categories",))
+            categories = CategoryService.filter_categories(
+                ordering=ordering,
+                filters=filters,
+                fields=CategorySerializer.projection(fields, ordering) if fields else None,
+                using=using
+            ).as_pymongo()
+            updated_at, count = CategoryService.get_listing_version(filters, using=using)
+            etag = conditional.listing_etag(updated_at, count, conditional.request_variant(request))
+            if conditional.is_not_modified(request, etag):
+                return conditional.not_modified_response(etag)
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(page_size, self.cursor_ordering_fields)
+                paginated_categories = paginator.paginate_queryset(categories, request, ordering)
+            else:
+                paginated_categories = paginator.paginate_queryset(categories, request, count=count)
+            response = paginator.get_paginated_response(
+                CategoryRawSerializer(fields=fields).many(paginated_categories)
+            )
+            response_cache.set(cache_key, (response.data, etag))
+            response["X-Cache"] = "MISS"
+            return conditional.with_validators(response, etag)
+        except ValidationError as e:
+            return Response(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except NotFound:
             return Response(
                 {"error": "Invalid page", "message": "Requested page is out of range."},
@@ -117,13 +119,25 @@ class CategoryViewSet(viewsets.ViewSet):
                     {"error": "Invalid category ID", "message": "Category ID must be a 24-character hex string."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            category = CategoryService.get_category_by_id(ObjectId(pk))
+            fields = CategorySerializer.requested_fields(request)
+            category = CategoryService.get_category_document(ObjectId(pk))
             if not category:
                 return Response(
                     {"error": "Category not found", "message": f"No category found with ID {pk}."},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            return Response(category)
+            etag = conditional.document_etag(pk, category.updated_at, conditional.request_variant(request))
+            modified = conditional.last_modified(category.updated_at)
+            if conditional.is_not_modified(request, etag, modified):
+                return conditional.not_modified_response(etag, modified)
+            return conditional.with_validators(
+                Response(CategoryService.to_representation(category, fields=fields)), etag, modified
+            )
+        except ValidationError as e:
+            return Response(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response({"error": "Something went wrong", "message": str(e)})
         
@@ -134,26 +148,44 @@ class CategoryViewSet(viewsets.ViewSet):
                     {"error": "Invalid category ID", "message": "Category ID must be a 24-character hex string."},
                     status=status.HTTP_400_BAD_REQUEST
                 ) 
-            existing_category = CategoryService.get_category_by_id(ObjectId(pk))
-            if not existing_category:
-                return Response(
+            serializer = CategorySerializer(data=request.data)
+            if serializer.is_valid():
+                updated_category = CategoryService.update_category(
+                    serializer.validated_data,
+                    ObjectId(pk),
+                    expected_versions=conditional.expected_versions(request, pk)
+                )
+                if not updated_category:
+                    return Response(
                         {"error": "Category not found", "message": f"No category found with ID {pk}."},
                         status=status.HTTP_404_NOT_FOUND
-                ) 
-            serializer = CategorySerializer(instance=existing_category, data=request.data)
-            if serializer.is_valid():
-                updated_category = CategoryService.update_category(serializer.validated_data, ObjectId(pk))
-                return Response(
+                    )
+                response = Response(
                     {
                         "message": "Category updated successfully",
-                        "updated_category": CategorySerializer(updated_category).data
+                        "updated_category": updated_category
                     },
                     status=status.HTTP_200_OK
                 )
+                # update_category stamps updated_at on the data it writes.
+                updated_at = serializer.validated_data["updated_at"]
+                return conditional.with_validators(
+                    response, conditional.document_etag(pk, updated_at, ""), conditional.last_modified(updated_at)
+                )
             return Response(
                 {"error": "Validation error", "message": serializer.errors},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except PreconditionFailedError as e:
+            return Response(
+                {"error": "Precondition failed", "message": str(e)},
+                status=status.HTTP_412_PRECONDITION_FAILED
+            )
+        except ValidationError as e:
+            return Response(
+                {"error": "Validation error", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except ParseError as e:
             return Response(
                 {"error": "Invalid JSON format", "message": str(e)},
@@ -203,7 +235,7 @@ class CategoryViewSet(viewsets.ViewSet):
                     {"error": "Category not found", "message": f"No category found with ID {pk}."},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            products = ProductService.get_products_by_category(ObjectId(pk))
+            products = ProductService.filter_products_by_category(ObjectId(pk), using=db.READ_ALIAS).as_pymongo()
             paginator = self.paginator_class()
             page_size = request.query_params.get('page_size', paginator.page_size)
             try:
@@ -221,21 +253,56 @@ class CategoryViewSet(viewsets.ViewSet):
                     {"error": "Invalid page size", "message": "Page size must be an integer."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            paginated_categories = paginator.paginate_queryset(products, request)
-            paginated_response = paginator.get_paginated_response(paginated_categories).data
-            for product in paginated_response["results"]:
-                product.pop("category", None)
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(page_size, ())
+                paginated_products = paginator.paginate_queryset(products, request)
+            else:
+                paginated_products = paginator.paginate_queryset(products, request)
+            product_fields = [name for name in ProductSerializer().fields if name != "category"]
+            paginated_response = paginator.get_paginated_response(
+                ProductRawSerializer(fields=product_fields).many(paginated_products)
+            ).data
             final_response = {
                 "category": category,
                 **paginated_response
             }
             return Response(final_response)
+        except ValidationError as e:
+            return Response(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response(
                 {"error": "Server error", "message": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
+    def stats(self, request, pk=None):
+        try:
+            if not ObjectId.is_valid(pk):
+                return Response(
+                    {"error": "Invalid category ID", "message": "Category ID must be a 24-character hex string."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            category = CategoryService.get_category_by_id(ObjectId(pk))
+            if not category:
+                return Response(
+                    {"error": "Category not found", "message": f"No category found with ID {pk}."},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            filters, error_response = ProductViewSet._parse_filters(request)
+            if error_response:
+                return error_response
+            filters.pop('categories', None)
+            stats = ProductService.get_stats(filters=filters, category_id=ObjectId(pk))
+            return Response({"category": category, **stats}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {"error": "Server error", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
     def add_product(self, request, pk=None):
         try:
             if not ObjectId.is_valid(pk):
@@ -288,3 +355,33 @@ class CategoryViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+
+    @staticmethod
+    def _parse_filters(request):
+        """
+        Build the CategoryService filters from the query string. Returns
+        (filters, None), or (None, error response) when a date is invalid.
+        """
+        created_after = request.query_params.get('created_after')
+        created_before = request.query_params.get('created_before')
+        updated_after = request.query_params.get('updated_after')
+        updated_before = request.query_params.get('updated_before')
+
+        filters = {}
+        date_format = "%Y-%m-%d"
+
+        try:
+            if created_after:
+                filters['created_after'] = datetime.strptime(created_after, date_format)
+            if created_before:
+                filters['created_before'] = datetime.strptime(created_before, date_format)
+            if updated_after:
+                filters['updated_after'] = datetime.strptime(updated_after, date_format)
+            if updated_before:
+                filters['updated_before'] = datetime.strptime(updated_before, date_format)
+        except ValueError:
+            return None, Response(
+                {"error": "Invalid date format", "message": f"Dates must be in format YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return filters, None
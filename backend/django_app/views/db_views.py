@@ -0,0 +1,15 @@
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from django_app import db
+
+
+class DatabaseViewSet(viewsets.ViewSet):
+
+    def pool_stats(self, request):
+        try:
+            return Response(db.pool_stats(), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,8 @@
+from django.http import HttpResponse
+from django_app import metrics as app_metrics
+
+
+def metrics(request):
+    """Prometheus scrape endpoint, in the text exposition format."""
+    body, content_type = app_metrics.exposition()
+    return HttpResponse(body, content_type=content_type)
@@ -1,20 +1,41 @@
-from rest_framework import viewsets, status, pagination
+from rest_framework import viewsets, status
 from rest_framework.response import Response
-from rest_framework.exceptions import ParseError, NotFound
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError, NotFound, ValidationError
 from bson import ObjectId
-from django_app.serializers.product_serializer import ProductSerializer
-from django_app.services.product_service import ProductService
+from django_app.serializers.product_serializer import ProductSerializer, ProductRawSerializer
+from django_app.services.product_service import (
+    ProductService, ProductNotFoundError, InsufficientStockError
+)
+from django_app import conditional
+from django_app.conditional import PreconditionFailedError
+from django_app.response_cache import response_cache, list_params
+from django_app.pagination import QuerySetPageNumberPagination, KeysetPagination, SearchCursorPagination
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from datetime import datetime
+import csv
+import json
 
 
-class ProductPagination(pagination.PageNumberPagination):
+class ProductPagination(QuerySetPageNumberPagination):
     page_size = 5
     page_size_query_param = 'page_size'
     max_page_size = 50
 
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv rows."""
+
+    def write(self, value):
+        return value
+
+
 class ProductViewSet(viewsets.ViewSet):
 
     pagination_class = ProductPagination
+    cursor_ordering_fields = ("name", "price", "brand", "quantity", "created_at", "updated_at")
+    suggest_limit = 10
+    max_suggest_limit = 50
 
     def create(self, request):
         try:
@@ -32,6 +53,11 @@ class ProductViewSet(viewsets.ViewSet):
                 {"error": "Validation error", "message": serializer.errors},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except ValidationError as e:
+            return Response(
+                {"error": "Validation error", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except ParseError as e:
             return Response(
                 {"error": "Invalid JSON format", "message": str(e)},
@@ -46,67 +72,51 @@ class ProductViewSet(viewsets.ViewSet):
     def list(self, request):
         try:
             ordering = request.query_params.get('ordering')
-
-            created_after = request.query_params.get('created_after')
-            created_before = request.query_params.get('created_before')
-            updated_after = request.query_params.get('updated_after')
-            updated_before = request.query_params.get('updated_before')
-
-            categories = request.query_params.getlist('categories')
-            price_min = request.query_params.get('price_min')
-            price_max = request.query_params.get('price_max')
-
-            filters = {}
-            date_format = "%Y-%m-%d"
-
-            try:
-                if created_after:
-                    filters['created_after'] = datetime.strptime(created_after, date_format)
-                if created_before:
-                    filters['created_before'] = datetime.strptime(created_before, date_format)
-                if updated_after:
-                    filters['updated_after'] = datetime.strptime(updated_after, date_format)
-                if updated_before:
-                    filters['updated_before'] = datetime.strptime(updated_before, date_format)
-            except ValueError:
-                return Response(
-                    {"error": "Invalid date format", "message": f"Dates must be in format YYYY-MM-DD"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            if categories:
-                filters['categories'] = categories
-            if price_min:
-                filters['price_min'] = float(price_min)
-            if price_max:
-                filters['price_max'] = float(price_max)
-            products = ProductService.get_all_products(ordering=ordering, filters=filters)
+            filters, error_response = self._parse_filters(request)
+            if error_response:
+                return error_response
+            fields = ProductSerializer.requested_fields(request)
             paginator = self.pagination_class()
-            page_size = request.query_params.get('page_size', paginator.page_size)
-            try:
-                page_size = int(page_size)
-                if page_size <= 0:
-                    return Response(
-                        {
-                            "error": "Invalid page size",
-                            "message": f"Page size cannot be less than or equal to 0."
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                if page_size > paginator.max_page_size:
-                    return Response(
-                        {
-                            "error": "Invalid page size",
-                            "message": f"Page size cannot exceed {paginator.max_page_size}."
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            except ValueError:
-                return Response(
-                    {"error": "Invalid page size", "message": "Page size must be an integer."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            paginated_products = paginator.paginate_queryset(products, request)
-            return paginator.get_paginated_response(paginated_products)
+            page_size, error_response = self._parse_page_size(request, paginator)
+            if error_response:
+                return error_response
+            # Product pages embed category titles, so category writes count too.
+            collections = ("products", "categories")
+            cache_key = response_cache.key(
+                "products:list", collections, list_params(request, ordering, filters, fields, page_size),
+            )
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return self._cached_response(request, *cached)
+            using = response_cache.read_alias(collections)
+            products = ProductService.filter_products(
+                ordering=ordering,
+                filters=filters,
+                fields=ProductSerializer.projection(fields, ordering) if fields else None,
+                using=using
+            ).as_pymongo()
+            updated_at, count, category_updated_at = ProductService.get_listing_version(filters, using=using)
+            etag = conditional.listing_etag(
+                updated_at, count, category_updated_at, conditional.request_variant(request)
+            )
+            if conditional.is_not_modified(request, etag):
+                return conditional.not_modified_response(etag)
+            if KeysetPagination.is_requested(request):
+                paginator = KeysetPagination(page_size, self.cursor_ordering_fields)
+                paginated_products = paginator.paginate_queryset(products, request, ordering)
+            else:
+                paginated_products = paginator.paginate_queryset(products, request, count=count)
+            response = paginator.get_paginated_response(
+                ProductRawSerializer(fields=fields).many(paginated_products)
+            )
+            response_cache.set(cache_key, (response.data, etag))
+            response["X-Cache"] = "MISS"
+            return conditional.with_validators(response, etag)
+        except ValidationError as e:
+            return Response(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except NotFound:
             return Response(
                 {"error": "Invalid page", "message": "Requested page is out of range."},
@@ -125,13 +135,30 @@ class ProductViewSet(viewsets.ViewSet):
                     {"error": "Invalid product ID", "message": "Product ID must be a 24-character hex string."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            product = ProductService.get_product_by_id(ObjectId(pk))
+            fields = ProductSerializer.requested_fields(request)
+            product = ProductService.get_product_document(ObjectId(pk), fields=fields)
             if not product:
                 return Response(
                     {"error": "Product not found", "message": f"No product found with ID {pk}."},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            return Response(product)
+            reference = product._data.get("category")
+            category = ProductService.get_category(getattr(reference, "id", reference))
+            etag, modified = self._validators(
+                pk, product.updated_at, category["updated_at"] if category else None,
+                conditional.request_variant(request)
+            )
+            if conditional.is_not_modified(request, etag, modified):
+                return conditional.not_modified_response(etag, modified)
+            data = ProductService.to_representation(
+                product, fields=fields, category_titles={category["_id"]: category["title"]} if category else {}
+            )
+            return conditional.with_validators(Response(data), etag, modified)
+        except ValidationError as e:
+            return Response(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return Response({"error": "Something went wrong", "message": str(e)})
 
@@ -142,26 +169,44 @@ class ProductViewSet(viewsets.ViewSet):
                     {"error": "Invalid product ID", "message": "Product ID must be a 24-character hex string."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            existing_product = ProductService.get_product_by_id(ObjectId(pk))
-            if not existing_product:
-                return Response(
+            serializer = ProductSerializer(data=request.data)
+            if serializer.is_valid():
+                updated_product = ProductService.update_product(
+                    serializer.validated_data,
+                    ObjectId(pk),
+                    expected_versions=conditional.expected_versions(request, pk)
+                )
+                if not updated_product:
+                    return Response(
                         {"error": "Product not found", "message": f"No product found with ID {pk}."},
                         status=status.HTTP_404_NOT_FOUND
-                ) 
-            serializer = ProductSerializer(instance=existing_product, data=request.data)
-            if serializer.is_valid():
-                updated_product = ProductService.update_product(serializer.validated_data, ObjectId(pk))
-                return Response(
+                    )
+                response = Response(
                     {
                         "message": "Product updated successfully",
                         "updated_product": updated_product
                     },
                     status=status.HTTP_200_OK
                 )
+                # update_product stamps updated_at on the data it writes.
+                etag, modified = self._document_validators(
+                    pk, serializer.validated_data["updated_at"], serializer.validated_data.get("category"), ""
+                )
+                return conditional.with_validators(response, etag, modified)
             return Response(
                 {"error": "Validation error", "message": serializer.errors},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except PreconditionFailedError as e:
+            return Response(
+                {"error": "Precondition failed", "message": str(e)},
+                status=status.HTTP_412_PRECONDITION_FAILED
+            )
+        except ValidationError as e:
+            return Response(
+                {"error": "Validation error", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except ParseError as e:
             return Response(
                 {"error": "Invalid JSON format", "message": str(e)},
@@ -196,4 +241,482 @@ class ProductViewSet(viewsets.ViewSet):
             return Response(
                 {"error": "Something went wrong", "message": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+    @action(detail=False, methods=["post"], url_path="bulk", url_name="bulk")
+    def bulk_create(self, request):
+        try:
+            items = request.data
+            if not isinstance(items, list):
+                return Response(
+                    {"error": "Invalid payload", "message": "Expected a list of products."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if len(items) > settings.PRODUCT_BULK_MAX_ITEMS:
+                return Response(
+                    {
+                        "error": "Invalid payload",
+                        "message": f"Cannot create more than {settings.PRODUCT_BULK_MAX_ITEMS} products at once."
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            results = ProductService.bulk_create_products(items)
+            created = sum(1 for result in results if result["status"] == "created")
+            return Response(
+                {
+                    "message": f"{created} of {len(results)} products created successfully",
+                    "created": created,
+                    "failed": len(results) - created,
+                    "results": results
+                },
+                status=status.HTTP_200_OK
+            )
+        except ParseError as e:
+            return Response(
+                {"error": "Invalid JSON format", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        try:
+            items = request.data
+            if not isinstance(items, list):
+                return Response(
+                    {"error": "Invalid payload", "message": "Expected a list of objects with an 'id' and the fields to update."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if len(items) > settings.PRODUCT_BULK_MAX_ITEMS:
+                return Response(
+                    {
+                        "error": "Invalid payload",
+                        "message": f"Cannot update more than {settings.PRODUCT_BULK_MAX_ITEMS} products at once."
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            result = ProductService.bulk_update_products(items)
+            return Response(
+                {
+                    "message": f"{result['modified']} of {len(items)} products updated successfully",
+                    **result
+                },
+                status=status.HTTP_200_OK
+            )
+        except ParseError as e:
+            return Response(
+                {"error": "Invalid JSON format", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @bulk_create.mapping.delete
+    def bulk_delete(self, request):
+        try:
+            product_ids = request.data.get("ids") if isinstance(request.data, dict) else None
+            if not isinstance(product_ids, list):
+                return Response(
+                    {"error": "Invalid payload", "message": "Expected an object with a list of 'ids'."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if len(product_ids) > settings.PRODUCT_BULK_MAX_ITEMS:
+                return Response(
+                    {
+                        "error": "Invalid payload",
+                        "message": f"Cannot delete more than {settings.PRODUCT_BULK_MAX_ITEMS} products at once."
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            result = ProductService.bulk_delete_products(product_ids)
+            return Response(
+                {
+                    "message": f"{result['deleted']} products deleted successfully",
+                    **result
+                },
+                status=status.HTTP_200_OK
+            )
+        except ParseError as e:
+            return Response(
+                {"error": "Invalid JSON format", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=True, methods=["post"], url_path="adjust_stock")
+    def adjust_stock(self, request, pk=None):
+        try:
+            if not ObjectId.is_valid(pk):
+                return Response(
+                    {"error": "Invalid product ID", "message": "Product ID must be a 24-character hex string."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            delta = request.data.get("delta") if isinstance(request.data, dict) else None
+            if not self._is_valid_delta(delta):
+                return Response(
+                    {"error": "Invalid delta", "message": "Delta must be a non-zero integer."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            quantity = ProductService.adjust_stock(ObjectId(pk), delta)
+            if quantity is None:
+                return Response(
+                    {"error": "Product not found", "message": f"No product found with ID {pk}."},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            return Response(
+                {"message": "Stock adjusted successfully", "id": pk, "quantity": quantity},
+                status=status.HTTP_200_OK
+            )
+        except InsufficientStockError as e:
+            return Response(
+                {"error": "Insufficient stock", "message": str(e), "available": e.available},
+                status=status.HTTP_409_CONFLICT
+            )
+        except ParseError as e:
+            return Response(
+                {"error": "Invalid JSON format", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=["post"], url_path="adjust_stock", url_name="adjust-stock-batch")
+    def adjust_stock_batch(self, request):
+        try:
+            items = request.data.get("items") if isinstance(request.data, dict) else None
+            if not isinstance(items, list) or not items:
+                return Response(
+                    {"error": "Invalid payload", "message": "Expected an object with a non-empty list of 'items'."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            adjustments = []
+            for item in items:
+                product_id = item.get("id") if isinstance(item, dict) else None
+                delta = item.get("delta") if isinstance(item, dict) else None
+                if not isinstance(product_id, str) or not ObjectId.is_valid(product_id):
+                    return Response(
+                        {"error": "Invalid product ID", "message": "Product ID must be a 24-character hex string."},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                if not self._is_valid_delta(delta):
+                    return Response(
+                        {"error": "Invalid delta", "message": "Delta must be a non-zero integer."},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                adjustments.append((ObjectId(product_id), delta))
+            quantities = ProductService.adjust_stock_batch(adjustments)
+            return Response(
+                {
+                    "message": "Stock adjusted successfully",
+                    "quantities": {str(product_id): quantity for product_id, quantity in quantities.items()}
+                },
+                status=status.HTTP_200_OK
+            )
+        except ProductNotFoundError as e:
+            return Response(
+                {"error": "Product not found", "message": str(e)},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except InsufficientStockError as e:
+            return Response(
+                {
+                    "error": "Insufficient stock",
+                    "message": str(e),
+                    "id": str(e.product_id),
+                    "available": e.available
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+        except ParseError as e:
+            return Response(
+                {"error": "Invalid JSON format", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        try:
+            export_format = request.query_params.get('export_format', 'ndjson')
+            if export_format not in ('ndjson', 'csv'):
+                return Response(
+                    {"error": "Invalid export format", "message": "Export format must be 'ndjson' or 'csv'."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            filters, error_response = self._parse_filters(request)
+            if error_response:
+                return error_response
+            rows = ProductService.export_products(
+                ordering=request.query_params.get('ordering'), filters=filters
+            )
+            if export_format == 'csv':
+                writer = csv.DictWriter(Echo(), fieldnames=ProductService.EXPORT_FIELDS)
+                content = (writer.writerow(row) for row in rows)
+                response = StreamingHttpResponse(
+                    self._with_header(writer.writeheader(), content), content_type="text/csv"
+                )
+            else:
+                content = (json.dumps(row) + "\n" for row in rows)
+                response = StreamingHttpResponse(content, content_type="application/x-ndjson")
+            response["Content-Disposition"] = f'attachment; filename="products.{export_format}"'
+            return response
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        try:
+            text = request.query_params.get('q', '').strip()
+            if not text:
+                return Response(
+                    {"error": "Invalid search", "message": "Query parameter 'q' is required."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            filters, error_response = self._parse_filters(request)
+            if error_response:
+                return error_response
+            page_size, error_response = self._parse_page_size(request, self.pagination_class())
+            if error_response:
+                return error_response
+            paginator = SearchCursorPagination(page_size)
+            documents = paginator.paginate(
+                lambda after, limit: ProductService.search_products(text, filters, after=after, limit=limit),
+                request
+            )
+            results = ProductRawSerializer().many(documents)
+            for result, document in zip(results, documents):
+                result["score"] = round(document["score"], 4)
+            return paginator.get_paginated_response(results)
+        except ValidationError as e:
+            return Response(
+                {"error": "Invalid query parameter", "message": e.detail},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=["get"], url_path="suggest")
+    def suggest(self, request):
+        try:
+            prefix = request.query_params.get('prefix', '').strip()
+            if not prefix:
+                return Response(
+                    {"error": "Invalid prefix", "message": "Query parameter 'prefix' is required."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            limit = request.query_params.get('limit', self.suggest_limit)
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if not 0 < limit <= self.max_suggest_limit:
+                return Response(
+                    {"error": "Invalid limit", "message": f"Limit must be an integer between 1 and {self.max_suggest_limit}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response(
+                {"prefix": prefix, "suggestions": ProductService.suggest(prefix, limit)},
+                status=status.HTTP_200_OK
+            )
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def stats(self, request):
+        try:
+            filters, error_response = self._parse_filters(request)
+            if error_response:
+                return error_response
+            return Response(ProductService.get_stats(filters=filters), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=["post"], url_path="import", url_name="import")
+    def import_products(self, request):
+        try:
+            upload = request.FILES.get('file')
+            if not upload:
+                return Response(
+                    {"error": "Invalid payload", "message": "Expected a multipart upload with a 'file' field."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            default_format = 'csv' if upload.name.lower().endswith('.csv') else 'ndjson'
+            import_format = request.query_params.get('import_format', default_format)
+            if import_format not in ('ndjson', 'csv'):
+                return Response(
+                    {"error": "Invalid import format", "message": "Import format must be 'ndjson' or 'csv'."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # Uploads past FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk by
+            # Django; iterating the file yields one line at a time.
+            lines = (line.decode('utf-8-sig') for line in upload)
+            parse = ProductService.parse_csv if import_format == 'csv' else ProductService.parse_ndjson
+            summary = ProductService.import_products(parse(lines))
+            return Response(
+                {
+                    "message": f"{summary['rows'] - summary['rejected']} of {summary['rows']} rows imported successfully",
+                    **summary
+                },
+                status=status.HTTP_200_OK
+            )
+        except UnicodeDecodeError:
+            return Response(
+                {"error": "Invalid file encoding", "message": "The file must be UTF-8 encoded."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except ParseError as e:
+            return Response(
+                {"error": "Invalid upload", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": "Something went wrong", "message": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @staticmethod
+    def _with_header(header, rows):
+        yield header
+        yield from rows
+
+    @staticmethod
+    def _document_validators(pk, updated_at, category_id, variant):
+        """
+        ETag and Last-Modified of a product representation. It includes the
+        category title, so the category's updated_at counts as well.
+        """
+        category = ProductService.get_category(category_id)
+        return ProductViewSet._validators(pk, updated_at, category["updated_at"] if category else None, variant)
+
+    @staticmethod
+    def _validators(pk, updated_at, category_updated_at, variant):
+        if category_updated_at:
+            variant = f"{variant}|{conditional.version(category_updated_at)}"
+        modified = max(value for value in (updated_at, category_updated_at) if value)
+        return (
+            conditional.document_etag(pk, updated_at, variant),
+            conditional.last_modified(modified),
+        )
+
+    @staticmethod
+    def _parse_page_size(request, paginator):
+        """
+        Read ?page_size= within the paginator's bounds. Returns
+        (page_size, None), or (None, error response) when it is invalid.
+        """
+        page_size = request.query_params.get('page_size', paginator.page_size)
+        try:
+            page_size = int(page_size)
+        except ValueError:
+            return None, Response(
+                {"error": "Invalid page size", "message": "Page size must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if page_size <= 0:
+            return None, Response(
+                {
+                    "error": "Invalid page size",
+                    "message": f"Page size cannot be less than or equal to 0."
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if page_size > paginator.max_page_size:
+            return None, Response(
+                {
+                    "error": "Invalid page size",
+                    "message": f"Page size cannot exceed {paginator.max_page_size}."
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return page_size, None
+
+    @staticmethod
+    def _parse_filters(request):
+        """
+        Build the ProductService filters from the query string. Returns
+        (filters, None), or (None, error response) when a value is invalid.
+        """
+        created_after = request.query_params.get('created_after')
+        created_before = request.query_params.get('created_before')
+        updated_after = request.query_params.get('updated_after')
+        updated_before = request.query_params.get('updated_before')
+
+        categories = request.query_params.getlist('categories')
+        price_min = request.query_params.get('price_min')
+        price_max = request.query_params.get('price_max')
+
+        filters = {}
+        date_format = "%Y-%m-%d"
+
+        try:
+            if created_after:
+                filters['created_after'] = datetime.strptime(created_after, date_format)
+            if created_before:
+                filters['created_before'] = datetime.strptime(created_before, date_format)
+            if updated_after:
+                filters['updated_after'] = datetime.strptime(updated_after, date_format)
+            if updated_before:
+                filters['updated_before'] = datetime.strptime(updated_before, date_format)
+        except ValueError:
+            return None, Response(
+                {"error": "Invalid date format", "message": f"Dates must be in format YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if categories:
+            filters['categories'] = categories
+        try:
+            if price_min:
+                filters['price_min'] = float(price_min)
+            if price_max:
+                filters['price_max'] = float(price_max)
+        except ValueError:
+            return None, Response(
+                {"error": "Invalid price", "message": "Prices must be numbers."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return filters, None
+
+    @staticmethod
+    def _cached_response(request, data, etag):
+        """Serve a list page from the response cache, honouring If-None-Match."""
+        if conditional.is_not_modified(request, etag):
+            response = conditional.not_modified_response(etag)
+        else:
+            response = conditional.with_validators(Response(data), etag)
+        response["X-Cache"] = "HIT"
+        return response
+
+    @staticmethod
+    def _is_valid_delta(delta):
+        return isinstance(delta, int) and not isinstance(delta, bool) and delta != 0
@@ -0,0 +1,29 @@
+# gunicorn -c gunicorn.conf.py django_app.wsgi
+#
+# Runs the workers with prometheus_client in multiprocess mode: every worker
+# writes its metrics to PROMETHEUS_MULTIPROC_DIR, and /metrics on any worker
+# merges them.
+
+import os
+import shutil
+import tempfile
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8001")
+workers = int(os.environ.get("GUNICORN_WORKERS", 4))
+
+# Must be set before a worker imports prometheus_client.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "prometheus-multiproc"))
+
+
+def on_starting(server):
+    # Samples left by a previous run would be merged into this one's.
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    # Drops the dead worker's live gauges; its counters and histograms stay.
+    multiprocess.mark_process_dead(worker.pid)